@@ -1,6 +1,7 @@
 # accounts/models.py
 
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 class User(AbstractUser):
@@ -12,4 +13,16 @@ class User(AbstractUser):
     
     # Add these new fields
     phone_number = models.CharField(max_length=20, blank=True, null=True)
-    department = models.CharField(max_length=100, blank=True, null=True)
\ No newline at end of file
+    department = models.CharField(max_length=100, blank=True, null=True)
+    # Part of the signed calendar feed token; bumping it revokes the old link
+    feed_version = models.PositiveIntegerField(default=0)
+
+    class Meta(AbstractUser.Meta):
+        # Case-insensitive prefix lookups of the user search run as range
+        # scans on these, one per searchable column
+        indexes = [
+            models.Index(Lower('username'), name='user_username_prefix_idx'),
+            models.Index(Lower('first_name'), name='user_first_name_prefix_idx'),
+            models.Index(Lower('last_name'), name='user_last_name_prefix_idx'),
+            models.Index(Lower('department'), name='user_department_prefix_idx'),
+        ]
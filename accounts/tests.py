@@ -1,3 +1,59 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from core.forms import MeetingUpdateForm
+from core.models import Meeting
+from .models import User
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.ann = User.objects.create(username='asmith', first_name='Ann', last_name='Smith', department='Sales')
+        self.andy = User.objects.create(username='andy', first_name='Andy', last_name='Jones', department='Research')
+        User.objects.create(username='annex', is_active=False)
+        self.client.force_login(self.boss)
+
+    def search(self, q):
+        response = self.client.get(reverse('user_search'), {'q': q})
+        return [result['id'] for result in response.json()['results']]
+
+    def test_matches_any_field_by_case_insensitive_prefix(self):
+        self.assertEqual(self.search('AN'), [self.andy.pk, self.ann.pk])
+        self.assertEqual(self.search('smi'), [self.ann.pk])
+        self.assertEqual(self.search('res'), [self.andy.pk])
+        self.assertEqual(self.search('mith'), [])
+        self.assertEqual(self.search(''), [])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search('ann smi'), [self.ann.pk])
+        self.assertEqual(self.search('ann jon'), [])
+
+    def test_terms_ending_in_the_last_code_point_are_searched(self):
+        top = chr(0x10FFFF)
+        odd = User.objects.create(username=f'a{top}b')
+        self.assertEqual(self.search(f'a{top}'), [odd.pk])
+        self.assertEqual(self.search(top), [])
+        self.assertEqual(self.search(chr(0xD7FF)), [])
+
+    def test_is_one_query(self):
+        self.client.get(reverse('user_search'), {'q': 'a'})
+        with self.assertNumQueries(3):  # session, user, search
+            self.client.get(reverse('user_search'), {'q': 'a'})
+
+
+class UserPickerTests(TestCase):
+    def test_only_selected_users_are_rendered(self):
+        users = User.objects.bulk_create(User(username=f'user{i}') for i in range(50))
+        meeting = Meeting.objects.create(title='Sync')
+        meeting.participants.add(users[3])
+        html = str(MeetingUpdateForm(instance=meeting)['participants'])
+        self.assertIn(f'name="participants" value="{users[3].pk}"', html)
+        self.assertEqual(html.count('type="hidden"'), 1)
+
+    def test_selected_ids_are_validated_in_one_query(self):
+        users = User.objects.bulk_create(User(username=f'user{i}') for i in range(5))
+        form = MeetingUpdateForm(instance=Meeting.objects.create(title='Sync'))
+        field = form.fields['participants']
+        with self.assertNumQueries(1):
+            self.assertEqual(len(field.clean([user.pk for user in users])), 5)
@@ -1,10 +1,20 @@
 # accounts/views.py
 
+import sys
+from functools import reduce
+from operator import and_, or_
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import update_session_auth_hash
 from django.contrib import messages
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.http import JsonResponse
 from .forms import UserProfileForm, CustomPasswordChangeForm
+from .models import User
+
+SEARCH_FIELDS = ('username', 'first_name', 'last_name', 'department')
+SEARCH_LIMIT = 10
 
 @login_required
 def profile_view(request):
@@ -33,4 +43,49 @@ def profile_view(request):
         'profile_form': profile_form,
         'password_form': password_form
     }
-    return render(request, 'accounts/profile.html', context)
\ No newline at end of file
+    return render(request, 'accounts/profile.html', context)
+
+def _prefix_match(term):
+    """
+    Q for users with any search field starting with `term` (lowercase). Each
+    is a range on the field's Lower() index rather than a LIKE, which most
+    databases cannot serve from an index without a special collation.
+    """
+    # The first string past the prefix bumps its last character; trailing
+    # U+10FFFF cannot be bumped, so it is dropped, and surrogates are skipped
+    stem = term.rstrip(chr(sys.maxunicode))
+    upper = None
+    if stem:
+        following = ord(stem[-1]) + 1
+        upper = stem[:-1] + chr(0xE000 if 0xD800 <= following <= 0xDFFF else following)
+    return reduce(or_, (
+        Q(**{f'{field}_lower__gte': term}) & (Q(**{f'{field}_lower__lt': upper}) if upper else Q())
+        for field in SEARCH_FIELDS
+    ))
+
+@login_required
+def user_search(request):
+    """
+    Active users for the user pickers: those with a field starting with ?q=,
+    or (for "ann smi") with a field starting with each of its words.
+    """
+    query = ' '.join(request.GET.get('q', '').lower().split())
+    if not query:
+        return JsonResponse({'results': []})
+    terms = query.split()[:3]
+    match = reduce(and_, (_prefix_match(term) for term in terms))
+    if len(terms) > 1:
+        match |= _prefix_match(query)
+    users = User.objects.alias(
+        **{f'{field}_lower': Lower(field) for field in SEARCH_FIELDS}
+    ).filter(match, is_active=True)
+    users = users.only(*SEARCH_FIELDS).order_by('username')[:SEARCH_LIMIT]
+    return JsonResponse({'results': [
+        {
+            'id': user.pk,
+            'label': str(user),
+            'detail': ' · '.join(part for part in (user.get_full_name(), user.department) if part),
+        }
+        for user in users
+    ]})
+
@@ -0,0 +1,36 @@
+# accounts/widgets.py
+
+from django import forms
+from django.urls import reverse_lazy
+
+
+class UserPicker(forms.Select):
+    """
+    Picks a user through the user search endpoint instead of listing every
+    user in the page. Only the selected users are rendered, as hidden inputs
+    carrying their ids; the field validates them as usual.
+    """
+    template_name = 'accounts/widgets/user_picker.html'
+    search_url = reverse_lazy('user_search')
+
+    def optgroups(self, name, value, attrs=None):
+        # The choices' queryset is only read for the current selection
+        ids = [v for v in value if str(v).isdigit()]
+        if not ids:
+            return []
+        field = self.choices.field
+        options = [
+            self.create_option(name, user.pk, field.label_from_instance(user), True, index)
+            for index, user in enumerate(self.choices.queryset.filter(pk__in=ids))
+        ]
+        return [(None, options, 0)]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['search_url'] = self.search_url
+        context['widget']['multiple'] = self.allow_multiple_selected
+        return context
+
+
+class UserMultiplePicker(UserPicker, forms.SelectMultiple):
+    pass
@@ -3,6 +3,10 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project through this module (e.g. ``uvicorn config.asgi:application``
+or gunicorn with uvicorn workers) for the live update stream at /live/stream/
+to hold its connections open; under WSGI it degrades to long polling.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 from dotenv import load_dotenv
 
@@ -34,6 +35,10 @@ INSTALLED_APPS = [
     'accounts',
     'core',
     'events',
+    'jobs',
+    'search',
+    'live',
+    'metrics',
     # 3rd Party Apps
     'tailwind',
     'theme',
@@ -42,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.MetricsMiddleware', # First, so it times everything below it
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', # Should be right after SecurityMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -56,7 +62,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, plus render timing for the requests metrics samples
+        'BACKEND': 'metrics.backends.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -80,6 +87,32 @@ DATABASES = {
     )
 }
 
+# Cache
+# LocMem is per process; with several gunicorn workers point CACHE_BACKEND at a
+# shared backend (e.g. django.core.cache.backends.db.DatabaseCache with
+# CACHE_LOCATION=cache_table after `createcachetable`, or FileBasedCache)
+# so cache invalidation reaches every worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+    }
+}
+
+# Background jobs
+# Eager mode runs each job in-process right after the enqueuing transaction
+# commits; turn it off in production and run `manage.py run_workers`.
+JOBS_EAGER = os.environ.get('JOBS_EAGER', str(DEBUG)) == 'True'
+
+# Request metrics (served at /metrics)
+# Each process writes its totals to METRICS_DIR, which must be shared by all
+# workers on a host; the endpoint sums the files.
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', '0.1'))
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'decisiontracker-metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [{'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},{'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},{'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator'},{'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'}]
 
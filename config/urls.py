@@ -21,5 +21,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
      path('accounts/', include('accounts.urls')),
      path('events/', include('events.urls')),
+    path('search/', include('search.urls')),
+    path('live/', include('live.urls')),
+    path('metrics', include('metrics.urls')),
     path('', include('core.urls')),
 ]
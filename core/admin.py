@@ -1,7 +1,11 @@
 # core/admin.py
 
 from django.contrib import admin
-from .models import Meeting, Task
+from .models import Meeting, MeetingException, Task
+
+class MeetingExceptionInline(admin.TabularInline):
+    model = MeetingException
+    extra = 0
 
 @admin.register(Meeting)
 class MeetingAdmin(admin.ModelAdmin):
@@ -9,6 +13,7 @@ class MeetingAdmin(admin.ModelAdmin):
     list_filter = ('status', 'meeting_type')
     search_fields = ('title',)
     filter_horizontal = ('participants',)
+    inlines = [MeetingExceptionInline]
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
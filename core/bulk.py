@@ -0,0 +1,60 @@
+# core/bulk.py
+
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.utils import timezone
+from live import broker
+from . import caching, counters
+from .models import Task
+
+
+def _owned_changes(tasks, changes):
+    """Net tasks_owned/tasks_owned_completed deltas per owner id for applying `changes` to `tasks`."""
+    deltas = defaultdict(Counter)
+    new_owner_id = changes['owner'].pk if changes.get('owner') else None
+    for task in tasks:
+        owner_id = new_owner_id if 'owner' in changes else task.owner_id
+        status = changes.get('status', task.status)
+        if (owner_id, status) == (task.owner_id, task.status):
+            continue
+        deltas[task.owner_id].update(counters.owned_deltas(task.status, sign=-1))
+        deltas[owner_id].update(counters.owned_deltas(status))
+    deltas.pop(None, None)
+    return {owner_id: {field: amount for field, amount in delta.items() if amount} for owner_id, delta in deltas.items()}
+
+
+def update_tasks(tasks, changes):
+    """
+    Applies `changes` ({field: value} over status, priority, owner and
+    due_date; an owner of None unassigns) to `tasks`, already loaded and permission checked, with one
+    UPDATE. QuerySet.update() sends no signals, so the counters, the search
+    index, the task cache and live subscribers are each brought up to date
+    once for the whole batch. Returns the number of rows updated.
+    """
+    tasks = list(tasks)
+    if not tasks or not changes:
+        return 0
+    ids = [task.pk for task in tasks]
+    deltas = _owned_changes(tasks, changes)
+
+    with transaction.atomic():
+        updated = Task.objects.filter(pk__in=ids).update(**changes, updated_at=timezone.now())
+        # Owners with the same net change share one counters update
+        owners_by_delta = defaultdict(list)
+        for owner_id, delta in deltas.items():
+            owners_by_delta[tuple(sorted(delta.items()))].append(owner_id)
+        for delta, owner_ids in owners_by_delta.items():
+            counters.add(dict(delta), user_ids=owner_ids)
+        if 'owner' in changes:
+            from search import index
+            index.reassign_tasks(ids, changes['owner'].pk if changes['owner'] else None)
+        if deltas:
+            broker.publish('task.bulk', {
+                'changes': [
+                    {'owner': owner_id, 'total': delta.get('tasks_owned', 0),
+                     'completed': delta.get('tasks_owned_completed', 0)}
+                    for owner_id, delta in deltas.items()
+                ],
+            }, user_ids=list(deltas), broadcast=True)
+    caching.bump('task')
+    return updated
@@ -0,0 +1,65 @@
+# core/caching.py
+
+import hashlib
+import time
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+NAMESPACES = ('meeting', 'task', 'event', 'invitation', 'user')
+
+KEY_PREFIX = 'dt'
+
+
+def _version_key(namespace):
+    return f'{KEY_PREFIX}:ns:{namespace}'
+
+
+def _seed():
+    # A lost version key restarts from the clock rather than from 1, so
+    # entries written under an older incarnation of it are never reused
+    return time.time_ns() // 1000
+
+
+def versions(*namespaces):
+    """Returns {namespace: version} in one cache round trip, creating missing versions."""
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(keys)
+    for key, namespace in keys.items():
+        if key not in found:
+            cache.add(key, _seed())
+            found[key] = cache.get(key)
+    return {namespace: found[key] for key, namespace in keys.items()}
+
+
+def _bump(namespaces):
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.add(_version_key(namespace), _seed())
+
+
+def bump(*namespaces):
+    """
+    Invalidates everything cached under the given namespaces. Inside a
+    transaction the bump is repeated on commit, so a reader that cached
+    pre-commit rows in between is invalidated as well.
+    """
+    _bump(namespaces)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(namespaces))
+
+
+def make_key(name, namespaces, *parts):
+    """Builds a cache key for `name` that changes whenever any of `namespaces` is bumped."""
+    current = versions(*namespaces)
+    stamp = '.'.join(f'{namespace}{current[namespace]}' for namespace in namespaces)
+    detail = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{name}:{stamp}:{detail}'
+
+
+def get_or_set(name, namespaces, parts, default, timeout=DEFAULT_TIMEOUT):
+    """Returns the cached value for (name, parts), computing it with `default()` on a miss."""
+    return cache.get_or_set(make_key(name, namespaces, *parts), default, timeout)
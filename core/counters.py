@@ -0,0 +1,140 @@
+# core/counters.py
+
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from .models import DashboardCounters, Meeting, Task
+
+COUNTER_FIELDS = (
+    'meetings_total',
+    'meetings_completed',
+    'meeting_minutes',
+    'meeting_tasks',
+    'tasks_owned',
+    'tasks_owned_completed',
+)
+
+
+def rows_for(user_id):
+    return DashboardCounters.objects.filter(user_id=user_id)
+
+
+def _row(user_id):
+    return rows_for(user_id).first() or DashboardCounters(user_id=user_id)
+
+
+def dashboard_scope(user):
+    """The counters row a user's dashboard reads: None (the global row) for privileged users."""
+    from .utils import is_privileged_user
+    return None if is_privileged_user(user) else user.pk
+
+
+def for_user(user):
+    """Returns the counters row a user's dashboard should read (the global row for privileged users)."""
+    return _row(dashboard_scope(user))
+
+
+def own(user):
+    """Returns the user's personal counters row, whatever their role."""
+    return _row(user.pk)
+
+
+def add(deltas, user_ids=(), include_global=False):
+    """Adds `deltas` ({field: amount}) to the given users' rows, and optionally the global row."""
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not deltas or not (user_ids or include_global):
+        return
+
+    rows = [DashboardCounters(user_id=user_id) for user_id in user_ids]
+    if include_global:
+        rows.append(DashboardCounters(user_id=None))
+    DashboardCounters.objects.bulk_create(rows, ignore_conflicts=True)
+
+    scope = Q(user_id__in=user_ids)
+    if include_global:
+        scope |= Q(user__isnull=True)
+    DashboardCounters.objects.filter(scope).update(
+        **{field: F(field) + amount for field, amount in deltas.items()}
+    )
+
+
+def negate(deltas):
+    return {field: -amount for field, amount in deltas.items()}
+
+
+def meeting_deltas(meetings):
+    """Per-participant deltas for joining the given meetings."""
+    meeting_ids = [meeting.pk for meeting in meetings]
+    totals = Meeting.objects.filter(pk__in=meeting_ids).aggregate(
+        meetings_total=Count('pk'),
+        meetings_completed=Count('pk', filter=Q(status=Meeting.MeetingStatus.COMPLETED)),
+        meeting_minutes=Sum('duration', default=0),
+    )
+    totals['meeting_tasks'] = Task.objects.filter(meeting_id__in=meeting_ids).count()
+    return totals
+
+
+def participant_ids(meeting_id):
+    return list(
+        Meeting.participants.through.objects.filter(meeting_id=meeting_id).values_list('user_id', flat=True)
+    )
+
+
+def owned_deltas(status, sign=1):
+    return {
+        'tasks_owned': sign,
+        'tasks_owned_completed': sign if status == Task.StatusChoices.COMPLETED else 0,
+    }
+
+
+def compute_expected():
+    """Recomputes every counters row from the source tables, keyed by user id (None is global)."""
+    expected = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    Participation = Meeting.participants.through
+    completed = Meeting.MeetingStatus.COMPLETED
+    participation = Participation.objects.filter(meeting__deleted_at__isnull=True)
+
+    for row in participation.values('user_id').annotate(
+        meetings_total=Count('meeting'),
+        meetings_completed=Count('meeting', filter=Q(meeting__status=completed)),
+        meeting_minutes=Sum('meeting__duration', default=0),
+    ):
+        expected[row.pop('user_id')].update(row)
+    for row in participation.filter(
+        meeting__tasks__isnull=False, meeting__tasks__deleted_at__isnull=True,
+    ).values('user_id').annotate(
+        meeting_tasks=Count('meeting__tasks'),
+    ):
+        expected[row.pop('user_id')].update(row)
+    for row in Task.objects.filter(owner__isnull=False).values('owner_id').annotate(
+        tasks_owned=Count('pk'),
+        tasks_owned_completed=Count('pk', filter=Q(status=Task.StatusChoices.COMPLETED)),
+    ):
+        expected[row.pop('owner_id')].update(row)
+
+    expected[None].update(Meeting.objects.aggregate(
+        meetings_total=Count('pk'),
+        meetings_completed=Count('pk', filter=Q(status=completed)),
+        meeting_minutes=Sum('duration', default=0),
+    ))
+    expected[None]['meeting_tasks'] = Task.objects.count()
+    return expected
+
+
+@transaction.atomic
+def rebuild(batch_size=500):
+    """Reconciles all counters rows with the source tables. Returns the number of rows corrected."""
+    expected = compute_expected()
+    changed = []
+    for row in DashboardCounters.objects.select_for_update():
+        values = expected.pop(row.user_id, None) or dict.fromkeys(COUNTER_FIELDS, 0)
+        if any(getattr(row, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(row, field, value)
+            changed.append(row)
+    DashboardCounters.objects.bulk_update(changed, COUNTER_FIELDS, batch_size=batch_size)
+
+    missing = [DashboardCounters(user_id=user_id, **values) for user_id, values in expected.items()]
+    DashboardCounters.objects.bulk_create(missing, batch_size=batch_size)
+    return len(changed) + len(missing)
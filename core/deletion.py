@@ -0,0 +1,143 @@
+# core/deletion.py
+
+from collections import defaultdict
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from . import caching, counters
+from .models import Meeting, MeetingException, Task
+
+
+def _remove_owned(owned):
+    """Takes tasks off their owners' counters; `owned` rows carry owner_id, total and completed."""
+    owners_by_delta = defaultdict(list)
+    for row in owned:
+        owners_by_delta[row['total'], row['completed']].append(row['owner_id'])
+    for (total, completed), owner_ids in owners_by_delta.items():
+        counters.add({'tasks_owned': -total, 'tasks_owned_completed': -completed}, user_ids=owner_ids)
+
+
+def delete_meeting(meeting):
+    """
+    Soft-deletes a meeting and its tasks with two UPDATEs, and takes them off
+    the counters and out of search. Nothing is loaded per task, however many
+    there are. Returns False if the meeting was already deleted.
+    """
+    from search import index
+    now = timezone.now()
+    with transaction.atomic():
+        # Stamping the meeting first also stops a concurrent delete counting it twice
+        if not Meeting.objects.filter(pk=meeting.pk).update(deleted_at=now):
+            return False
+        tasks = Task.objects.filter(meeting_id=meeting.pk)
+        owned = list(tasks.values('owner_id').annotate(
+            total=Count('pk'), completed=Count('pk', filter=Q(status=Task.StatusChoices.COMPLETED)),
+        ))
+        counters.add(
+            {
+                'meetings_total': -1,
+                'meetings_completed': -int(meeting.status == Meeting.MeetingStatus.COMPLETED),
+                'meeting_minutes': -int(meeting.duration),
+                'meeting_tasks': -sum(row['total'] for row in owned),
+            },
+            user_ids=counters.participant_ids(meeting.pk), include_global=True,
+        )
+        _remove_owned(row for row in owned if row['owner_id'])
+        tasks.update(deleted_at=now)
+        index.remove_meeting(meeting.pk)
+    caching.bump('meeting', 'task')
+    return True
+
+
+def delete_task(task):
+    """Soft-deletes one task. Returns False if it was already deleted."""
+    from search import index
+    with transaction.atomic():
+        if not Task.objects.filter(pk=task.pk).update(deleted_at=timezone.now()):
+            return False
+        counters.add(counters.owned_deltas(task.status, sign=-1), user_ids=[task.owner_id])
+        counters.add({'meeting_tasks': -1}, user_ids=counters.participant_ids(task.meeting_id), include_global=True)
+        index.remove(index.Kind.TASK, [task.pk])
+    caching.bump('task')
+    return True
+
+
+def delete_event(event):
+    """
+    Soft-deletes an event. Its invitations stay until the purge but are
+    touched, so calendar feeds drop the event on their next fetch.
+    Returns False if it was already deleted.
+    """
+    from events.models import Event, Invitation
+    from search import index
+    now = timezone.now()
+    with transaction.atomic():
+        if not Event.objects.filter(pk=event.pk).update(deleted_at=now):
+            return False
+        Invitation.objects.filter(event_id=event.pk).update(updated_at=now)
+        index.remove(index.Kind.EVENT, [event.pk])
+    caching.bump('event', 'invitation')
+    return True
+
+
+def _delete_in(cursor, model, column, ids, batch_size=None):
+    """
+    Raw DELETE of `model` rows whose `column` is in `ids`. With a batch size
+    the matching primary keys are read batch_size at a time and deleted by
+    key, looping until none are left; a DELETE selecting from its own table,
+    or a LIMIT inside IN, is not portable (MySQL rejects both). Returns the
+    number of rows deleted.
+    """
+    qn = connection.ops.quote_name
+    table, pk = qn(model._meta.db_table), qn(model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(ids))
+    if batch_size is None:
+        cursor.execute(f'DELETE FROM {table} WHERE {qn(column)} IN ({placeholders})', ids)
+        return cursor.rowcount
+    deleted = 0
+    while True:
+        cursor.execute(f'SELECT {pk} FROM {table} WHERE {qn(column)} IN ({placeholders}) LIMIT %s', [*ids, batch_size])
+        batch = [row[0] for row in cursor.fetchall()]
+        if not batch:
+            return deleted
+        deleted += _delete_in(cursor, model, model._meta.pk.column, batch)
+
+
+def _purge(model, before, batch_size, children):
+    """
+    Hard-deletes `model` rows soft-deleted before `before`, batch_size at a
+    time, each batch in its own short transaction. `children` lists the
+    (model, column) rows referencing them, deleted first. Signals are not
+    sent; the counters and search were settled when the rows were soft-deleted.
+    """
+    purged = 0
+    while True:
+        ids = list(model.all_objects.filter(deleted_at__lt=before).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return purged
+        with transaction.atomic(), connection.cursor() as cursor:
+            for child, column in children:
+                _delete_in(cursor, child, column, ids, batch_size)
+            purged += _delete_in(cursor, model, model._meta.pk.column, ids)
+
+
+def purge(before, batch_size=500):
+    """Hard-deletes tasks, meetings and events soft-deleted before `before`. Returns {name: rows purged}."""
+    from events.models import Event, EventException, Invitation
+    from search.models import SearchDocument
+    return {
+        'tasks': _purge(Task, before, batch_size, [(SearchDocument, 'task_id')]),
+        'meetings': _purge(Meeting, before, batch_size, [
+            # A meeting's documents include its tasks'
+            (SearchDocument, 'meeting_id'),
+            (MeetingException, 'series_id'),
+            (Meeting.participants.through, 'meeting_id'),
+            # Tasks go with their meeting; any not stamped with it are caught here
+            (Task, 'meeting_id'),
+        ]),
+        'events': _purge(Event, before, batch_size, [
+            (SearchDocument, 'event_id'),
+            (EventException, 'series_id'),
+            (Invitation, 'event_id'),
+        ]),
+    }
@@ -0,0 +1,157 @@
+# core/exports.py
+
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from django.utils import timezone
+from .models import Task
+
+REPORT_HEADER = ['Meeting', 'Meeting Time', 'Task', 'Assigned To', 'Status', 'Priority', 'Due Date']
+
+STATUS_LABELS = dict(Task.StatusChoices.choices)
+PRIORITY_LABELS = dict(Task.PriorityChoices.choices)
+
+# Spreadsheets evaluate a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _text_cell(value):
+    """Quotes user-entered text that a spreadsheet would otherwise run as a formula."""
+    if value and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def report_rows(manager=None, chunk_size=2000):
+    """
+    Yields one tuple per task for the management report, oldest meetings last.
+
+    Rows are read with values_list() through iterator(), which uses a
+    server-side cursor on PostgreSQL, so only `chunk_size` rows are held at once.
+    Meeting times are given in the current time zone.
+    """
+    tasks = Task.objects.all()
+    if manager is not None:
+        tasks = tasks.filter(owner=manager)
+    rows = tasks.order_by('-meeting__meeting_time', 'meeting_id', 'pk').values_list(
+        'meeting__title', 'meeting__meeting_time', 'title', 'owner__username', 'status', 'priority', 'due_date'
+    )
+    for meeting_title, meeting_time, title, owner, status, priority, due_date in rows.iterator(chunk_size=chunk_size):
+        yield (
+            _text_cell(meeting_title),
+            timezone.localtime(meeting_time).strftime('%Y-%m-%d %H:%M'),
+            _text_cell(title),
+            _text_cell(owner) or 'N/A',
+            STATUS_LABELS.get(status, status),
+            PRIORITY_LABELS.get(priority, priority),
+            due_date.isoformat() if due_date else '',
+        )
+
+
+class _Echo:
+    """A file-like object that hands back whatever is written to it."""
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(REPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class _ZipStream(io.RawIOBase):
+    """
+    Unseekable sink for zipfile. Because it cannot seek, zipfile writes data
+    descriptors after each member instead of going back to patch headers,
+    which lets the archive be drained and sent while it is still being built.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Task Report" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = b'</sheetData></worksheet>'
+
+# Control characters are not allowed anywhere in an XML document
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_row(values):
+    cells = ''.join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_INVALID_XML_CHARS.sub("", str(value)))}</t></is></c>'
+        for value in values
+    )
+    return f'<row>{cells}</row>'.encode()
+
+
+def stream_xlsx(rows, flush_every=500):
+    """Writes a single-sheet workbook using inline strings, yielding compressed bytes as it goes."""
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD)
+            sheet.write(_xlsx_row(REPORT_HEADER))
+            for count, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row))
+                if count % flush_every == 0:
+                    yield sink.drain()
+            sheet.write(_SHEET_TAIL)
+    yield sink.drain()
@@ -1,9 +1,69 @@
+import datetime
 from django import forms
+from django.utils import timezone
 from .models import Meeting, Task
+from .utils import is_privileged_user
+from . import ingest, recurrence
 from accounts.models import User
+from accounts.widgets import UserMultiplePicker, UserPicker
+
+class RecurrenceForm(forms.Form):
+    """The repeat fields shared by the meeting and event forms."""
+    recurrence = forms.ChoiceField(
+        choices=recurrence.PRESETS, required=False, label='Repeats',
+        widget=forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
+    )
+    recurrence_until = forms.DateField(
+        required=False, label='Until',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        instance = getattr(self, 'instance', None)
+        if instance and instance.pk:
+            # Rules stored some other way (admin, API) stay selectable
+            if instance.recurrence not in dict(recurrence.PRESETS):
+                self.fields['recurrence'].choices = [
+                    *recurrence.PRESETS, (instance.recurrence, instance.recurrence_label),
+                ]
+            if instance.recurrence_until:
+                self.fields['recurrence_until'].initial = timezone.localtime(instance.recurrence_until).date()
+
+    def clean_recurrence_until(self):
+        # The last day is included in full
+        until = self.cleaned_data.get('recurrence_until')
+        if until:
+            return timezone.make_aware(datetime.datetime.combine(until, datetime.time.max))
+        return None
+
+class OccurrenceForm(forms.Form):
+    """Cancels, moves or restores one occurrence of a repeating meeting or event."""
+    original_start = forms.DateTimeField(widget=forms.HiddenInput)
+    action = forms.ChoiceField(choices=[('cancel', 'Cancel'), ('move', 'Move'), ('restore', 'Restore')])
+    start = forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'rounded-md border-gray-300 shadow-sm text-sm'}),
+    )
+
+    def __init__(self, *args, series, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.series = series
+
+    def clean(self):
+        cleaned_data = super().clean()
+        original, action = cleaned_data.get('original_start'), cleaned_data.get('action')
+        if original and not recurrence.occurrence_starts(
+            self.series.recurrence, self.series.occurrence_start(), self.series.recurrence_until,
+            original, original + datetime.timedelta(microseconds=1),
+        ):
+            self.add_error('original_start', "No occurrence of this series starts then.")
+        if action == 'move' and not cleaned_data.get('start'):
+            self.add_error('start', "Pick the new start time.")
+        return cleaned_data
 
 # This form will be used for CREATING new meetings
-class MeetingCreateForm(forms.ModelForm):
+class MeetingCreateForm(RecurrenceForm, forms.ModelForm):
     DURATION_CHOICES = [(30, '30 minutes'), (60, '60 minutes'), (90, '90 minutes'), (120, '120 minutes')]
     duration = forms.ChoiceField(choices=DURATION_CHOICES, widget=forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}))
     meeting_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}))
@@ -12,15 +72,15 @@ class MeetingCreateForm(forms.ModelForm):
     class Meta:
         model = Meeting
         # Note: 'status' is NOT included here
-        fields = ['title', 'duration', 'meeting_type', 'participants']
+        fields = ['title', 'duration', 'meeting_type', 'participants', 'recurrence', 'recurrence_until']
         labels = {'title': 'Meeting Title', 'duration': 'Duration', 'meeting_type': 'Meeting Type', 'participants': 'Invite Participants'}
         widgets = {
             'meeting_type': forms.RadioSelect(attrs={'class': 'sr-only peer'}),
-            'participants': forms.CheckboxSelectMultiple(),
+            'participants': UserMultiplePicker(),
         }
 
 # This form will be used for UPDATING existing meetings
-class MeetingUpdateForm(forms.ModelForm):
+class MeetingUpdateForm(RecurrenceForm, forms.ModelForm):
     DURATION_CHOICES = [(30, '30 minutes'), (60, '60 minutes'), (90, '90 minutes'), (120, '120 minutes')]
     duration = forms.ChoiceField(choices=DURATION_CHOICES, widget=forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}))
     meeting_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}))
@@ -29,11 +89,11 @@ class MeetingUpdateForm(forms.ModelForm):
     class Meta:
         model = Meeting
         # Note: 'status' IS included here
-        fields = ['title', 'duration', 'meeting_type', 'participants', 'status']
+        fields = ['title', 'duration', 'meeting_type', 'participants', 'status', 'recurrence', 'recurrence_until']
         labels = {'title': 'Meeting Title', 'duration': 'Duration', 'meeting_type': 'Meeting Type', 'participants': 'Invite Participants', 'status': 'Meeting Status'}
         widgets = {
             'meeting_type': forms.RadioSelect(attrs={'class': 'sr-only peer'}),
-            'participants': forms.CheckboxSelectMultiple(),
+            'participants': UserMultiplePicker(),
             'status': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
         }
     
@@ -53,7 +113,7 @@ class TaskCreateForm(forms.ModelForm):
         widgets = {
             'title': forms.TextInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'description': forms.Textarea(attrs={'rows': 3, 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
-            'owner': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
+            'owner': UserPicker(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'due_date': forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'priority': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
         }
@@ -70,7 +130,7 @@ class TaskUpdateForm(forms.ModelForm):
         widgets = {
             'title': forms.TextInput(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'description': forms.Textarea(attrs={'rows': 3, 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
-            'owner': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
+            'owner': UserPicker(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'due_date': forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'priority': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
             'status': forms.Select(attrs={'class': 'mt-1 block w-full rounded-md border-gray-300 shadow-sm'}),
@@ -79,3 +139,57 @@ class TaskUpdateForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+
+class BulkTaskForm(forms.Form):
+    """Many tasks at once: pasted one per line, or an uploaded CSV or JSON file."""
+    lines = forms.CharField(
+        required=False, label='Tasks, one per line',
+        help_text='Title | owner username | due date (YYYY-MM-DD) | priority | description; only the title is required.',
+        widget=forms.Textarea(attrs={'rows': 8, 'placeholder': 'Draft the budget | alice | 2030-01-31 | high'}),
+    )
+    file = forms.FileField(required=False, label='Or upload a CSV or JSON file')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        try:
+            if cleaned_data.get('file'):
+                cleaned_data['rows'] = ingest.parse_upload(cleaned_data['file'])
+            else:
+                cleaned_data['rows'] = ingest.parse_lines(cleaned_data.get('lines') or '')
+        except ValueError as error:
+            raise forms.ValidationError(str(error))
+        return cleaned_data
+
+class TaskBulkUpdateForm(forms.Form):
+    """One change applied to many tasks. Only tasks the user may edit can be selected."""
+    CHANGE_FIELDS = ('status', 'priority', 'owner', 'due_date')
+
+    tasks = forms.ModelMultipleChoiceField(queryset=Task.objects.none(), widget=forms.MultipleHiddenInput)
+    status = forms.ChoiceField(choices=[('', 'Keep status'), *Task.StatusChoices.choices], required=False)
+    priority = forms.ChoiceField(choices=[('', 'Keep priority'), *Task.PriorityChoices.choices], required=False)
+    owner = forms.ModelChoiceField(queryset=User.objects.filter(is_active=True), required=False, widget=UserPicker)
+    unassign = forms.BooleanField(required=False, label='Remove owner')
+    due_date = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The same rule as task_update: privileged users or the task's owner
+        tasks = Task.objects.all()
+        if not is_privileged_user(user):
+            tasks = tasks.filter(owner=user)
+        self.fields['tasks'].queryset = tasks
+
+    def clean(self):
+        cleaned_data = super().clean()
+        changes = {
+            field: cleaned_data[field] for field in self.CHANGE_FIELDS if cleaned_data.get(field) not in (None, '')
+        }
+        if cleaned_data.get('unassign'):
+            if 'owner' in changes:
+                raise forms.ValidationError("Choose a new owner or remove the owner, not both.")
+            changes['owner'] = None
+        if not changes:
+            raise forms.ValidationError("Choose a change to apply.")
+        cleaned_data['changes'] = changes
+        return cleaned_data
+
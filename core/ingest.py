@@ -0,0 +1,151 @@
+# core/ingest.py
+
+import csv
+import io
+import json
+from collections import Counter, defaultdict
+from django import forms
+from django.db import connection, transaction
+from django.utils import timezone
+from accounts.models import User
+from jobs.queue import enqueue
+from search.jobs import index_tasks
+from . import caching, counters
+from .models import Task
+
+# Columns of a pasted line ("title | owner | due date | priority | description"),
+# and the names accepted as CSV headers or JSON keys
+COLUMNS = ('title', 'owner', 'due_date', 'priority', 'description')
+MAX_ROWS = 500
+
+
+class TaskRowForm(forms.ModelForm):
+    """Validates one imported row; the owner is resolved separately, for all rows at once."""
+    priority = forms.TypedChoiceField(choices=Task.PriorityChoices.choices, required=False,
+                                      empty_value=Task.PriorityChoices.MEDIUM)
+
+    class Meta:
+        model = Task
+        fields = ['title', 'description', 'due_date', 'priority']
+
+
+def _row(values):
+    row = {key: str(value).strip() for key, value in values.items() if key in COLUMNS and value is not None}
+    if row.get('priority'):
+        row['priority'] = row['priority'].upper()
+    return row
+
+
+def parse_lines(text):
+    """Rows from pasted text, one task per line with "|" between columns. Returns [(line number, row)]."""
+    rows = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if line.strip():
+            rows.append((number, _row(dict(zip(COLUMNS, line.split('|'))))))
+    return rows
+
+
+def parse_csv(text):
+    """Rows from CSV with a header row naming the columns. Returns [(line number, row)]."""
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or 'title' not in [name.strip().lower() for name in reader.fieldnames]:
+        raise ValueError("The CSV needs a header row with at least a 'title' column.")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    return [(reader.line_num, _row(values)) for values in reader if any((value or '').strip() for value in values.values())]
+
+
+def parse_json(text):
+    """Rows from a JSON list of objects (or {"tasks": [...]}). Returns [(position, row)]."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Not valid JSON: {error}")
+    if isinstance(data, dict):
+        data = data.get('tasks')
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("Expected a list of task objects.")
+    return [(number, _row(item)) for number, item in enumerate(data, start=1)]
+
+
+def parse_upload(upload):
+    """Rows from an uploaded .csv or .json file."""
+    try:
+        text = upload.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("The file must be UTF-8 text.")
+    if upload.name.lower().endswith('.json') or upload.content_type == 'application/json':
+        return parse_json(text)
+    return parse_csv(text)
+
+
+def build_tasks(meeting, rows, owner=None):
+    """
+    Validates every row and returns (tasks, errors): unsaved tasks for
+    `meeting`, or a list of {'row', 'field', 'message'} if any row is bad.
+    Owners are looked up by username in one query; passing `owner` assigns
+    every task to that user instead.
+    """
+    if not rows:
+        return [], [{'row': None, 'field': None, 'message': "There are no tasks to add."}]
+    if len(rows) > MAX_ROWS:
+        return [], [{'row': None, 'field': None, 'message': f"At most {MAX_ROWS} tasks can be added at once."}]
+
+    owners = {}
+    if owner is None:
+        usernames = {row['owner'] for _, row in rows if row.get('owner')}
+        owners = {user.username: user for user in User.objects.filter(username__in=usernames, is_active=True)}
+
+    tasks, errors = [], []
+    for number, row in rows:
+        form = TaskRowForm(row)
+        if not form.is_valid():
+            errors.extend(
+                {'row': number, 'field': field, 'message': message}
+                for field, messages in form.errors.items() for message in messages
+            )
+            continue
+        task = form.save(commit=False)
+        task.meeting = meeting
+        if owner is not None:
+            task.owner = owner
+        elif row.get('owner'):
+            task.owner = owners.get(row['owner'])
+            if task.owner is None:
+                errors.append({'row': number, 'field': 'owner', 'message': f"No active user named '{row['owner']}'."})
+                continue
+        tasks.append(task)
+    return ([], errors) if errors else (tasks, [])
+
+
+def _inserted(meeting, tasks, since):
+    """
+    The tasks just bulk-created, with primary keys. Backends that do not
+    return them from a bulk insert (MySQL) get the new rows read back.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return tasks
+    titles = {task.title for task in tasks}
+    return list(Task.objects.filter(meeting=meeting, created_at__gte=since, title__in=titles).order_by('pk'))
+
+
+def create_tasks(meeting, tasks):
+    """
+    Inserts the tasks in one transaction. bulk_create skips the signals
+    that keep the counters and the search index current: the counters are
+    updated here, with one update per distinct amount, and indexing is
+    queued for a worker.
+    """
+    with transaction.atomic():
+        since = timezone.now()
+        tasks = _inserted(meeting, Task.objects.bulk_create(tasks), since)
+        counters.add(
+            {'meeting_tasks': len(tasks)}, user_ids=counters.participant_ids(meeting.pk), include_global=True
+        )
+        owners_by_amount = defaultdict(list)
+        for owner_id, amount in Counter(task.owner_id for task in tasks if task.owner_id).items():
+            owners_by_amount[amount].append(owner_id)
+        for amount, owner_ids in owners_by_amount.items():
+            counters.add({'tasks_owned': amount}, user_ids=owner_ids)
+        enqueue(index_tasks, task_ids=[task.pk for task in tasks])
+    caching.bump('task')
+    return tasks
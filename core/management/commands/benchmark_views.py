@@ -0,0 +1,269 @@
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import Meeting, Task
+from events.feeds import feed_token
+from events.models import Event, Invitation
+
+URLCONFS = ('core.urls', 'events.urls', 'accounts.urls')
+
+ROLES = {
+    'manager': User.Role.MANAGER,
+    'management': User.Role.MANAGEMENT,
+}
+
+# The whole-dataset export is far too heavy to hammer by default
+DEFAULT_EXCLUDE = ['management_report_export']
+
+
+def _sample_pk(name, user):
+    """A recent object of the kind named by the URL that `user` can open."""
+    kind = name.split('_')[0]
+    if kind == 'meeting':
+        queryset = Meeting.objects.visible_to(user).order_by('-meeting_time')
+    elif kind == 'task':
+        queryset = Task.objects.order_by('-pk')
+        if user.role != User.Role.MANAGEMENT:
+            queryset = queryset.filter(owner=user)
+    elif kind == 'event':
+        queryset = Event.objects.visible_to(user).order_by('-start_datetime')
+    else:
+        return None
+    return queryset.values_list('pk', flat=True).first()
+
+
+def _sample_kwarg(param, name, user):
+    if param == 'pk':
+        return _sample_pk(name, user)
+    if param == 'manager_id':
+        return Task.objects.filter(owner__role=User.Role.MANAGER).values_list('owner_id', flat=True).first()
+    if param == 'token':
+        return feed_token(user)
+    if param == 'invitation_pk':
+        return Invitation.objects.filter(invitee=user).values_list('pk', flat=True).first()
+    if param == 'response':
+        return 'accept'
+    return None
+
+
+def _url_for(pattern, user):
+    kwargs = {}
+    for param in pattern.pattern.converters:
+        value = _sample_kwarg(param, pattern.name, user)
+        if value is None:
+            return None
+        kwargs[param] = value
+    return reverse(pattern.name, kwargs=kwargs)
+
+
+def _client(host, user_id):
+    client = Client(SERVER_NAME=host)
+    client.force_login(User.objects.get(pk=user_id))
+    return client
+
+
+def _hammer(host, user_id, url, count):
+    """Requests `url` `count` times as one user. Returns (milliseconds, queries, status) per request."""
+    client = _client(host, user_id)
+    samples = []
+    for _ in range(count):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+        samples.append((elapsed, len(queries), response.status_code))
+    return samples
+
+
+def _pooled_hammer(*args):
+    # Pool threads and processes each hold their own connection
+    try:
+        return _hammer(*args)
+    finally:
+        connection.close()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def summarize(samples, wall_seconds):
+    latencies = sorted(sample[0] for sample in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[2] >= 400),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'throughput_rps': round(len(samples) / wall_seconds, 1),
+        'queries_per_request': round(sum(sample[1] for sample in samples) / len(samples), 2),
+        'max_queries': max(sample[1] for sample in samples),
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms, query_tolerance=0.5):
+    """
+    Returns {label: [problem, ...]} for every view that got slower at p95 by
+    more than `tolerance` (a fraction) and `min_delta_ms`, or that issues more
+    queries than the baseline.
+    """
+    regressions = {}
+    for label, current in results.items():
+        previous = baseline.get(label)
+        if previous is None:
+            continue
+        problems = []
+        delta = current['p95_ms'] - previous['p95_ms']
+        if delta > min_delta_ms and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            problems.append(f"p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current['queries_per_request'] > previous['queries_per_request'] + query_tolerance:
+            problems.append(f"queries {previous['queries_per_request']} -> {current['queries_per_request']}")
+        if problems:
+            regressions[label] = problems
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Logs in existing users and hammers every GET view in the core, events and accounts URLconfs "
+        "from a pool of test clients, reporting latency percentiles, throughput and queries per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help="Requests per view and role.")
+        parser.add_argument('--concurrency', type=int, default=4, help="Clients hitting a view at the same time.")
+        parser.add_argument('--processes', action='store_true',
+                            help="Run clients in forked processes instead of threads (avoids the GIL).")
+        parser.add_argument('--users', type=int, default=4, help="Distinct users per role.")
+        parser.add_argument('--role', action='append', choices=sorted(ROLES), help="Only benchmark these roles.")
+        parser.add_argument('--only', action='append', metavar='URL_NAME', help="Only benchmark these URL names.")
+        parser.add_argument('--exclude', action='append', metavar='URL_NAME',
+                            help=f"Skip these URL names (default: {', '.join(DEFAULT_EXCLUDE)}).")
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare against.")
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="Allowed fractional p95 slowdown against the baseline.")
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help="p95 slowdowns smaller than this are treated as noise.")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)['results']
+
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        targets, skipped = self.collect_targets(host, options)
+        if not targets:
+            raise CommandError("Nothing to benchmark; seed some data first (see seed_scale).")
+
+        if options['processes']:
+            # Children must open their own database connections
+            connections.close_all()
+            pool = ProcessPoolExecutor(options['concurrency'], mp_context=multiprocessing.get_context('fork'))
+        else:
+            pool = ThreadPoolExecutor(options['concurrency'])
+
+        results = {}
+        with pool:
+            for label, urls in targets.items():
+                results[label] = self.run_target(pool, host, urls, options)
+                self.report_line(label, results[label], baseline)
+
+        regressions = compare(results, baseline, options['tolerance'], options['min_delta_ms']) if baseline else {}
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'concurrency': options['concurrency'],
+                    'mode': 'processes' if options['processes'] else 'threads',
+                    'results': results,
+                    'skipped': skipped,
+                }, fh, indent=2, sort_keys=True)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        for label, reason in skipped.items():
+            self.stdout.write(f"skipped {label}: {reason}")
+        if regressions:
+            for label, problems in regressions.items():
+                self.stderr.write(f"REGRESSION {label}: {'; '.join(problems)}")
+            raise CommandError(f"{len(regressions)} view(s) regressed against {options['baseline']}.")
+
+    def collect_targets(self, host, options):
+        """
+        Returns ({'name[role]': [(user_id, url), ...]}, {'name[role]': reason}).
+        Each view is requested once per role up front; views a role cannot GET
+        (POST-only, forbidden, nothing to show) are skipped with the reason.
+        """
+        exclude = set(options['exclude'] or DEFAULT_EXCLUDE)
+        patterns = [
+            pattern
+            for urlconf in URLCONFS
+            for pattern in import_module(urlconf).urlpatterns
+            if pattern.name and pattern.name not in exclude and (not options['only'] or pattern.name in options['only'])
+        ]
+
+        targets, skipped = {}, {}
+        for role in options['role'] or ROLES:
+            users = list(
+                User.objects.filter(role=ROLES[role], is_active=True).order_by('pk')[:options['users']]
+            )
+            if not users:
+                skipped[f'*[{role}]'] = "no users with this role"
+                continue
+            for pattern in patterns:
+                label = f'{pattern.name}[{role}]'
+                urls = [(user.pk, url) for user in users if (url := _url_for(pattern, user))]
+                if not urls:
+                    skipped[label] = "no sample object to request"
+                    continue
+                user_id, url = urls[0]
+                status = _hammer(host, user_id, url, 1)[0][2]
+                if status >= 400:
+                    skipped[label] = "POST only" if status == 405 else f"GET returned {status}"
+                    continue
+                targets[label] = urls
+        return targets, skipped
+
+    def run_target(self, pool, host, urls, options):
+        # Split the requests across the clients, cycling through the sample users
+        concurrency = options['concurrency']
+        shares = [options['requests'] // concurrency + (i < options['requests'] % concurrency) for i in range(concurrency)]
+        started = time.perf_counter()
+        futures = [
+            pool.submit(_pooled_hammer, host, *urls[i % len(urls)], count)
+            for i, count in enumerate(shares) if count
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+        return summarize(samples, time.perf_counter() - started)
+
+    def report_line(self, label, result, baseline):
+        line = (
+            f"{label:<40} p50 {result['p50_ms']:>8.1f}ms  p95 {result['p95_ms']:>8.1f}ms  "
+            f"p99 {result['p99_ms']:>8.1f}ms  {result['throughput_rps']:>7.1f} req/s  "
+            f"{result['queries_per_request']:>5.1f} q/req"
+        )
+        previous = (baseline or {}).get(label)
+        if previous:
+            line += f"  (p95 {result['p95_ms'] - previous['p95_ms']:+.1f}ms)"
+        if result['errors']:
+            line += self.style.ERROR(f"  {result['errors']} error(s)")
+        self.stdout.write(line)
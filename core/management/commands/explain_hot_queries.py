@@ -0,0 +1,58 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import User
+from core import counters, queries
+from core.views import UPCOMING_HORIZON
+from events import queries as event_queries
+from events.conflicts import overlapping_invitations
+
+
+class Command(BaseCommand):
+    help = "Prints EXPLAIN plans for the queries behind each hot view, to confirm which indexes are used."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username whose view of the data is explained (defaults to the first manager).")
+        parser.add_argument('--analyze', action='store_true', help="Run EXPLAIN ANALYZE (PostgreSQL only).")
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(role=User.Role.MANAGER).order_by('pk').first()
+        if user is None:
+            raise CommandError("No matching user to explain queries for.")
+
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError("--analyze is only supported on PostgreSQL.")
+            explain_options = {'analyze': True, 'buffers': True}
+
+        self.stdout.write(f"Backend: {connection.vendor}; explaining as '{user.username}'\n")
+        for label, queryset in self.hot_queries(user):
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
+
+    def hot_queries(self, user):
+        """The first-page queries of each hot view, built by the same functions the views call."""
+        now = timezone.now()
+        window_end = now + datetime.timedelta(hours=1)
+        invitations = event_queries.my_invitations(user)
+
+        return [
+            ("meeting_list: counters row", counters.rows_for(counters.dashboard_scope(user))),
+            ("meeting_list: upcoming meetings", queries.upcoming_meetings(user, now, now + UPCOMING_HORIZON)),
+            ("meeting_list: past meetings page", queries.past_meetings(user, now).page_queryset()),
+            ("my_tasks: open tasks", queries.open_tasks(user)),
+            ("my_tasks: completed tasks page", queries.completed_tasks(user).page_queryset()),
+            ("management_dashboard: managers", queries.managers_with_counts()),
+            ("management_report: meetings page", queries.report_meetings(queries.report_tasks(user))[:10]),
+            ("event_list: first page", event_queries.event_list(user).page_queryset()),
+            ("my_events: invitations page", invitations.page_queryset()),
+            ("event conflicts", overlapping_invitations([user.pk], now, window_end)),
+        ]
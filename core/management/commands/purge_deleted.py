@@ -0,0 +1,20 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import deletion
+
+
+class Command(BaseCommand):
+    help = "Hard-deletes meetings, tasks and events that were soft-deleted more than --days ago, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=float, default=30, help="Keep rows deleted more recently than this (default 30).")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - datetime.timedelta(days=options['days'])
+        purged = deletion.purge(before, batch_size=options['batch_size'])
+        summary = ', '.join(f"{count} {name}" for name, count in purged.items())
+        self.stdout.write(self.style.SUCCESS(f"Purged {summary} deleted before {before:%Y-%m-%d %H:%M}."))
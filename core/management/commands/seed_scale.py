@@ -0,0 +1,239 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from core import caching, counters
+from core.forms import MeetingCreateForm
+from core.models import Meeting, Task
+from events.models import Event, Invitation
+
+TEAM_SIZE = 12
+# Generated history is laid out around this date unless --anchor is given
+ANCHOR = datetime.date(2026, 1, 5)
+
+MEETING_TYPES = (Meeting.MeetingType.values, [50, 20, 15, 15])
+# Only the lengths the meeting forms offer
+DURATIONS = ([minutes for minutes, _ in MeetingCreateForm.DURATION_CHOICES], [30, 40, 15, 15])
+PRIORITIES = (Task.PriorityChoices.values, [20, 55, 25])
+
+S = Task.StatusChoices
+# Older work is mostly done; work from upcoming meetings has barely started
+TASK_STATUSES = {
+    'old': ([S.COMPLETED, S.IN_PROGRESS, S.PENDING, S.BLOCKED], [70, 10, 12, 8]),
+    'recent': ([S.PENDING, S.IN_PROGRESS, S.COMPLETED, S.BLOCKED], [45, 30, 15, 10]),
+    'future': ([S.PENDING, S.IN_PROGRESS], [85, 15]),
+}
+
+I = Invitation.StatusChoices
+INVITATION_STATUSES = {
+    'past': ([I.ACCEPTED, I.REJECTED, I.PENDING], [70, 15, 15]),
+    'future': ([I.PENDING, I.ACCEPTED, I.REJECTED], [50, 40, 10]),
+}
+EVENT_MINUTES = [30, 60, 60, 90, 120, 180]
+
+TASK_COLUMNS = ['title', 'meeting_id', 'owner_id', 'due_date', 'status', 'priority', 'created_at', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates production-shaped users, meetings, tasks, events and invitations with bulk inserts. "
+        "The same --seed and --anchor always produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--meetings', type=int, default=200000)
+        parser.add_argument('--tasks', type=int, default=2000000)
+        parser.add_argument('--events', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--anchor', type=datetime.date.fromisoformat, default=ANCHOR,
+            help="Date the data is laid out around, as YYYY-MM-DD: two years of history before it and a quarter after.",
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='seed', help="Username prefix for generated users.")
+        parser.add_argument('--password', default='seed-password', help="Password given to every generated user.")
+        parser.add_argument('--skip-search', action='store_true', help="Do not rebuild the search index afterwards.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError("--users must be at least 2.")
+        if options['meetings'] < 1 and options['tasks']:
+            raise CommandError("Tasks need at least one meeting.")
+        if User.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(f"Users prefixed '{options['prefix']}' already exist; pick another --prefix.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.make_aware(datetime.datetime.combine(options['anchor'], datetime.time(12)))
+        started = time.monotonic()
+
+        management, teams = self.seed_users(options['users'], options['prefix'], options['password'])
+        self.seed_meetings(options['meetings'], options['tasks'], management, teams)
+        self.seed_events(options['events'], management, teams)
+
+        # bulk_create skips the signal handlers that maintain these
+        self.stdout.write("Rebuilding dashboard counters...")
+        counters.rebuild()
+        if not options['skip_search']:
+            self.stdout.write("Rebuilding search index...")
+            call_command('rebuild_search_index', stdout=self.stdout)
+        caching.bump(*caching.NAMESPACES)
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {time.monotonic() - started:.1f}s."))
+
+    def _progress(self, label, done, total, started):
+        rate = done / max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f"  {label}: {done}/{total} ({rate:,.0f} rows/s)")
+
+    def _pick(self, choices):
+        values, weights = choices
+        return self.rng.choices(values, weights)[0]
+
+    def seed_users(self, count, prefix, password):
+        self.stdout.write(f"Creating {count} users...")
+        # Hashing is deliberately slow, so every user shares one hash
+        password_hash = make_password(password)
+        management_count = max(1, count // 50)
+        users = [
+            User(
+                username=f'{prefix}{n:06d}',
+                email=f'{prefix}{n:06d}@example.com',
+                password=password_hash,
+                role=User.Role.MANAGEMENT if n < management_count else User.Role.MANAGER,
+                department=f'Team {n // TEAM_SIZE}',
+            )
+            for n in range(count)
+        ]
+        with transaction.atomic():
+            users = User.objects.bulk_create(users, batch_size=self.batch_size)
+        management = [user.pk for user in users[:management_count]]
+        managers = [user.pk for user in users[management_count:]] or management
+        teams = [managers[i:i + TEAM_SIZE] for i in range(0, len(managers), TEAM_SIZE)]
+        return management, teams
+
+    def _attendees(self, management, teams, low, high):
+        """A slice of one team, sometimes joined by someone from management."""
+        team = self.rng.choice(teams)
+        people = self.rng.sample(team, min(len(team), self.rng.randint(low, high)))
+        if self.rng.random() < 0.2:
+            people.append(self.rng.choice(management))
+        return list(dict.fromkeys(people))
+
+    def seed_meetings(self, meeting_count, task_count, management, teams):
+        self.stdout.write(f"Creating {meeting_count} meetings and {task_count} tasks...")
+        Participation = Meeting.participants.through
+        started = time.monotonic()
+        tasks_done = 0
+
+        for offset in range(0, meeting_count, self.batch_size):
+            size = min(self.batch_size, meeting_count - offset)
+            meetings = []
+            for _ in range(size):
+                # Two years of history and a quarter ahead, on working hours
+                day = self.now - datetime.timedelta(days=self.rng.randint(-90, 730))
+                meeting_time = day.replace(hour=self.rng.randint(8, 17), minute=self.rng.choice([0, 15, 30, 45]))
+                past = meeting_time < self.now
+                meetings.append(Meeting(
+                    title=f'{self._pick(MEETING_TYPES).title()} sync {offset + len(meetings)}',
+                    meeting_time=meeting_time,
+                    duration=self._pick(DURATIONS),
+                    meeting_type=self._pick(MEETING_TYPES),
+                    status=Meeting.MeetingStatus.COMPLETED if past and self.rng.random() < 0.95
+                    else Meeting.MeetingStatus.UPCOMING,
+                ))
+
+            with transaction.atomic():
+                meetings = Meeting.objects.bulk_create(meetings)
+                links, tasks = [], []
+                for index, meeting in enumerate(meetings, start=offset):
+                    people = self._attendees(management, teams, 3, 10)
+                    links.extend((meeting.pk, user_id) for user_id in people)
+                    # Spread the task total exactly across meetings
+                    wanted = task_count * (index + 1) // meeting_count - task_count * index // meeting_count
+                    tasks.extend(self._tasks_for(meeting, people, wanted))
+                self._insert(Participation, ['meeting_id', 'user_id'], links)
+                self._insert(Task, TASK_COLUMNS, tasks)
+            tasks_done += len(tasks)
+            self._progress('meetings', offset + size, meeting_count, started)
+        self._progress('tasks', tasks_done, task_count, started)
+
+    def _tasks_for(self, meeting, people, count):
+        age = (self.now - meeting.meeting_time).days
+        statuses = TASK_STATUSES['future' if age < 0 else 'old' if age > 30 else 'recent']
+        adapt_date = connection.ops.adapt_datefield_value
+        stamp = connection.ops.adapt_datetimefield_value(self.now)
+        for n in range(count):
+            due_date = None
+            if self.rng.random() < 0.85:
+                due_date = adapt_date((meeting.meeting_time + datetime.timedelta(days=self.rng.randint(1, 30))).date())
+            yield (
+                f'Action item {n + 1} from {meeting.title}',
+                meeting.pk,
+                self.rng.choice(people) if self.rng.random() < 0.9 else None,
+                due_date,
+                self._pick(statuses),
+                self._pick(PRIORITIES),
+                stamp,
+                stamp,
+            )
+
+    def _insert(self, model, columns, rows):
+        """
+        Inserts plain tuples with executemany. The child tables are the bulk of
+        the data, and skipping model instances makes them several times faster
+        to load than bulk_create. Values must already be adapted for the backend.
+        """
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table), ', '.join(quote(column) for column in columns), ', '.join(['%s'] * len(columns)),
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                cursor.executemany(sql, rows[start:start + self.batch_size])
+
+    def seed_events(self, event_count, management, teams):
+        self.stdout.write(f"Creating {event_count} events...")
+        started = time.monotonic()
+        invitations_done = 0
+        stamp = connection.ops.adapt_datetimefield_value(self.now)
+
+        for offset in range(0, event_count, self.batch_size):
+            size = min(self.batch_size, event_count - offset)
+            events = []
+            for n in range(offset, offset + size):
+                day = self.now - datetime.timedelta(days=self.rng.randint(-90, 365))
+                # Clustered on working hours, so invitees' events overlap
+                start = day.replace(hour=self.rng.randint(8, 17), minute=self.rng.choice([0, 30]))
+                end = None
+                if self.rng.random() < 0.85:
+                    end = start + datetime.timedelta(minutes=self.rng.choice(EVENT_MINUTES))
+                events.append(Event(
+                    title=f'Event {n}',
+                    start_datetime=start,
+                    end_datetime=end,
+                    # Normally set by save(), which bulk_create bypasses
+                    effective_end=Event.effective_end_for(start, end),
+                    location=self.rng.choice(['Room A', 'Room B', 'Auditorium', 'Online', None]),
+                    created_by_id=self.rng.choice(management),
+                ))
+
+            with transaction.atomic():
+                events = Event.objects.bulk_create(events)
+                invitations = []
+                for event in events:
+                    statuses = INVITATION_STATUSES['past' if event.start_datetime < self.now else 'future']
+                    invitees = self._attendees(management, teams, 2, TEAM_SIZE)
+                    invitations.extend(
+                        (event.pk, user_id, self._pick(statuses), stamp) for user_id in invitees
+                    )
+                self._insert(Invitation, ['event_id', 'invitee_id', 'status', 'updated_at'], invitations)
+            invitations_done += len(invitations)
+            self._progress('events', offset + size, event_count, started)
+        self.stdout.write(f"  invitations: {invitations_done}")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:27
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_meeting_participants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('meetings_total', models.IntegerField(default=0)),
+                ('meetings_completed', models.IntegerField(default=0)),
+                ('meeting_minutes', models.IntegerField(default=0)),
+                ('meeting_tasks', models.IntegerField(default=0)),
+                ('tasks_owned', models.IntegerField(default=0)),
+                ('tasks_owned_completed', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard counters',
+                'constraints': [models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('user', models.Value(0)), name='unique_dashboard_counters_scope')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:59
+
+import core.recurrence
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_start', models.DateTimeField()),
+                ('cancelled', models.BooleanField(default=False)),
+                ('start', models.DateTimeField(blank=True, help_text='New start, if the occurrence was moved.', null=True)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence',
+            field=models.CharField(blank=True, help_text='An RFC 5545 RRULE such as FREQ=WEEKLY;BYDAY=MO, or blank for a one-off.', max_length=255, validators=[core.recurrence.validate_rule]),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_end',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(('recurrence', ''), _negated=True), fields=['meeting_time'], name='meeting_series_idx'),
+        ),
+        migrations.AddField(
+            model_name='meetingexception',
+            name='series',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='core.meeting'),
+        ),
+        migrations.AddConstraint(
+            model_name='meetingexception',
+            constraint=models.UniqueConstraint(fields=('series', 'original_start'), name='unique_meeting_exception'),
+        ),
+    ]
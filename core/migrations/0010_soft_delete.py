@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='meeting',
+            name='meeting_time_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='meeting',
+            name='meeting_series_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_owner_status_due_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_open_owner_due_idx',
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['meeting_time', 'status'], name='meeting_time_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(models.Q(('recurrence', ''), _negated=True), ('deleted_at__isnull', True)), fields=['meeting_time'], name='meeting_series_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='meeting_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['owner', 'status', 'due_date'], name='task_owner_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(models.Q(('status', 'COMPLETED'), _negated=True), ('deleted_at__isnull', True)), fields=['owner', 'due_date'], name='task_open_owner_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='task_deleted_idx'),
+        ),
+    ]
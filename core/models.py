@@ -1,11 +1,181 @@
 # core/models.py
 
+import copy
+import datetime
 from django.db import models
+from django.db.models import Q, prefetch_related_objects
 from django.utils import timezone
 from django.urls import reverse
 from django.conf import settings
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Coalesce
+from . import recurrence
+from .utils import is_privileged_user
 
-class Meeting(models.Model):
+class Recurring(models.Model):
+    """
+    A row that may repeat. A repeating row stands for its whole series and is
+    stored once; occurrences are expanded on demand for a window, as unsaved
+    copies with their times moved. Subclasses name their start field in
+    START_FIELD, implement occurrence_length() and move_to(), and have an
+    `exceptions` relation of OccurrenceException rows.
+    """
+    START_FIELD = None
+
+    recurrence = models.CharField(
+        max_length=255, blank=True, validators=[recurrence.validate_rule],
+        help_text="An RFC 5545 RRULE such as FREQ=WEEKLY;BYDAY=MO, or blank for a one-off.",
+    )
+    recurrence_until = models.DateTimeField(null=True, blank=True)
+    # End of the series' last occurrence (null while it repeats forever); kept
+    # by save() so window lookups can skip series that are already over
+    recurrence_end = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Set on the copies returned by occurrences()
+    original_start = None
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_occurrence(self):
+        return self.original_start is not None
+
+    @property
+    def recurrence_label(self):
+        return recurrence.describe(self.recurrence)
+
+    def occurrence_start(self):
+        return getattr(self, self.START_FIELD)
+
+    def occurrence_length(self):
+        raise NotImplementedError
+
+    def move_to(self, start):
+        """Sets this (unsaved) copy's times so it begins at `start`."""
+        setattr(self, self.START_FIELD, start)
+
+    def save(self, *args, **kwargs):
+        if self.is_occurrence:
+            raise ValueError("Occurrences are not saved; edit the series or add an exception instead.")
+        self.recurrence_end = None
+        if self.recurrence:
+            last = recurrence.last_start(self.recurrence, self.occurrence_start(), self.recurrence_until)
+            self.recurrence_end = last + self.occurrence_length() if last else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'recurrence_end'}
+        super().save(*args, **kwargs)
+
+    def occurrences(self, window_start, window_end):
+        """This row's occurrences overlapping the window; a one-off row is its own only occurrence."""
+        start, length = self.occurrence_start(), self.occurrence_length()
+        if not self.recurrence:
+            return [self] if start < window_end and start + length > window_start else []
+        occurrences = []
+        for original, moved, exception in recurrence.expand(
+            self.recurrence, start, self.recurrence_until, length, window_start, window_end, self.exceptions.all(),
+        ):
+            occurrence = copy.copy(self)
+            occurrence.original_start = original
+            occurrence.move_to(moved)
+            if exception and exception.title:
+                occurrence.title = exception.title
+            occurrences.append(occurrence)
+        return occurrences
+
+    def change_occurrence(self, original_start, action, start=None):
+        """
+        Cancels, moves (to `start`) or restores the occurrence that was due at
+        `original_start`, by writing or deleting this series' exception row.
+        """
+        if action == 'restore':
+            self.exceptions.filter(original_start=original_start).delete()
+            return None
+        exception, _ = self.exceptions.get_or_create(original_start=original_start)
+        exception.cancelled = action == 'cancel'
+        if action == 'move':
+            exception.start = start
+        exception.save()
+        return exception
+
+    @classmethod
+    def series_in(cls, window_start, window_end, prefix=''):
+        """Q for repeating rows whose series may have occurrences in the window; either bound may be None."""
+        q = ~Q(**{f'{prefix}recurrence': ''})
+        if window_end is not None:
+            q &= Q(**{f'{prefix}{cls.START_FIELD}__lt': window_end})
+        if window_start is not None:
+            q &= Q(**{f'{prefix}recurrence_end__isnull': True}) | Q(**{f'{prefix}recurrence_end__gt': window_start})
+        return q
+
+    @classmethod
+    def expand_all(cls, rows, window_start, window_end):
+        """
+        Replaces every repeating row in `rows` by its occurrences in the window
+        and returns the lot in start order. One-off rows are kept as they are.
+        """
+        rows = list(rows)
+        series = [row for row in rows if row.recurrence]
+        # Only the repeating rows need their exceptions, in one query
+        prefetch_related_objects(series, 'exceptions')
+        expanded = [row for row in rows if not row.recurrence]
+        for row in series:
+            expanded.extend(row.occurrences(window_start, window_end))
+        return sorted(expanded, key=lambda row: (row.occurrence_start(), row.pk))
+
+
+class SoftDeleteManager(models.Manager):
+    """Default manager of soft-deletable models; rows with deleted_at set are left out."""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeletable(models.Model):
+    """
+    A row that is deleted by stamping deleted_at, so a delete is one UPDATE
+    however much hangs off it. `objects` hides such rows and `all_objects`
+    keeps them; purge_deleted removes them for good later, in batches.
+    """
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+
+class OccurrenceException(models.Model):
+    """One occurrence of a series that was cancelled, or moved or retitled."""
+    original_start = models.DateTimeField()
+    cancelled = models.BooleanField(default=False)
+    start = models.DateTimeField(null=True, blank=True, help_text="New start, if the occurrence was moved.")
+    title = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        change = 'cancelled' if self.cancelled else f'moved to {self.start}' if self.start else 'edited'
+        return f"{self.series} on {self.original_start:%Y-%m-%d %H:%M} ({change})"
+
+
+class MeetingQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Meetings `user` may see: all of them for privileged users, otherwise the
+        ones they take part in. Participation is an EXISTS probe on the
+        participants table's (meeting, user) unique index, so no DISTINCT is needed.
+        """
+        if is_privileged_user(user):
+            return self
+        participation = self.model.participants.through.objects.filter(meeting_id=OuterRef('pk'), user_id=user.pk)
+        return self.filter(Exists(participation))
+
+class Meeting(Recurring, SoftDeletable):
     class MeetingType(models.TextChoices):
         TEAM = "TEAM", "Team"
         PROJECT = "PROJECT", "Project"
@@ -31,13 +201,46 @@ class Meeting(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SoftDeleteManager.from_queryset(MeetingQuerySet)()
+    all_objects = MeetingQuerySet.as_manager()
+
+    START_FIELD = 'meeting_time'
+
+    class Meta:
+        indexes = [
+            # Upcoming/past splits on the dashboard, filtered by status in reports.
+            # Live rows only, which is every query through the default manager
+            models.Index(
+                fields=['meeting_time', 'status'], condition=Q(deleted_at__isnull=True), name='meeting_time_status_idx',
+            ),
+            # Repeating meetings are few; window lookups find them here
+            models.Index(
+                fields=['meeting_time'], condition=~Q(recurrence='') & Q(deleted_at__isnull=True),
+                name='meeting_series_idx',
+            ),
+            # purge_deleted's scan
+            models.Index(fields=['deleted_at'], condition=Q(deleted_at__isnull=False), name='meeting_deleted_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} on {self.meeting_time.strftime('%b %d, %Y at %I:%M %p')}"
     
     def get_absolute_url(self):
         return reverse('meeting_detail', kwargs={'pk': self.pk})
 
-class Task(models.Model):
+    def occurrence_length(self):
+        return datetime.timedelta(minutes=int(self.duration))
+
+
+class MeetingException(OccurrenceException):
+    series = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='exceptions')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'original_start'], name='unique_meeting_exception'),
+        ]
+
+class Task(SoftDeletable):
     class StatusChoices(models.TextChoices):
         PENDING = "PENDING", "Pending"
         IN_PROGRESS = "IN_PROGRESS", "In Progress"
@@ -65,5 +268,58 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # my_tasks columns: owner + status, ordered by due date
+            models.Index(
+                fields=['owner', 'status', 'due_date'], condition=Q(deleted_at__isnull=True),
+                name='task_owner_status_due_idx',
+            ),
+            # Open work only; completed tasks pile up and are rarely filtered on
+            models.Index(
+                fields=['owner', 'due_date'],
+                condition=~models.Q(status='COMPLETED') & Q(deleted_at__isnull=True),
+                name='task_open_owner_due_idx',
+            ),
+            models.Index(fields=['deleted_at'], condition=Q(deleted_at__isnull=False), name='task_deleted_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+class DashboardCounters(models.Model):
+    """
+    Running totals read by the dashboards, kept current by core.signals.
+    There is one row per user (meetings they participate in, tasks they own)
+    and a single global row with user=None covering every meeting.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='dashboard_counters'
+    )
+    meetings_total = models.IntegerField(default=0)
+    meetings_completed = models.IntegerField(default=0)
+    meeting_minutes = models.IntegerField(default=0)
+    meeting_tasks = models.IntegerField(default=0)
+    tasks_owned = models.IntegerField(default=0)
+    tasks_owned_completed = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'dashboard counters'
+        constraints = [
+            # NULLs never collide in a plain unique index, so fold the global row onto 0
+            models.UniqueConstraint(Coalesce('user', Value(0)), name='unique_dashboard_counters_scope'),
+        ]
+
+    def __str__(self):
+        return f"Counters for {self.user.username if self.user_id else 'everyone'}"
+
+    @property
+    def avg_duration(self):
+        return self.meeting_minutes / self.meetings_total if self.meetings_total else None
@@ -0,0 +1,160 @@
+# core/pagination.py
+
+import base64
+import binascii
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+def _resolve_field(model, path):
+    """Returns the model field at the end of a lookup path such as 'event__start_datetime'."""
+    field = None
+    for name in path.split('__'):
+        field = model._meta.get_field(name)
+        model = field.related_model
+    return field
+
+
+def _path_value(obj, path):
+    for name in path.split('__'):
+        obj = getattr(obj, name)
+    return obj
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.next_query = self.previous_query = ''
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset by seeking past the boundary row of the previous
+    page instead of using OFFSET, so page N costs the same as page 1 and no
+    COUNT(*) is needed.
+
+    `ordering` is a sequence like ('-meeting_time', '-pk'); its last key must
+    be unique. Nullable keys sort NULLS LAST. Cursors are opaque, URL-safe
+    tokens; an unreadable cursor falls back to the first page.
+    """
+
+    def __init__(self, queryset, ordering, per_page=10):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.keys = []
+        for key in ordering:
+            path = key.lstrip('-')
+            field = _resolve_field(queryset.model, 'id' if path == 'pk' else path)
+            self.keys.append((path, key.startswith('-'), field))
+
+    def page_queryset(self, cursor=None):
+        """The query get_page() runs for `cursor`, one row past the page to tell if there is a next."""
+        position = self._decode(cursor) if cursor else None
+        backwards = bool(position) and position['direction'] == 'previous'
+        queryset = self.queryset.order_by(*self._order_by(backwards))
+        if position:
+            queryset = queryset.filter(self._seek(position['values'], backwards))
+        return queryset[:self.per_page + 1]
+
+    def get_page(self, cursor=None):
+        position = self._decode(cursor) if cursor else None
+        backwards = bool(position) and position['direction'] == 'previous'
+
+        rows = list(self.page_queryset(cursor))
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = position is not None, has_more
+
+        return KeysetPage(
+            rows,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self._encode(rows[-1], 'next') if has_next and rows else None,
+            previous_cursor=self._encode(rows[0], 'previous') if has_previous and rows else None,
+        )
+
+    def _order_by(self, backwards):
+        ordering = []
+        for path, descending, field in self.keys:
+            order = F(path).desc if descending != backwards else F(path).asc
+            if field.null:
+                # NULLs sort last walking forward, so they come first walking back
+                ordering.append(order(nulls_first=True) if backwards else order(nulls_last=True))
+            else:
+                ordering.append(order())
+        return ordering
+
+    def _seek(self, values, backwards):
+        """Rows strictly after `values` in the (possibly reversed) ordering."""
+        after_any = Q(pk__in=[])
+        equal_so_far = Q()
+        for (path, descending, field), value in zip(self.keys, values):
+            nulls_last = field.null and not backwards
+            if value is None:
+                after = Q(pk__in=[]) if nulls_last else Q(**{f'{path}__isnull': False})
+                equal = Q(**{f'{path}__isnull': True})
+            else:
+                lookup = 'lt' if descending != backwards else 'gt'
+                after = Q(**{f'{path}__{lookup}': value})
+                if nulls_last:
+                    after |= Q(**{f'{path}__isnull': True})
+                equal = Q(**{path: value})
+            after_any |= equal_so_far & after
+            equal_so_far &= equal
+        return after_any
+
+    def _encode(self, obj, direction):
+        values = [_path_value(obj, path) for path, _, _ in self.keys]
+        payload = json.dumps({'d': direction, 'v': values}, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            direction, raw_values = payload['d'], payload['v']
+            if direction not in ('next', 'previous') or len(raw_values) != len(self.keys):
+                return None
+            values = [
+                None if raw is None else field.to_python(raw)
+                for (_, _, field), raw in zip(self.keys, raw_values)
+            ]
+        except (ValueError, TypeError, KeyError, binascii.Error, ValidationError):
+            return None
+        return {'direction': direction, 'values': values}
+
+
+def paginate_keyset(request, queryset, ordering=None, per_page=10, param='cursor'):
+    """
+    Returns the KeysetPage selected by request.GET[param], with next_query and
+    previous_query set to query strings that keep the request's other parameters.
+    `queryset` may also be a ready KeysetPaginator, in which case ordering and
+    per_page are its own.
+    """
+    paginator = queryset if isinstance(queryset, KeysetPaginator) else KeysetPaginator(queryset, ordering, per_page)
+    page = paginator.get_page(request.GET.get(param))
+    for attribute, cursor in (('next_query', page.next_cursor), ('previous_query', page.previous_cursor)):
+        if cursor:
+            params = request.GET.copy()
+            params[param] = cursor
+            setattr(page, attribute, '?' + params.urlencode())
+    return page
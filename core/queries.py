@@ -0,0 +1,60 @@
+# core/queries.py
+
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce
+from accounts.models import User
+from .models import Meeting, Task
+from .pagination import KeysetPaginator
+
+# The querysets behind the hot views. explain_hot_queries builds its plans
+# from these same functions, so what it explains is what the views run.
+
+COMPLETED_TASKS_PAGE_SIZE = 10
+
+
+def upcoming_meetings(user, now, horizon):
+    """
+    Every visible meeting that has not started yet, plus the series with
+    occurrences before `horizon`, for expanding into the upcoming list.
+    """
+    return Meeting.objects.visible_to(user).filter(Q(meeting_time__gte=now) | Meeting.series_in(now, horizon))
+
+
+def past_meetings(user, now):
+    """Paginator over the visible meetings that have started, with their task counts."""
+    meetings = Meeting.objects.visible_to(user).filter(meeting_time__lt=now).annotate(
+        task_count=Count('tasks', filter=Q(tasks__deleted_at__isnull=True))
+    )
+    return KeysetPaginator(meetings, ('-meeting_time', '-pk'), per_page=10)
+
+
+def open_tasks(user):
+    """The user's unfinished tasks in kanban order: by status, then due date."""
+    return Task.objects.filter(owner=user).exclude(
+        status=Task.StatusChoices.COMPLETED
+    ).select_related('meeting').order_by('status', F('due_date').asc(nulls_last=True), 'pk')
+
+
+def completed_tasks(user):
+    """Paginator over the user's finished tasks, latest first."""
+    completed = Task.objects.filter(owner=user, status=Task.StatusChoices.COMPLETED).select_related('meeting')
+    return KeysetPaginator(completed, ('-updated_at', '-pk'), per_page=COMPLETED_TASKS_PAGE_SIZE)
+
+
+def managers_with_counts():
+    """Managers with their task totals, read from the counters rows."""
+    return User.objects.filter(role='MANAGER').annotate(
+        total_tasks=Coalesce(F('dashboard_counters__tasks_owned'), 0),
+        completed_tasks=Coalesce(F('dashboard_counters__tasks_owned_completed'), 0),
+        incomplete_tasks=F('total_tasks') - F('completed_tasks'),
+    ).order_by('username')
+
+
+def report_tasks(manager=None):
+    tasks = Task.objects.select_related('owner').order_by('pk')
+    return tasks.filter(owner=manager) if manager else tasks
+
+
+def report_meetings(tasks):
+    """Meetings with at least one of `tasks`, newest first; meetings without one are dropped in SQL."""
+    return Meeting.objects.filter(Exists(tasks.filter(meeting=OuterRef('pk')))).order_by('-meeting_time', '-pk')
@@ -0,0 +1,122 @@
+# core/recurrence.py
+
+import datetime
+from collections import deque
+from dateutil import rrule
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from . import caching
+
+# Rules offered by the scheduling forms; any other valid RRULE can be stored too
+PRESETS = [
+    ('', 'Does not repeat'),
+    ('FREQ=DAILY', 'Daily'),
+    ('FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR', 'Every weekday'),
+    ('FREQ=WEEKLY', 'Weekly'),
+    ('FREQ=WEEKLY;INTERVAL=2', 'Every two weeks'),
+    ('FREQ=MONTHLY', 'Monthly'),
+]
+
+# Anything more frequent than daily is not a meeting series
+ALLOWED_FREQUENCIES = {rrule.DAILY, rrule.WEEKLY, rrule.MONTHLY, rrule.YEARLY}
+
+# A COUNT rule is walked to its end to find where the series stops
+MAX_COUNT = 1000
+
+# Expansions only depend on the rule and the window, so they can live long
+EXPANSION_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def parse(rule, dtstart):
+    """Returns the dateutil rrule for an RRULE string, anchored at `dtstart` in the current time zone."""
+    if timezone.is_naive(dtstart):
+        dtstart = timezone.make_aware(dtstart)
+    # Expanding in local time keeps a 9:00 meeting at 9:00 across DST changes
+    parsed = rrule.rrulestr(rule, dtstart=timezone.localtime(dtstart))
+    if not isinstance(parsed, rrule.rrule):
+        raise ValueError("Only a single RRULE is supported.")
+    return parsed
+
+
+def validate_rule(value):
+    try:
+        parsed = parse(value, timezone.now())
+    except (ValueError, TypeError) as error:
+        raise ValidationError(f"Not a valid recurrence rule: {error}")
+    if parsed._freq not in ALLOWED_FREQUENCIES:
+        raise ValidationError("Recurrence can be daily at most.")
+    if parsed._count and parsed._count > MAX_COUNT:
+        raise ValidationError(f"A series can have at most {MAX_COUNT} occurrences.")
+
+
+def describe(rule):
+    """A human label for a stored rule: the preset's name, or the rule itself."""
+    return dict(PRESETS).get(rule, rule)
+
+
+def last_start(rule, dtstart, until=None):
+    """
+    Start of the final occurrence, or None when the series never ends. A
+    bounded series that yields nothing ends with its first start.
+    """
+    parsed = parse(rule, dtstart)
+    if until is not None:
+        return parsed.before(until, inc=True) or dtstart
+    # dateutil has no public accessor for a rule's own COUNT or UNTIL
+    if parsed._count or parsed._until:
+        # Keeps only the latest start however long the series is
+        last = deque(parsed, maxlen=1)
+        return last[0] if last else dtstart
+    return None
+
+
+def _day_bounds(window_start, window_end):
+    """Widens a window to whole days, so nearby windows share one cached expansion."""
+    start = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = window_end.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+    return start, end
+
+
+def occurrence_starts(rule, dtstart, until, window_start, window_end):
+    """
+    Start times of the occurrences beginning in [window_start, window_end).
+    The expansion is cached per rule and (day-aligned) window; the key holds
+    everything the result depends on, including the time zone the rule is
+    expanded in, so it never needs invalidating.
+    """
+    day_start, day_end = _day_bounds(window_start, window_end)
+    if until is not None:
+        day_end = min(day_end, until + datetime.timedelta(microseconds=1))
+    key = caching.make_key(
+        'occurrences', (), rule, dtstart.isoformat(), day_start.isoformat(), day_end.isoformat(),
+        timezone.get_current_timezone_name(),
+    )
+    starts = cache.get(key)
+    if starts is None:
+        starts = [start for start in parse(rule, dtstart).between(day_start, day_end, inc=True) if start < day_end]
+        cache.set(key, starts, EXPANSION_CACHE_TIMEOUT)
+    return [start for start in starts if window_start <= start < window_end]
+
+
+def expand(rule, dtstart, until, length, window_start, window_end, exceptions=()):
+    """
+    Yields (original_start, start, exception) for each occurrence of a series
+    that overlaps the window, earliest first. `exceptions` are the series'
+    exception rows: cancelled occurrences are dropped and moved ones take
+    their new start, including ones moved in from outside the window.
+    """
+    by_original = {exception.original_start: exception for exception in exceptions}
+    found = []
+    for original in occurrence_starts(rule, dtstart, until, window_start - length, window_end):
+        exception = by_original.pop(original, None)
+        found.append((original, exception.start if exception and exception.start else original, exception))
+    for original, exception in by_original.items():
+        if exception.start:
+            found.append((original, exception.start, exception))
+
+    for original, start, exception in sorted(found, key=lambda item: item[1]):
+        if exception and exception.cancelled:
+            continue
+        if start < window_end and start + length > window_start:
+            yield original, start, exception
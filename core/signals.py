@@ -0,0 +1,167 @@
+# core/signals.py
+
+import threading
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from . import caching, counters
+from .models import Meeting, MeetingException, Task
+
+
+class _DeletingMeetings(threading.local):
+    """
+    Meetings whose delete is cascading in this thread; their tasks'
+    participant counters are settled by the meeting's own pre_delete handler.
+    Per thread, so a delete elsewhere cannot hide another request's tasks.
+    """
+    def __init__(self):
+        self.pks = set()
+
+
+_meetings_being_deleted = _DeletingMeetings()
+
+
+@receiver(pre_save, sender=Meeting)
+def remember_meeting_state(sender, instance, **kwargs):
+    instance._counters_previous = (
+        Meeting.all_objects.filter(pk=instance.pk).values('status', 'duration').first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Meeting)
+def count_meeting_save(sender, instance, created, **kwargs):
+    if instance.is_deleted:
+        return
+    previous = getattr(instance, '_counters_previous', None)
+    completed = int(instance.status == Meeting.MeetingStatus.COMPLETED)
+    if created or previous is None:
+        counters.add(
+            {'meetings_total': 1, 'meetings_completed': completed, 'meeting_minutes': int(instance.duration)},
+            include_global=True,
+        )
+        return
+
+    was_completed = int(previous['status'] == Meeting.MeetingStatus.COMPLETED)
+    counters.add(
+        {
+            'meetings_completed': completed - was_completed,
+            'meeting_minutes': int(instance.duration) - previous['duration'],
+        },
+        user_ids=counters.participant_ids(instance.pk),
+        include_global=True,
+    )
+
+
+@receiver(pre_delete, sender=Meeting)
+def count_meeting_delete(sender, instance, **kwargs):
+    # A soft-deleted meeting, and its tasks, came off the counters back then
+    if instance.is_deleted:
+        return
+    _meetings_being_deleted.pks.add(instance.pk)
+    deltas = counters.meeting_deltas([instance])
+    counters.add(counters.negate(deltas), user_ids=counters.participant_ids(instance.pk))
+    # The global task total is settled by each cascaded task's post_delete
+    deltas.pop('meeting_tasks')
+    counters.add(counters.negate(deltas), include_global=True)
+
+
+@receiver(post_delete, sender=Meeting)
+def forget_deleted_meeting(sender, instance, **kwargs):
+    _meetings_being_deleted.pks.discard(instance.pk)
+
+
+def _linked_ids(sender, instance, reverse, pk_set=None):
+    """Ids on the other side of the participants table currently linked to `instance`."""
+    own, other = ('user_id', 'meeting_id') if reverse else ('meeting_id', 'user_id')
+    links = sender.objects.filter(**{own: instance.pk})
+    if pk_set is not None:
+        links = links.filter(**{f'{other}__in': pk_set})
+    return set(links.values_list(other, flat=True))
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def count_participants_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_remove':
+        # pk_set holds what was asked for; only rows that exist are really removed
+        instance._counters_removed = _linked_ids(sender, instance, reverse, pk_set)
+        return
+    if action == 'pre_clear':
+        instance._counters_removed = _linked_ids(sender, instance, reverse)
+        return
+
+    if action == 'post_add':
+        changed, sign = pk_set, 1
+    elif action in ('post_remove', 'post_clear'):
+        changed, sign = instance.__dict__.pop('_counters_removed', set()), -1
+    else:
+        return
+    if not changed:
+        return
+
+    if reverse:
+        # user.meetings_participated.add(...): one user, many meetings
+        deltas = counters.meeting_deltas(Meeting(pk=pk) for pk in changed)
+        user_ids = [instance.pk]
+    else:
+        deltas = counters.meeting_deltas([instance])
+        user_ids = changed
+    counters.add(deltas if sign > 0 else counters.negate(deltas), user_ids=user_ids)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    instance._counters_previous = (
+        Task.all_objects.filter(pk=instance.pk).values('owner_id', 'status', 'meeting_id').first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Task)
+def count_task_save(sender, instance, created, **kwargs):
+    if instance.is_deleted:
+        return
+    previous = getattr(instance, '_counters_previous', None)
+    if created or previous is None:
+        counters.add(counters.owned_deltas(instance.status), user_ids=[instance.owner_id])
+        counters.add(
+            {'meeting_tasks': 1}, user_ids=counters.participant_ids(instance.meeting_id), include_global=True
+        )
+        return
+
+    if (previous['owner_id'], previous['status']) != (instance.owner_id, instance.status):
+        counters.add(counters.owned_deltas(previous['status'], sign=-1), user_ids=[previous['owner_id']])
+        counters.add(counters.owned_deltas(instance.status), user_ids=[instance.owner_id])
+    if previous['meeting_id'] != instance.meeting_id:
+        counters.add({'meeting_tasks': -1}, user_ids=counters.participant_ids(previous['meeting_id']))
+        counters.add({'meeting_tasks': 1}, user_ids=counters.participant_ids(instance.meeting_id))
+
+
+@receiver(post_delete, sender=Task)
+def count_task_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    counters.add(counters.owned_deltas(instance.status, sign=-1), user_ids=[instance.owner_id])
+    participants = []
+    if instance.meeting_id not in _meetings_being_deleted.pks:
+        participants = counters.participant_ids(instance.meeting_id)
+    counters.add({'meeting_tasks': -1}, user_ids=participants, include_global=True)
+
+
+@receiver([post_save, post_delete], sender=Meeting)
+@receiver([post_save, post_delete], sender=MeetingException)
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def invalidate_meetings(sender, **kwargs):
+    caching.bump('meeting')
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_tasks(sender, **kwargs):
+    caching.bump('task')
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_users(sender, update_fields=None, **kwargs):
+    # Every login saves last_login, which nothing cached depends on
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    caching.bump('user')
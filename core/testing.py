@@ -0,0 +1,39 @@
+# core/testing.py
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+QUERY_BUDGET_SCALES = (10, 100, 1000)
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for catching N+1 queries: a view is rendered at several
+    data sizes, and its query count must stay the same at all of them.
+    """
+    query_budget_scales = QUERY_BUDGET_SCALES
+
+    def assertQueryBudget(self, url, grow, budget, client=None, scales=None):
+        """
+        For each scale n, calls grow(n) to bring the data up to n rows, then
+        GETs `url` with an empty cache. Fails if the number of queries changes
+        between scales or exceeds `budget`. Returns the last response.
+        """
+        client = client or self.client
+        counts, captured = {}, {}
+        for n in scales or self.query_budget_scales:
+            grow(n)
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, f"GET {url} with {n} rows")
+            counts[n], captured[n] = len(queries), [query['sql'] for query in queries]
+
+        largest = max(counts)
+        listing = '\n'.join(f'  {i}. {sql}' for i, sql in enumerate(captured[largest][:30], start=1))
+        if len(set(counts.values())) > 1:
+            self.fail(f"GET {url}: query count grows with data {counts}. Queries at {largest} rows:\n{listing}")
+        if counts[largest] > budget:
+            self.fail(f"GET {url}: {counts[largest]} queries, over the budget of {budget}:\n{listing}")
+        return response
@@ -1,3 +1,823 @@
-from django.test import TestCase
+import datetime
+import json
+import tempfile
+import threading
+import zipfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from events.models import Event, Invitation
+from search.models import SearchDocument
+from . import caching, counters, deletion, exports, ingest, recurrence, signals
+from .management.commands.benchmark_views import compare
+from .forms import MeetingCreateForm
+from .models import DashboardCounters, Meeting, MeetingException, Task
+from .pagination import KeysetPaginator
+from .queries import COMPLETED_TASKS_PAGE_SIZE
+from .testing import QueryBudgetMixin
+
+
+class MeetingListQueryCountTests(TestCase):
+    # session + user + counters row + upcoming list + past page
+    EXPECTED_QUERIES = 5
+
+    def setUp(self):
+        cache.clear()
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.manager = User.objects.create(username='manager')
+
+    def create_meetings(self, count, tasks_per_meeting=3):
+        now = timezone.now()
+        meetings = Meeting.objects.bulk_create(
+            Meeting(title=f'Meeting {i}', meeting_time=now + datetime.timedelta(days=i - count // 2))
+            for i in range(count)
+        )
+        Meeting.participants.through.objects.bulk_create(
+            Meeting.participants.through(meeting=meeting, user=self.manager) for meeting in meetings
+        )
+        Task.objects.bulk_create(
+            Task(title=f'Task {n}', meeting=meeting, owner=self.manager)
+            for meeting in meetings
+            for n in range(tasks_per_meeting)
+        )
+        # bulk_create skips the signal handlers, as a fixture load would
+        call_command('rebuild_counters', stdout=StringIO())
+
+    def assert_constant_queries(self, user):
+        self.client.force_login(user)
+        for count in (2, 30):
+            self.create_meetings(count)
+            with self.assertNumQueries(self.EXPECTED_QUERIES):
+                response = self.client.get(reverse('meeting_list'))
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_privileged_dashboard_query_count_is_fixed(self):
+        response = self.assert_constant_queries(self.management)
+        self.assertEqual(response.context['total_meetings_count'], 32)
+        self.assertEqual(response.context['total_tasks_count'], 96)
+
+    def test_participant_dashboard_query_count_is_fixed(self):
+        response = self.assert_constant_queries(self.manager)
+        self.assertEqual(response.context['upcoming_meetings_count'] + response.context['past_meetings_count'], 32)
+
+
+class DashboardCountersTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+
+    def assert_counters_match_rebuild(self):
+        expected = counters.compute_expected()
+        for row in DashboardCounters.objects.all():
+            values = {field: getattr(row, field) for field in counters.COUNTER_FIELDS}
+            self.assertEqual(values, expected[row.user_id], row)
+        self.assertEqual(counters.rebuild(), 0)
+
+    def test_signals_keep_counters_in_sync(self):
+        meeting = Meeting.objects.create(title='Planning', duration=30)
+        meeting.participants.add(self.alice, self.bob)
+        task = Task.objects.create(title='Write notes', meeting=meeting, owner=self.alice)
+        Task.objects.create(title='Book room', meeting=meeting, owner=self.bob)
+
+        task.status = Task.StatusChoices.COMPLETED
+        task.owner = self.bob
+        task.save()
+        meeting.status = Meeting.MeetingStatus.COMPLETED
+        meeting.duration = 90
+        meeting.save()
+        meeting.participants.remove(self.alice)
+        self.bob.meetings_participated.clear()
+
+        other = Meeting.objects.create(title='Retro')
+        self.alice.meetings_participated.add(other)
+        Task.objects.create(title='Collect feedback', meeting=other, owner=self.alice)
+        self.assert_counters_match_rebuild()
+
+        bob_counters = DashboardCounters.objects.get(user=self.bob)
+        self.assertEqual((bob_counters.tasks_owned, bob_counters.tasks_owned_completed), (2, 1))
+
+        meeting.delete()
+        self.assert_counters_match_rebuild()
+        self.assertEqual(DashboardCounters.objects.get(user=None).meeting_tasks, 1)
+
+    def test_meeting_delete_in_another_thread_does_not_skip_task_counters(self):
+        meeting = Meeting.objects.create(title='Planning')
+        meeting.participants.add(self.alice)
+        task = Task.objects.create(title='Write notes', meeting=meeting)
+
+        # Another thread is between the meeting's pre_delete and post_delete
+        other = threading.Thread(target=lambda: signals._meetings_being_deleted.pks.add(meeting.pk))
+        other.start()
+        other.join()
+        task.delete()
+        self.assert_counters_match_rebuild()
+
+    def test_rebuild_corrects_drift(self):
+        meeting = Meeting.objects.create(title='Planning')
+        meeting.participants.add(self.alice)
+        DashboardCounters.objects.filter(user=self.alice).update(meetings_total=7)
+        self.assertEqual(counters.rebuild(), 1)
+        self.assertEqual(DashboardCounters.objects.get(user=self.alice).meetings_total, 1)
+
+
+class ManagementReportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.client.force_login(self.management)
+
+    def create_meetings(self, count):
+        meetings = Meeting.objects.bulk_create(Meeting(title=f'Meeting {i}') for i in range(count))
+        Task.objects.bulk_create(
+            Task(title=f'Task {i}', meeting=meeting, owner=owner)
+            for i, meeting in enumerate(meetings)
+            for owner in (self.alice, self.bob)
+        )
+        Meeting.objects.create(title='No tasks')
+
+    def test_query_count_is_fixed(self):
+        # session + user + manager + page count + page + prefetched tasks
+        for count in (2, 25):
+            self.create_meetings(count)
+            with self.assertNumQueries(6):
+                self.client.get(reverse('manager_report', args=[self.alice.pk]))
+
+    def test_filters_tasks_to_selected_manager(self):
+        self.create_meetings(3)
+        response = self.client.get(reverse('manager_report', args=[self.alice.pk]))
+        meetings = list(response.context['meetings'])
+        self.assertEqual(len(meetings), 3)
+        self.assertEqual({task.owner for meeting in meetings for task in meeting.report_tasks}, {self.alice})
+
+
+class ManagementReportExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create(username='boss', role=User.Role.MANAGEMENT))
+        self.alice = User.objects.create(username='alice')
+        meeting = Meeting.objects.create(title='Quarterly review')
+        Task.objects.create(title='Ship <report> & notes', meeting=meeting, owner=self.alice)
+        Task.objects.create(title='Unassigned task', meeting=meeting)
+
+    def test_csv_export_streams_every_task(self):
+        response = self.client.get(reverse('management_report_export'))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'Meeting,Meeting Time,Task,Assigned To,Status,Priority,Due Date')
+        self.assertEqual(len(lines), 3)
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        response = self.client.get(reverse('manager_report_export', args=[self.alice.pk]), {'format': 'xlsx'})
+        archive = zipfile.ZipFile(BytesIO(b''.join(response.streaming_content)))
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+        self.assertIn('Ship &lt;report&gt; &amp; notes', sheet)
+        self.assertNotIn('Unassigned task', sheet)
+
+    def test_formula_like_text_is_quoted(self):
+        Task.objects.create(title='=HYPERLINK("http://evil")', meeting=Meeting.objects.create(title='@sum(A1)'))
+        rows = [row for row in exports.report_rows() if row[2].startswith("'")]
+        self.assertEqual([(row[0], row[2]) for row in rows], [("'@sum(A1)", "'=HYPERLINK(\"http://evil\")")])
+
+    @override_settings(TIME_ZONE='America/New_York')
+    def test_meeting_time_is_in_local_time(self):
+        Meeting.objects.update(meeting_time=datetime.datetime(2026, 1, 5, 15, 30, tzinfo=datetime.timezone.utc))
+        self.assertEqual({row[1] for row in exports.report_rows()}, {'2026-01-05 10:30'})
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        meeting = Meeting.objects.create(title='Planning')
+        today = datetime.date(2026, 1, 1)
+        # Repeated and missing due dates exercise the tie-breaker and NULLS LAST
+        Task.objects.bulk_create(
+            Task(title=f'Task {i}', meeting=meeting, due_date=None if i % 4 == 0 else today + datetime.timedelta(days=i % 3))
+            for i in range(23)
+        )
+        self.expected = list(Task.objects.order_by(F('due_date').asc(nulls_last=True), 'pk'))
+
+    def test_walks_forward_and_back_over_nullable_key(self):
+        paginator = KeysetPaginator(Task.objects.all(), ('due_date', 'pk'), per_page=5)
+        pages, page = [], paginator.get_page()
+        while True:
+            pages.append(list(page))
+            if not page.has_next:
+                break
+            page = paginator.get_page(page.next_cursor)
+        self.assertEqual([task for chunk in pages for task in chunk], self.expected)
+
+        for chunk in reversed(pages[:-1]):
+            page = paginator.get_page(page.previous_cursor)
+            self.assertEqual(list(page), chunk)
+        self.assertFalse(page.has_previous)
+
+    def test_unreadable_cursor_returns_first_page(self):
+        page = KeysetPaginator(Task.objects.all(), ('due_date', 'pk'), per_page=5).get_page('not-a-cursor')
+        self.assertEqual(list(page), self.expected[:5])
+
+
+class MyTasksBoardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='alice')
+        self.client.force_login(self.user)
+        self.meeting = Meeting.objects.create(title='Planning')
+
+    def create_tasks(self, per_status):
+        for status in Task.StatusChoices.values:
+            for i in range(per_status):
+                Task.objects.create(title=f'{status} {i}', meeting=self.meeting, owner=self.user, status=status)
+
+    def test_board_query_count_is_fixed(self):
+        # session + user + open tasks + completed page + counters row
+        for per_status in (1, 15):
+            self.create_tasks(per_status)
+            with self.assertNumQueries(5):
+                response = self.client.get(reverse('my_tasks'))
+        self.assertEqual(len(response.context['pending_tasks']), 16)
+        self.assertEqual(len(response.context['completed_tasks']), COMPLETED_TASKS_PAGE_SIZE)
+        self.assertEqual(response.context['completed_count'], 16)
+
+    def test_load_more_returns_remaining_completed_tasks(self):
+        self.create_tasks(COMPLETED_TASKS_PAGE_SIZE + 3)
+        cursor = self.client.get(reverse('my_tasks')).context['completed_tasks'].next_cursor
+        data = self.client.get(reverse('my_tasks_completed'), {'cursor': cursor}).json()
+        self.assertEqual(data['html'].count('line-through'), 3)
+        self.assertIsNone(data['next_cursor'])
+
+
+class MeetingVisibilityTests(TestCase):
+    def setUp(self):
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.member = User.objects.create(username='member')
+        self.joined = Meeting.objects.create(title='Joined')
+        self.joined.participants.add(self.member, User.objects.create(username='other'))
+        self.private = Meeting.objects.create(title='Private')
+
+    def test_participants_see_only_their_meetings_once(self):
+        visible = Meeting.objects.visible_to(self.member)
+        self.assertEqual(list(visible), [self.joined])
+        self.assertNotIn('DISTINCT', str(visible.query))
+        self.assertEqual(Meeting.objects.visible_to(self.management).count(), 2)
+
+    def test_meeting_detail_hides_other_meetings(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.get(reverse('meeting_detail', args=[self.joined.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('meeting_detail', args=[self.private.pk])).status_code, 404)
+
+
+class DashboardCachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.client.force_login(self.management)
+        self.meeting = Meeting.objects.create(title='Planning')
+
+    def test_meeting_list_is_served_from_cache_until_a_task_changes(self):
+        self.client.get(reverse('meeting_list'))
+        with self.assertNumQueries(2):  # session + user
+            response = self.client.get(reverse('meeting_list'))
+        self.assertEqual(response.context['total_tasks_count'], 0)
+
+        Task.objects.create(title='Follow up', meeting=self.meeting)
+        self.assertEqual(self.client.get(reverse('meeting_list')).context['total_tasks_count'], 1)
+
+    def test_report_fragment_is_cached_until_a_meeting_changes(self):
+        Task.objects.create(title='Follow up', meeting=self.meeting)
+        self.client.get(reverse('management_report'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('management_report'))
+        self.assertContains(response, 'Planning')
+
+        self.meeting.title = 'Retro'
+        self.meeting.save()
+        self.assertContains(self.client.get(reverse('management_report')), 'Retro')
+
+    def test_bump_changes_keys(self):
+        key = caching.make_key('report', ('meeting',), 1)
+        self.assertEqual(key, caching.make_key('report', ('meeting',), 1))
+        caching.bump('meeting')
+        self.assertNotEqual(key, caching.make_key('report', ('meeting',), 1))
+
+
+class ExplainHotQueriesTests(TestCase):
+    def test_explains_the_view_querysets(self):
+        manager = User.objects.create(username='manager', role=User.Role.MANAGER)
+        meeting = Meeting.objects.create(title='Planning')
+        meeting.participants.add(manager)
+        out = StringIO()
+        call_command('explain_hot_queries', user='manager', stdout=out)
+        self.assertIn("explaining as 'manager'", out.getvalue())
+        self.assertIn('my_tasks: open tasks', out.getvalue())
+        self.assertIn('event conflicts', out.getvalue())
+
+
+class SeedScaleTests(TestCase):
+    def seed(self, **options):
+        options = {'users': 30, 'meetings': 20, 'tasks': 150, 'events': 10, 'batch_size': 7, **options}
+        call_command('seed_scale', stdout=StringIO(), **options)
+
+    def test_generates_requested_volumes_with_consistent_counters(self):
+        self.seed()
+        self.assertEqual(User.objects.filter(username__startswith='seed').count(), 30)
+        self.assertEqual(Meeting.objects.count(), 20)
+        self.assertEqual(Task.objects.count(), 150)
+        self.assertEqual(Event.objects.count(), 10)
+        self.assertTrue(Invitation.objects.exists())
+        self.assertEqual(counters.rebuild(), 0)
+        self.assertEqual(DashboardCounters.objects.get(user=None).meeting_tasks, 150)
+
+    def snapshot(self):
+        return (
+            list(Meeting.objects.order_by('pk').values_list('meeting_time', 'duration', 'status')),
+            [row[1:] for row in Task.objects.order_by('pk').values_list('title', 'status', 'priority', 'due_date')],
+        )
+
+    def test_same_seed_gives_same_data(self):
+        self.seed(prefix='a')
+        first = self.snapshot()
+        Task.objects.all().delete()
+        Meeting.objects.all().delete()
+        # On another day, too
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + datetime.timedelta(days=3)):
+            self.seed(prefix='b')
+        self.assertEqual(first, self.snapshot())
+        durations = {minutes for minutes, _ in MeetingCreateForm.DURATION_CHOICES}
+        self.assertLessEqual({duration for _, duration, _ in first[0]}, durations)
+
+    def test_refuses_existing_prefix(self):
+        self.seed(users=5, meetings=1, tasks=1, events=0)
+        with self.assertRaises(CommandError):
+            self.seed(users=5, meetings=1, tasks=1, events=0)
+
+
+class BenchmarkViewsTests(TransactionTestCase):
+    def setUp(self):
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.manager = User.objects.create(username='manager')
+        meeting = Meeting.objects.create(title='Standup', meeting_time=timezone.now(), duration=15)
+        meeting.participants.add(self.manager)
+
+    def test_writes_results_and_skips_views_a_role_cannot_get(self):
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'benchmark_views', requests=3, concurrency=1, only=['meeting_list', 'meeting_create', 'meeting_delete'],
+                output=output.name, stdout=StringIO(),
+            )
+            report = json.load(output)
+        result = report['results']['meeting_list[manager]']
+        self.assertEqual(result['requests'], 3)
+        self.assertEqual(result['errors'], 0)
+        self.assertGreater(result['queries_per_request'], 0)
+        self.assertIn('meeting_create[management]', report['results'])
+        self.assertEqual(report['skipped']['meeting_create[manager]'], 'GET returned 403')
+        self.assertEqual(report['skipped']['meeting_delete[management]'], 'POST only')
+
+    def test_compare_flags_slower_p95_and_extra_queries(self):
+        baseline = {
+            'a': {'p95_ms': 10.0, 'queries_per_request': 3},
+            'b': {'p95_ms': 10.0, 'queries_per_request': 3},
+            'c': {'p95_ms': 10.0, 'queries_per_request': 3},
+        }
+        results = {
+            'a': {'p95_ms': 11.0, 'queries_per_request': 3},
+            'b': {'p95_ms': 20.0, 'queries_per_request': 3},
+            'c': {'p95_ms': 10.0, 'queries_per_request': 4},
+            'new': {'p95_ms': 50.0, 'queries_per_request': 9},
+        }
+        regressions = compare(results, baseline, tolerance=0.2, min_delta_ms=2)
+        self.assertEqual(sorted(regressions), ['b', 'c'])
+
+
+class ViewQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.manager = User.objects.create(username='manager')
+        self.owners = User.objects.bulk_create(User(username=f'owner{i}') for i in range(5))
+        self.meeting = Meeting.objects.create(title='Planning', meeting_time=timezone.now())
+        self.meeting.participants.add(self.manager)
+
+    def grow_meetings(self, n):
+        """Brings the manager's meetings (half past, half upcoming, two tasks each) up to n."""
+        have = Meeting.objects.filter(participants=self.manager).count()
+        now = timezone.now()
+        meetings = Meeting.objects.bulk_create(
+            Meeting(title=f'Meeting {i}', meeting_time=now + datetime.timedelta(hours=i if i % 2 else -i))
+            for i in range(have, n)
+        )
+        Meeting.participants.through.objects.bulk_create(
+            Meeting.participants.through(meeting=meeting, user=self.manager) for meeting in meetings
+        )
+        Task.objects.bulk_create(
+            Task(title=f'Task {i}', meeting=meeting, owner=self.owners[i % len(self.owners)])
+            for meeting in meetings
+            for i in range(2)
+        )
+        counters.rebuild()
+
+    def grow_tasks(self, n, owner=None):
+        """Brings the tasks on self.meeting up to n, across every status."""
+        have = self.meeting.tasks.count()
+        statuses = Task.StatusChoices.values
+        Task.objects.bulk_create(
+            Task(
+                title=f'Task {i}', meeting=self.meeting, status=statuses[i % len(statuses)],
+                owner=owner or self.owners[i % len(self.owners)],
+            )
+            for i in range(have, n)
+        )
+        counters.rebuild()
+
+    def grow_managers(self, n):
+        have = User.objects.filter(role=User.Role.MANAGER).count()
+        User.objects.bulk_create(User(username=f'extra{i}') for i in range(have, n))
+        counters.rebuild()
+
+    def test_meeting_list(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(reverse('meeting_list'), self.grow_meetings, budget=5)
+
+    def test_privileged_meeting_list(self):
+        self.client.force_login(self.management)
+        self.assertQueryBudget(reverse('meeting_list'), self.grow_meetings, budget=5)
+
+    def test_meeting_detail(self):
+        self.client.force_login(self.management)
+        self.assertQueryBudget(reverse('meeting_detail', args=[self.meeting.pk]), self.grow_tasks, budget=5)
+
+    def test_my_tasks(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(reverse('my_tasks'), lambda n: self.grow_tasks(n, owner=self.manager), budget=5)
+
+    def test_management_dashboard(self):
+        self.client.force_login(self.management)
+        self.assertQueryBudget(reverse('management_dashboard'), self.grow_managers, budget=3)
+
+    def test_management_report(self):
+        self.client.force_login(self.management)
+        self.assertQueryBudget(reverse('management_report'), self.grow_meetings, budget=5)
+
+
+class RecurringMeetingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.start = (timezone.now() + datetime.timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+        self.weekly = Meeting.objects.create(title='Weekly sync', meeting_time=self.start, recurrence='FREQ=WEEKLY')
+        self.weekly.participants.add(self.boss)
+
+    def week(self, n):
+        return self.start + datetime.timedelta(weeks=n)
+
+    def test_past_count_counts_rows_not_occurrences(self):
+        now = timezone.now()
+        # Started in the past, so it is listed (and counted) with the past meetings
+        ongoing = Meeting.objects.create(title='Daily', meeting_time=now - datetime.timedelta(days=3), recurrence='FREQ=DAILY')
+        later = Meeting.objects.create(title='Kickoff', meeting_time=now + datetime.timedelta(weeks=10), recurrence='FREQ=WEEKLY')
+        done = Meeting.objects.create(title='Retro', meeting_time=now - datetime.timedelta(days=1))
+        for meeting in (ongoing, later, done):
+            meeting.participants.add(self.boss)
+        self.client.force_login(self.boss)
+        context = self.client.get(reverse('meeting_list')).context
+        self.assertEqual(context['total_meetings_count'], 4)
+        self.assertEqual(context['past_meetings_count'], 2)
+        self.assertEqual(len(context['meetings'].object_list), 2)
+
+    def test_occurrences_are_expanded_without_writing_rows(self):
+        occurrences = self.weekly.occurrences(self.start, self.week(4))
+        self.assertEqual([o.meeting_time for o in occurrences], [self.week(n) for n in range(4)])
+        self.assertTrue(all(o.pk == self.weekly.pk and o.is_occurrence for o in occurrences))
+        self.assertEqual(Meeting.objects.count(), 1)
+        with self.assertRaises(ValueError):
+            occurrences[0].save()
+
+    def test_exceptions_cancel_and_move_occurrences(self):
+        self.weekly.change_occurrence(self.week(1), 'cancel')
+        self.weekly.change_occurrence(self.week(2), 'move', start=self.week(2) + datetime.timedelta(hours=3))
+        starts = [o.meeting_time for o in self.weekly.occurrences(self.start, self.week(4))]
+        self.assertEqual(starts, [self.week(0), self.week(2) + datetime.timedelta(hours=3), self.week(3)])
+
+        self.weekly.change_occurrence(self.week(1), 'restore')
+        self.assertEqual(len(self.weekly.occurrences(self.start, self.week(4))), 4)
+        self.assertEqual(MeetingException.objects.count(), 1)
+
+    def test_until_bounds_the_series(self):
+        self.weekly.recurrence_until = self.week(2)
+        self.weekly.save()
+        self.assertEqual(self.weekly.recurrence_end, self.week(2) + datetime.timedelta(minutes=60))
+        self.assertEqual(len(self.weekly.occurrences(self.start, self.week(10))), 3)
+        self.assertFalse(Meeting.objects.filter(Meeting.series_in(self.week(3), self.week(4))).exists())
+
+    def test_expansions_are_cached_per_rule_and_window(self):
+        recurrence.occurrence_starts('FREQ=WEEKLY', self.start, None, self.start, self.week(4))
+        with self.assertNumQueries(0), mock.patch.object(recurrence, 'parse') as parse:
+            starts = recurrence.occurrence_starts('FREQ=WEEKLY', self.start, None, self.start, self.week(4))
+        parse.assert_not_called()
+        self.assertEqual(len(starts), 4)
+
+    def test_expansions_are_cached_per_time_zone(self):
+        # Noon in New York the day before DST starts there
+        start = datetime.datetime(2026, 3, 7, 17, tzinfo=datetime.timezone.utc)
+        end = start + datetime.timedelta(days=2)
+        with timezone.override('UTC'):
+            utc = recurrence.occurrence_starts('FREQ=DAILY', start, None, start, end)
+        with timezone.override('America/New_York'):
+            new_york = recurrence.occurrence_starts('FREQ=DAILY', start, None, start, end)
+        self.assertEqual(utc, [start, start + datetime.timedelta(days=1)])
+        self.assertEqual(new_york, [start] + [start + datetime.timedelta(days=days, hours=-1) for days in (1, 2)])
+
+    def test_meeting_list_shows_upcoming_occurrences(self):
+        self.client.force_login(self.boss)
+        response = self.client.get(reverse('meeting_list'))
+        self.assertEqual(len(response.context['upcoming_meetings']), 4)
+        self.assertContains(response, 'Weekly')
+
+    def test_occurrence_view_cancels_one_occurrence(self):
+        self.client.force_login(self.boss)
+        response = self.client.post(
+            reverse('meeting_occurrence', args=[self.weekly.pk]),
+            {'original_start': self.week(1).isoformat(), 'action': 'cancel'},
+        )
+        self.assertRedirects(response, reverse('meeting_detail', args=[self.weekly.pk]))
+        self.assertTrue(self.weekly.exceptions.get().cancelled)
+
+        # Times that are not occurrences of the series are refused
+        self.client.post(
+            reverse('meeting_occurrence', args=[self.weekly.pk]),
+            {'original_start': (self.week(1) + datetime.timedelta(hours=1)).isoformat(), 'action': 'cancel'},
+        )
+        self.assertEqual(self.weekly.exceptions.count(), 1)
+
+    def test_invalid_rules_are_rejected(self):
+        meeting = Meeting(title='Bad', recurrence='FREQ=HOURLY')
+        with self.assertRaises(ValidationError):
+            meeting.full_clean()
+        meeting.recurrence = f'FREQ=DAILY;COUNT={recurrence.MAX_COUNT + 1}'
+        with self.assertRaises(ValidationError):
+            meeting.full_clean()
+
+    def test_count_rules_end_on_their_last_occurrence(self):
+        self.weekly.recurrence = 'FREQ=WEEKLY;COUNT=3'
+        self.weekly.save()
+        self.assertEqual(self.weekly.recurrence_end, self.week(2) + datetime.timedelta(minutes=60))
+
+
+
+class TaskIngestTests(TestCase):
+    def setUp(self):
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.meeting = Meeting.objects.create(title='Quarterly review')
+        self.meeting.participants.add(self.boss, self.alice)
+        self.client.force_login(self.boss)
+
+    def test_pasted_lines_are_added_in_one_go(self):
+        lines = 'Draft the budget | alice | 2030-01-31 | high\nBook the venue | bob\n\nSend the minutes'
+        response = self.client.post(reverse('meeting_detail', args=[self.meeting.pk]), {'bulk': '1', 'lines': lines})
+        self.assertRedirects(response, reverse('meeting_detail', args=[self.meeting.pk]))
+
+        tasks = list(self.meeting.tasks.order_by('pk'))
+        self.assertEqual([task.title for task in tasks], ['Draft the budget', 'Book the venue', 'Send the minutes'])
+        self.assertEqual([task.owner for task in tasks], [self.alice, self.bob, None])
+        self.assertEqual(tasks[0].priority, Task.PriorityChoices.HIGH)
+        self.assertEqual(tasks[1].priority, Task.PriorityChoices.MEDIUM)
+        # bulk_create skips the signals, so the counters are updated explicitly
+        self.assertEqual(counters.own(self.alice).meeting_tasks, 3)
+        self.assertEqual(counters.own(self.alice).tasks_owned, 1)
+        self.assertEqual(counters.own(self.bob).tasks_owned, 1)
+
+    def test_tasks_are_read_back_where_bulk_insert_returns_no_keys(self):
+        Task.objects.create(title='Draft the budget', meeting=self.meeting)
+        tasks, _ = ingest.build_tasks(self.meeting, ingest.parse_lines('Draft the budget | alice\nBook the venue'))
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            created = ingest.create_tasks(self.meeting, tasks)
+        self.assertEqual([task.title for task in created], ['Draft the budget', 'Book the venue'])
+        self.assertEqual([task.owner for task in created], [self.alice, None])
+        self.assertTrue(all(task.pk for task in created))
+
+    @override_settings(JOBS_EAGER=False)
+    def test_added_tasks_are_indexed_by_a_worker(self):
+        lines = 'Draft the budget | alice\nBook the venue | bob'
+        self.client.post(reverse('meeting_detail', args=[self.meeting.pk]), {'bulk': '1', 'lines': lines})
+        documents = SearchDocument.objects.filter(kind=SearchDocument.Kind.TASK)
+        self.assertFalse(documents.exists())
+
+        call_command('run_workers', burst=True, stdout=StringIO())
+        self.assertEqual(set(documents.values_list('title', flat=True)), {'Draft the budget', 'Book the venue'})
+
+    def test_a_bad_row_writes_nothing(self):
+        lines = 'Fine task | alice\nOrphan task | nobody\n | alice\nLate task | alice | someday'
+        response = self.client.post(reverse('meeting_detail', args=[self.meeting.pk]), {'bulk': '1', 'lines': lines})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Row 2: owner: No active user named &#x27;nobody&#x27;.")
+        self.assertContains(response, 'Row 3: title:')
+        self.assertContains(response, 'Row 4: due date:')
+        self.assertFalse(Task.objects.exists())
+
+    def test_owners_are_resolved_in_one_query(self):
+        rows = ingest.parse_lines('\n'.join(f'Task {i} | {"alice" if i % 2 else "bob"}' for i in range(40)))
+        with self.assertNumQueries(1):
+            tasks, errors = ingest.build_tasks(self.meeting, rows)
+        self.assertEqual((len(tasks), errors), (40, []))
+
+    def test_import_endpoint_takes_csv_and_json(self):
+        url = reverse('meeting_tasks_import', args=[self.meeting.pk])
+        csv_body = 'Title,Owner,Priority\nFirst,alice,low\nSecond,,\n'
+        response = self.client.post(url, csv_body, content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 2)
+
+        upload = BytesIO(json.dumps([{'title': 'Third', 'owner': 'bob', 'due_date': '2030-02-01'}]).encode())
+        upload.name = 'tasks.json'
+        response = self.client.post(url, {'file': upload})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.get(title='Third').owner, self.bob)
+
+        response = self.client.post(url, json.dumps([{'title': 'Fourth'}, {'owner': 'alice'}]), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['row'], 2)
+        self.assertEqual(Task.objects.count(), 3)
+
+    def test_managers_only_add_tasks_for_themselves(self):
+        self.client.force_login(self.alice)
+        url = reverse('meeting_tasks_import', args=[self.meeting.pk])
+        response = self.client.post(url, json.dumps([{'title': 'Mine', 'owner': 'bob'}]), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.get().owner, self.alice)
+
+        self.client.force_login(self.bob)
+        self.assertEqual(self.client.post(url, '[]', content_type='application/json').status_code, 404)
+
+
+class TaskBulkUpdateTests(TestCase):
+    def setUp(self):
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        meeting = Meeting.objects.create(title='Planning')
+        self.tasks = [Task.objects.create(meeting=meeting, title=f'Task {i}', owner=self.alice) for i in range(5)]
+        self.bobs = Task.objects.create(meeting=meeting, title="Bob's task", owner=self.bob)
+        self.url = reverse('task_bulk_update')
+
+    def test_status_change_is_one_update(self):
+        self.client.force_login(self.alice)
+        ids = [task.pk for task in self.tasks[:3]]
+        with mock.patch('core.bulk.broker.publish') as publish:
+            response = self.client.post(self.url, {'tasks': ids, 'status': 'COMPLETED'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {'updated': 3})
+        self.assertEqual(Task.objects.filter(status='COMPLETED').count(), 3)
+        owned = counters.own(self.alice)
+        self.assertEqual((owned.tasks_owned, owned.tasks_owned_completed), (5, 3))
+        publish.assert_called_once()
+        self.assertEqual(publish.call_args.args[1]['changes'], [{'owner': self.alice.pk, 'total': 0, 'completed': 3}])
+
+        with CaptureQueriesContext(connection) as queries, mock.patch('core.bulk.broker.publish'):
+            self.client.post(self.url, {'tasks': ids, 'priority': 'LOW'}, HTTP_ACCEPT='application/json')
+        task_updates = [q for q in queries if q['sql'].startswith('UPDATE "core_task"')]
+        self.assertEqual(len(task_updates), 1)
+        self.assertEqual(set(Task.objects.filter(pk__in=ids).values_list('priority', flat=True)), {'LOW'})
+
+    def test_only_own_tasks_can_be_selected(self):
+        self.client.force_login(self.alice)
+        response = self.client.post(
+            self.url, {'tasks': [self.tasks[0].pk, self.bobs.pk], 'status': 'BLOCKED'}, HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tasks', response.json()['errors'])
+        self.assertFalse(Task.objects.filter(status='BLOCKED').exists())
+
+        response = self.client.post(self.url, {'tasks': [self.tasks[0].pk]}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_reassigning_moves_counters_and_search(self):
+        self.client.force_login(self.boss)
+        self.tasks[0].status = Task.StatusChoices.COMPLETED
+        self.tasks[0].save()
+        ids = [task.pk for task in self.tasks[:2]]
+        with mock.patch('core.bulk.broker.publish'):
+            response = self.client.post(self.url, {'tasks': ids, 'owner': self.bob.pk})
+        self.assertRedirects(response, reverse('my_tasks'), fetch_redirect_response=False)
+        self.assertEqual(Task.objects.filter(owner=self.bob).count(), 3)
+        self.assertEqual((counters.own(self.alice).tasks_owned, counters.own(self.alice).tasks_owned_completed), (3, 0))
+        self.assertEqual((counters.own(self.bob).tasks_owned, counters.own(self.bob).tasks_owned_completed), (3, 1))
+        documents = SearchDocument.objects.filter(kind=SearchDocument.Kind.TASK, object_id__in=ids)
+        self.assertEqual(set(documents.values_list('owner_id', flat=True)), {self.bob.pk})
+
+        before = {
+            row.user_id: (row.tasks_owned, row.tasks_owned_completed)
+            for row in DashboardCounters.objects.filter(user__in=[self.alice, self.bob])
+        }
+        counters.rebuild()
+        after = {
+            row.user_id: (row.tasks_owned, row.tasks_owned_completed)
+            for row in DashboardCounters.objects.filter(user__in=[self.alice, self.bob])
+        }
+        self.assertEqual(before, after)
+
+    def test_tasks_can_be_unassigned(self):
+        self.client.force_login(self.boss)
+        ids = [task.pk for task in self.tasks[:2]]
+        response = self.client.post(
+            self.url, {'tasks': ids, 'owner': self.bob.pk, 'unassign': 'on'}, HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        with mock.patch('core.bulk.broker.publish'):
+            response = self.client.post(self.url, {'tasks': ids, 'unassign': 'on'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(Task.objects.filter(pk__in=ids, owner=None).count(), 2)
+        self.assertEqual(counters.own(self.alice).tasks_owned, 3)
+        documents = SearchDocument.objects.filter(kind=SearchDocument.Kind.TASK, object_id__in=ids)
+        self.assertEqual(set(documents.values_list('owner_id', flat=True)), {None})
+        self.assertEqual(counters.rebuild(), 0)
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.alice = User.objects.create(username='alice')
+        self.meeting = Meeting.objects.create(title='Planning', duration=30)
+        self.meeting.participants.add(self.boss, self.alice)
+        self.tasks = [
+            Task.objects.create(meeting=self.meeting, title=f'Task {i}', owner=self.alice, status=status)
+            for i, status in enumerate(['PENDING', 'COMPLETED', 'PENDING'])
+        ]
+        self.client.force_login(self.boss)
+
+    def test_meeting_delete_hides_meeting_and_tasks(self):
+        response = self.client.post(reverse('meeting_delete', args=[self.meeting.pk]))
+        self.assertRedirects(response, reverse('meeting_list'))
+
+        self.assertFalse(Meeting.objects.exists())
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(self.alice.meetings_participated.exists())
+        self.assertEqual(Task.all_objects.filter(deleted_at__isnull=False).count(), 3)
+        self.assertFalse(SearchDocument.objects.exists())
+        self.assertEqual(self.client.get(reverse('meeting_detail', args=[self.meeting.pk])).status_code, 404)
+        self.assertEqual(counters.rebuild(), 0)
+        self.assertEqual(counters.own(self.alice).tasks_owned, 0)
+
+        # Deleting it again, or for good through the ORM, leaves the counters alone
+        self.assertFalse(deletion.delete_meeting(self.meeting))
+        Meeting.all_objects.get().delete()
+        self.assertEqual(counters.rebuild(), 0)
+
+    def test_meeting_delete_does_not_load_tasks(self):
+        with CaptureQueriesContext(connection) as few:
+            deletion.delete_meeting(self.meeting)
+        many = Meeting.objects.create(title='Big')
+        many.participants.add(self.alice)
+        ingest.create_tasks(many, [Task(meeting=many, title=f'Task {i}', owner=self.alice) for i in range(50)])
+        with self.assertNumQueries(len(few)):
+            deletion.delete_meeting(many)
+        self.assertEqual(counters.rebuild(), 0)
+
+    def test_task_delete(self):
+        response = self.client.post(reverse('task_delete', args=[self.tasks[1].pk]))
+        self.assertRedirects(response, reverse('meeting_detail', args=[self.meeting.pk]))
+        self.assertEqual(self.meeting.tasks.count(), 2)
+        self.assertEqual(counters.own(self.alice).tasks_owned_completed, 0)
+        self.assertFalse(SearchDocument.objects.filter(kind=SearchDocument.Kind.TASK, object_id=self.tasks[1].pk).exists())
+        self.assertEqual(counters.rebuild(), 0)
+
+    def test_purge_deletes_a_meetings_tasks_in_batches(self):
+        ingest.create_tasks(self.meeting, [Task(meeting=self.meeting, title=f'More {i}') for i in range(7)])
+        deletion.delete_meeting(self.meeting)
+        # Left unstamped, the tasks are only reached through their meeting, as its children
+        Task.all_objects.update(deleted_at=None)
+        Meeting.all_objects.update(deleted_at=timezone.now() - datetime.timedelta(days=40))
+
+        with CaptureQueriesContext(connection) as queries:
+            purged = deletion.purge(timezone.now(), batch_size=3)
+        self.assertEqual(purged, {'tasks': 0, 'meetings': 1, 'events': 0})
+        self.assertFalse(Task.all_objects.exists())
+        task_deletes = [q for q in queries if q['sql'].startswith('DELETE FROM "core_task"')]
+        self.assertEqual(len(task_deletes), 4)  # 10 tasks, 3 at a time
+
+    def test_purge_removes_old_rows_in_batches(self):
+        deletion.delete_task(self.tasks[0])
+        deletion.delete_meeting(self.meeting)
+        recent = Meeting.objects.create(title='Recent')
+        recent.participants.add(self.alice)
+        deletion.delete_meeting(recent)
+        Meeting.all_objects.filter(pk=self.meeting.pk).update(deleted_at=timezone.now() - datetime.timedelta(days=40))
+        Task.all_objects.update(deleted_at=timezone.now() - datetime.timedelta(days=40))
+
+        out = StringIO()
+        call_command('purge_deleted', batch_size=2, stdout=out)
+        self.assertIn('Purged 3 tasks, 1 meetings, 0 events', out.getvalue())
+        self.assertEqual(list(Meeting.all_objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertFalse(Task.all_objects.exists())
+        self.assertEqual(list(Meeting.participants.through.objects.values_list('meeting_id', flat=True)), [recent.pk])
+        self.assertEqual(counters.rebuild(), 0)
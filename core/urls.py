@@ -8,10 +8,16 @@ urlpatterns = [
     path('meeting/<int:pk>/', views.meeting_detail, name='meeting_detail'),
     path('meeting/<int:pk>/edit/', views.meeting_update, name='meeting_update'),
     path('meeting/<int:pk>/delete/', views.meeting_delete, name='meeting_delete'), 
+    path('meeting/<int:pk>/occurrence/', views.meeting_occurrence, name='meeting_occurrence'),
+    path('meeting/<int:pk>/tasks/import/', views.meeting_tasks_import, name='meeting_tasks_import'),
     path('task/<int:pk>/edit/', views.task_update, name='task_update'),
+    path('task/bulk-update/', views.task_bulk_update, name='task_bulk_update'),
     path('task/<int:pk>/delete/', views.task_delete, name='task_delete'),
     path('my-tasks/', views.my_tasks, name='my_tasks'),
+    path('my-tasks/completed/', views.my_tasks_completed, name='my_tasks_completed'),
     path('management-dashboard/', views.management_dashboard, name='management_dashboard'),
     path('management-report/', views.management_report, name='management_report'), 
     path('management-report/manager/<int:manager_id>/', views.management_report, name='manager_report'), 
+    path('management-report/export/', views.management_report_export, name='management_report_export'),
+    path('management-report/manager/<int:manager_id>/export/', views.management_report_export, name='manager_report_export'),
 ]
\ No newline at end of file
@@ -1,5 +1,9 @@
 # core/utils.py
+from django.db.models import Q
+
+# The same rule as is_privileged_user, for filtering user querysets
+PRIVILEGED_USERS = Q(is_superuser=True) | Q(role='MANAGEMENT')
 
 def is_privileged_user(user):
     """Checks if a user is a Superuser or has the MANAGEMENT role."""
-    return user.is_authenticated and (user.is_superuser or user.role == 'MANAGEMENT')
\ No newline at end of file
+    return user.is_authenticated and (user.is_superuser or user.role == 'MANAGEMENT')
@@ -1,58 +1,110 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.views.decorators.http import require_POST
 from django.core.paginator import Paginator
-from django.db.models import Count, Q, Avg
+from django.db.models import Prefetch
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required
 from .models import Meeting, Task
 from accounts.models import User
 from .utils import is_privileged_user
+from . import bulk, caching, counters, deletion, exports, ingest, queries
+from .pagination import paginate_keyset
+from live import broker
 from django.contrib import messages
-from .forms import MeetingCreateForm, MeetingUpdateForm, TaskCreateForm, TaskUpdateForm
+from .forms import (
+    BulkTaskForm, MeetingCreateForm, MeetingUpdateForm, OccurrenceForm, TaskBulkUpdateForm, TaskCreateForm, TaskUpdateForm,
+)
 import datetime
 
-@login_required
-def meeting_list(request):
-    if is_privileged_user(request.user):
-        all_meetings = Meeting.objects.all()
-    else:
-        all_meetings = Meeting.objects.filter(participants=request.user).distinct()
+DASHBOARD_CACHE_TIMEOUT = 60
+UPCOMING_HORIZON = datetime.timedelta(weeks=4)
 
+def _meeting_list_context(request):
     now = timezone.now()
-    
-    # Separate meetings into upcoming and past
-    upcoming_meetings = all_meetings.filter(meeting_time__gte=now).order_by('meeting_time')
-    past_meetings = all_meetings.filter(meeting_time__lt=now).order_by('-meeting_time')
+    dashboard = counters.for_user(request.user)
 
+    # Separate meetings into upcoming and past; repeating meetings are listed
+    # by their occurrences over the next few weeks, fetched in the same query
+    horizon = now + UPCOMING_HORIZON
+    # Every row not yet started comes back (a series starting past the horizon
+    # just has no occurrences), so the past count follows from the total
+    upcoming_rows = list(queries.upcoming_meetings(request.user, now, horizon))
+    upcoming_meetings = Meeting.expand_all(upcoming_rows, now, horizon)
+    not_started = sum(1 for meeting in upcoming_rows if meeting.meeting_time >= now)
     # Paginate ONLY the past meetings
-    paginator = Paginator(past_meetings, 10)
-    page_number = request.GET.get('page')
-    past_meetings_page = paginator.get_page(page_number)
-
-    # Calculate stats
-    total_meetings_count = all_meetings.count()
-    completed_meetings_count = all_meetings.filter(status=Meeting.MeetingStatus.COMPLETED).count()
-    total_tasks_count = Task.objects.filter(meeting__in=all_meetings).count()
-    avg_duration_data = all_meetings.aggregate(avg_duration=Avg('duration'))
-    avg_duration = avg_duration_data.get('avg_duration')
+    past_meetings_page = paginate_keyset(request, queries.past_meetings(request.user, now))
 
-    context = {
+    return {
         'upcoming_meetings': upcoming_meetings,
         'meetings': past_meetings_page, # This now contains only PAST meetings
-        'total_meetings_count': total_meetings_count,
-        'completed_meetings_count': completed_meetings_count,
-        'total_tasks_count': total_tasks_count,
-        'avg_duration': avg_duration,
+        'total_meetings_count': dashboard.meetings_total,
+        'completed_meetings_count': dashboard.meetings_completed,
+        'upcoming_meetings_count': len(upcoming_meetings),
+        # Totals come from the counters row, so no COUNT(*) is needed
+        'past_meetings_count': max(dashboard.meetings_total - not_started, 0),
+        'total_tasks_count': dashboard.meeting_tasks,
+        'avg_duration': dashboard.avg_duration,
+    }
+
+def occurrence_context(series):
+    """The coming occurrences and cancellations of a repeating meeting or event, for its detail page."""
+    if not series.recurrence:
+        return {}
+    now = timezone.now()
+    return {
+        'occurrences': series.occurrences(now, now + UPCOMING_HORIZON),
+        'cancelled_occurrences': series.exceptions.filter(cancelled=True, original_start__gte=now).order_by('original_start'),
     }
+
+def change_occurrence(request, series):
+    """Applies a posted OccurrenceForm to `series`, reporting the outcome as a message."""
+    form = OccurrenceForm(request.POST, series=series)
+    if form.is_valid():
+        series.change_occurrence(**form.cleaned_data)
+        messages.success(request, f"The occurrence of '{series.title}' was updated.")
+    else:
+        messages.error(request, ' '.join(error for errors in form.errors.values() for error in errors))
+
+@login_required
+def meeting_list(request):
+    # Privileged users all see the same dashboard; everyone else gets their own
+    scope = 'all' if is_privileged_user(request.user) else request.user.pk
+    context = caching.get_or_set(
+        'meeting_list', ('meeting', 'task'), (scope, request.GET.urlencode()),
+        lambda: _meeting_list_context(request),
+        # Meetings move from upcoming to past as time passes, not only on writes
+        timeout=DASHBOARD_CACHE_TIMEOUT,
+    )
     return render(request, 'core/meeting_list.html', context)
 
 @login_required
 def meeting_detail(request, pk):
-    meeting = get_object_or_404(Meeting, pk=pk)
+    # The tasks and their owners arrive in one prefetch, which the count reuses
+    meetings = Meeting.objects.visible_to(request.user).prefetch_related(
+        Prefetch('tasks', queryset=Task.objects.select_related('owner').order_by('pk'))
+    )
+    meeting = get_object_or_404(meetings, pk=pk)
     is_privileged = is_privileged_user(request.user)
+    bulk_form = BulkTaskForm()
 
-    if request.method == 'POST':
+    if request.method == 'POST' and 'bulk' in request.POST:
+        form = TaskCreateForm()
+        bulk_form = BulkTaskForm(request.POST, request.FILES)
+        if bulk_form.is_valid():
+            tasks, errors = ingest.build_tasks(
+                meeting, bulk_form.cleaned_data['rows'], owner=None if is_privileged else request.user,
+            )
+            for error in errors:
+                bulk_form.add_error(None, _ingest_error_message(error))
+            if not errors:
+                tasks = ingest.create_tasks(meeting, tasks)
+                messages.success(request, f"Added {len(tasks)} tasks.")
+                return redirect('meeting_detail', pk=meeting.pk)
+    elif request.method == 'POST':
         form = TaskCreateForm(request.POST, user=request.user)
         if form.is_valid():
             task = form.save(commit=False)
@@ -63,13 +115,46 @@ def meeting_detail(request, pk):
             return redirect('meeting_detail', pk=meeting.pk)
     else:
         form = TaskCreateForm()
-        if not is_privileged:
-            if 'owner' in form.fields:
-                form.fields.pop('owner')
+    if not is_privileged:
+        form.fields.pop('owner', None)
 
-    context = {'meeting': meeting, 'form': form, 'is_privileged': is_privileged}
+    context = {
+        'meeting': meeting, 'form': form, 'bulk_form': bulk_form, 'is_privileged': is_privileged,
+        **occurrence_context(meeting),
+    }
     return render(request, 'core/meeting_detail.html', context)
 
+def _ingest_error_message(error):
+    where = f"Row {error['row']}: " if error['row'] else ''
+    field = f"{error['field'].replace('_', ' ')}: " if error['field'] and error['field'] != '__all__' else ''
+    return f"{where}{field}{error['message']}"
+
+@login_required
+@require_POST
+def meeting_tasks_import(request, pk):
+    """
+    Adds many tasks to a meeting from an uploaded CSV or JSON file (field
+    "file"), or a CSV or JSON request body. Nothing is written unless every
+    row is valid; the errors come back per row instead.
+    """
+    meeting = get_object_or_404(Meeting.objects.visible_to(request.user), pk=pk)
+    try:
+        if 'file' in request.FILES:
+            rows = ingest.parse_upload(request.FILES['file'])
+        elif request.content_type == 'application/json':
+            rows = ingest.parse_json(request.body.decode('utf-8'))
+        else:
+            rows = ingest.parse_csv(request.body.decode('utf-8-sig'))
+    except (ValueError, UnicodeDecodeError) as error:
+        return JsonResponse({'errors': [{'row': None, 'field': None, 'message': str(error)}]}, status=400)
+
+    owner = None if is_privileged_user(request.user) else request.user
+    tasks, errors = ingest.build_tasks(meeting, rows, owner=owner)
+    if errors:
+        return JsonResponse({'errors': errors}, status=400)
+    tasks = ingest.create_tasks(meeting, tasks)
+    return JsonResponse({'created': len(tasks), 'ids': [task.pk for task in tasks]}, status=201)
+
 @login_required
 def meeting_create(request):
     if not is_privileged_user(request.user):
@@ -122,19 +207,41 @@ def meeting_update(request, pk):
 def meeting_delete(request, pk):
     if not is_privileged_user(request.user): raise PermissionDenied
     meeting = get_object_or_404(Meeting, pk=pk)
-    meeting.delete()
+    # Soft delete: a couple of UPDATEs however many tasks the meeting has;
+    # purge_deleted removes the rows later
+    deletion.delete_meeting(meeting)
+    messages.success(request, f"Meeting '{meeting.title}' has been deleted.")
     return redirect('meeting_list')
 
+@login_required
+@require_POST
+def meeting_occurrence(request, pk):
+    if not is_privileged_user(request.user): raise PermissionDenied
+    meeting = get_object_or_404(Meeting.objects.exclude(recurrence=''), pk=pk)
+    change_occurrence(request, meeting)
+    return redirect('meeting_detail', pk=meeting.pk)
+
 @login_required
 def task_update(request, pk):
     task = get_object_or_404(Task, pk=pk)
     is_privileged = is_privileged_user(request.user)
     if not (is_privileged or request.user == task.owner): raise PermissionDenied
+    previous_status, previous_owner_id = task.status, task.owner_id
     
     if request.method == 'POST':
         form = TaskUpdateForm(request.POST, instance=task, user=request.user)
         if form.is_valid():
             form.save()
+            if (task.status, task.owner_id) != (previous_status, previous_owner_id):
+                broker.publish('task.status', {
+                    'task': task.pk,
+                    'title': task.title,
+                    'status': task.status,
+                    'status_display': task.get_status_display(),
+                    'owner': task.owner_id,
+                    'previous_status': previous_status,
+                    'previous_owner': previous_owner_id,
+                }, user_ids=[task.owner_id, previous_owner_id], broadcast=True)
             return redirect('my_tasks')
     else:
         form = TaskUpdateForm(instance=task, user=request.user)
@@ -142,38 +249,78 @@ def task_update(request, pk):
     context = {'form': form, 'task': task}
     return render(request, 'core/task_update.html', context)
 
+@login_required
+@require_POST
+def task_bulk_update(request):
+    """
+    Applies one status, priority, owner or due date change to the posted
+    tasks. Browsers are redirected back to my_tasks; clients asking for JSON
+    get the outcome as JSON.
+    """
+    form = TaskBulkUpdateForm(request.POST, user=request.user)
+    wants_json = not request.accepts('text/html')
+    if not form.is_valid():
+        if wants_json:
+            return JsonResponse({'errors': form.errors}, status=400)
+        messages.error(request, ' '.join(error for errors in form.errors.values() for error in errors))
+        return redirect('my_tasks')
+
+    updated = bulk.update_tasks(form.cleaned_data['tasks'], form.cleaned_data['changes'])
+    if wants_json:
+        return JsonResponse({'updated': updated})
+    messages.success(request, f"Updated {updated} tasks.")
+    return redirect('my_tasks')
+
 @login_required
 @require_POST
 def task_delete(request, pk):
     if not is_privileged_user(request.user): raise PermissionDenied
     task = get_object_or_404(Task, pk=pk)
-    meeting_pk = task.meeting.pk
-    task.delete()
-    return redirect('meeting_detail', pk=meeting_pk)
+    deletion.delete_task(task)
+    return redirect('meeting_detail', pk=task.meeting_id)
 
 @login_required
 def my_tasks(request):
-    all_user_tasks = Task.objects.filter(owner=request.user)
-    pending_tasks = all_user_tasks.filter(status=Task.StatusChoices.PENDING).order_by('due_date')
-    inprogress_tasks = all_user_tasks.filter(status=Task.StatusChoices.IN_PROGRESS).order_by('due_date')
-    blocked_tasks = all_user_tasks.filter(status=Task.StatusChoices.BLOCKED).order_by('due_date')
-    completed_tasks = all_user_tasks.filter(status=Task.StatusChoices.COMPLETED).order_by('-updated_at')
+    # Every open task in one query, grouped into the kanban columns in Python
+    open_tasks = queries.open_tasks(request.user)
+    columns = {
+        Task.StatusChoices.PENDING: [],
+        Task.StatusChoices.IN_PROGRESS: [],
+        Task.StatusChoices.BLOCKED: [],
+    }
+    for task in open_tasks:
+        columns[task.status].append(task)
+
+    # Finished work only grows, so show the latest few and load the rest on demand
+    completed_tasks = queries.completed_tasks(request.user).get_page()
+    owned = counters.own(request.user)
+
     context = {
-        'pending_tasks': pending_tasks,
-        'inprogress_tasks': inprogress_tasks,
-        'blocked_tasks': blocked_tasks,
+        'pending_tasks': columns[Task.StatusChoices.PENDING],
+        'inprogress_tasks': columns[Task.StatusChoices.IN_PROGRESS],
+        'blocked_tasks': columns[Task.StatusChoices.BLOCKED],
         'completed_tasks': completed_tasks,
+        'pending_count': len(columns[Task.StatusChoices.PENDING]),
+        'inprogress_count': len(columns[Task.StatusChoices.IN_PROGRESS]),
+        'blocked_count': len(columns[Task.StatusChoices.BLOCKED]),
+        'completed_count': owned.tasks_owned_completed,
+        'total_count': owned.tasks_owned,
+        'bulk_form': TaskBulkUpdateForm(user=request.user),
     }
     return render(request, 'core/my_tasks.html', context)
 
+@login_required
+def my_tasks_completed(request):
+    page = queries.completed_tasks(request.user).get_page(request.GET.get('cursor'))
+    html = render_to_string('core/completed_task_cards.html', {'tasks': page}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
 @login_required
 def management_dashboard(request):
     if not is_privileged_user(request.user): raise PermissionDenied
-    managers = User.objects.filter(role='MANAGER').annotate(
-        total_tasks=Count('task_owned'),
-        completed_tasks=Count('task_owned', filter=Q(task_owned__status=Task.StatusChoices.COMPLETED)),
-        incomplete_tasks=Count('task_owned', filter=~Q(task_owned__status=Task.StatusChoices.COMPLETED))
-    ).order_by('username')
+    managers = caching.get_or_set(
+        'management_dashboard', ('task', 'user'), (), lambda: list(queries.managers_with_counts())
+    )
     context = {'managers': managers}
     return render(request, 'core/management_dashboard.html', context)
 
@@ -182,15 +329,42 @@ def management_report(request, manager_id=None):
     if not is_privileged_user(request.user):
         raise PermissionDenied
 
-    meetings = Meeting.objects.all().order_by('-meeting_time')
-    selected_manager = None
+    selected_manager = get_object_or_404(User, id=manager_id) if manager_id else None
+    report_tasks = queries.report_tasks(selected_manager)
 
-    if manager_id:
-        meetings = meetings.filter(tasks__owner__id=manager_id).distinct()
-        selected_manager = get_object_or_404(User, id=manager_id)
+    # Each page's tasks (with their owners) arrive in one prefetch query
+    meetings = queries.report_meetings(report_tasks).prefetch_related(
+        Prefetch('tasks', queryset=report_tasks, to_attr='report_tasks')
+    )
+
+    paginator = Paginator(meetings, 10)
+    page_number = request.GET.get('page')
 
     context = {
-        'meetings': meetings,
+        # Only evaluated when the report fragment misses the cache
+        'meetings': SimpleLazyObject(lambda: paginator.get_page(page_number)),
         'selected_manager': selected_manager,
+        'report_cache_key': caching.make_key('management_report', ('meeting', 'task', 'user'), manager_id, page_number),
     }
-    return render(request, 'core/management_report.html', context)
\ No newline at end of file
+    return render(request, 'core/management_report.html', context)
+
+@login_required
+def management_report_export(request, manager_id=None):
+    if not is_privileged_user(request.user):
+        raise PermissionDenied
+
+    selected_manager = get_object_or_404(User, id=manager_id) if manager_id else None
+    rows = exports.report_rows(manager=selected_manager)
+    filename = f"task-report-{selected_manager.username if selected_manager else 'all'}-{timezone.now():%Y%m%d}"
+
+    if request.GET.get('format') == 'xlsx':
+        response = StreamingHttpResponse(
+            exports.stream_xlsx(rows),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+        filename += '.xlsx'
+    else:
+        response = StreamingHttpResponse(exports.stream_csv(rows), content_type='text/csv')
+        filename += '.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
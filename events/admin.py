@@ -1,17 +1,21 @@
 # events/admin.py
 from django.contrib import admin
-from .models import Event, Invitation
+from .models import Event, EventException, Invitation
 
 class InvitationInline(admin.TabularInline):
     model = Invitation
     extra = 1
 
+class EventExceptionInline(admin.TabularInline):
+    model = EventException
+    extra = 0
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ('title', 'start_datetime', 'created_by')
     search_fields = ('title', 'description')
     list_filter = ('start_datetime',)
-    inlines = [InvitationInline]
+    inlines = [InvitationInline, EventExceptionInline]
 
 @admin.register(Invitation)
 class InvitationAdmin(admin.ModelAdmin):
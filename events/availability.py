@@ -0,0 +1,151 @@
+# events/availability.py
+import datetime
+from collections import defaultdict
+
+from django.db.models import CharField, DateTimeField, Exists, F, IntegerField, OuterRef, Q, Value
+from django.utils import timezone
+
+from core import recurrence
+from core.models import Meeting, MeetingException
+from .models import Event, EventException, Invitation
+
+# Meetings are stored as a start and a length in minutes, so any meeting that
+# starts up to this long before the window is fetched and checked in Python
+LONGEST_MEETING = datetime.timedelta(hours=12)
+
+# Free time outside working hours, or at the weekend, is not offered
+WORKDAY = (datetime.time(9), datetime.time(17))
+WORKING_WEEKDAYS = range(5)
+
+SLOT_STEP = datetime.timedelta(minutes=15)
+_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _attending(queryset, column, user_ids):
+    return Exists(queryset.filter(**{f'{column}__in': user_ids}))
+
+
+def busy_intervals(user_ids, window_start, window_end, exclude_event=None, exclude_meeting=None):
+    """
+    Returns (start, end) for every event or meeting of `user_ids` that
+    overlaps the window, read in one UNION query. Every part walks the
+    window on a time index and checks attendance per row. Repeating rows
+    come back once and are expanded here; their exceptions cost one more
+    query per kind, and only when such rows are found.
+    """
+    events = Event.objects.filter(
+        _attending(Invitation.objects.filter(event_id=OuterRef('pk')), 'invitee_id', user_ids),
+    ).annotate(
+        busy_start=F('start_datetime'),
+        busy_end=F('effective_end'),
+        busy_minutes=Value(0, output_field=IntegerField()),
+        busy_kind=Value('event', output_field=CharField()),
+    )
+    participation = Meeting.participants.through.objects.filter(meeting_id=OuterRef('pk'))
+    meetings = Meeting.objects.filter(
+        _attending(participation, 'user_id', user_ids),
+    ).annotate(
+        busy_start=F('meeting_time'),
+        busy_end=Value(None, output_field=DateTimeField()),
+        busy_minutes=F('duration'),
+        busy_kind=Value('meeting', output_field=CharField()),
+    )
+    if exclude_event:
+        events = events.exclude(pk=exclude_event)
+    if exclude_meeting:
+        meetings = meetings.exclude(pk=exclude_meeting)
+
+    # One-off rows and series are separate halves, so each keeps its own index
+    columns = ('busy_start', 'busy_end', 'busy_minutes', 'busy_kind', 'pk', 'recurrence', 'recurrence_until')
+    parts = [
+        events.filter(recurrence='', start_datetime__lt=window_end, effective_end__gt=window_start),
+        events.filter(Event.series_in(window_start, window_end)),
+        meetings.filter(recurrence='', meeting_time__lt=window_end, meeting_time__gt=window_start - LONGEST_MEETING),
+        meetings.filter(Meeting.series_in(window_start - LONGEST_MEETING, window_end)),
+    ]
+    first, *rest = [part.values_list(*columns) for part in parts]
+    rows = first.union(*rest)
+
+    intervals, series = [], []
+    for start, end, minutes, kind, pk, rule, until in rows:
+        length = (end - start) if end else datetime.timedelta(minutes=minutes)
+        if rule:
+            series.append((kind, pk, rule, until, start, length))
+        elif start + length > window_start:
+            intervals.append((start, start + length))
+
+    exceptions = _exceptions_for(series)
+    for kind, pk, rule, until, start, length in series:
+        for _, moved, _ in recurrence.expand(
+            rule, start, until, length, window_start, window_end, exceptions[kind, pk],
+        ):
+            intervals.append((moved, moved + length))
+    return intervals
+
+
+def _exceptions_for(series):
+    exceptions = defaultdict(list)
+    for kind, model in (('event', EventException), ('meeting', MeetingException)):
+        ids = [pk for row_kind, pk, *_ in series if row_kind == kind]
+        if ids:
+            for exception in model.objects.filter(series_id__in=ids):
+                exceptions[kind, exception.series_id].append(exception)
+    return exceptions
+
+
+def off_hours(window_start, window_end, workday=WORKDAY):
+    """Intervals outside working hours, in the current time zone, covering the window."""
+    tz = timezone.get_current_timezone()
+    day = timezone.localtime(window_start, tz).date() - datetime.timedelta(days=1)
+    last_day = timezone.localtime(window_end, tz).date() + datetime.timedelta(days=1)
+    intervals = []
+    while day <= last_day:
+        day_start = timezone.make_aware(datetime.datetime.combine(day, datetime.time()), tz)
+        next_day = timezone.make_aware(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()), tz)
+        if day.weekday() in WORKING_WEEKDAYS:
+            intervals.append((day_start, timezone.make_aware(datetime.datetime.combine(day, workday[0]), tz)))
+            intervals.append((timezone.make_aware(datetime.datetime.combine(day, workday[1]), tz), next_day))
+        else:
+            intervals.append((day_start, next_day))
+        day += datetime.timedelta(days=1)
+    return intervals
+
+
+def merge(intervals):
+    """Sweeps the intervals in start order, merging any that overlap or touch."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _align(moment, step):
+    """Rounds `moment` up to the next multiple of `step`."""
+    return moment + (-(moment - _EPOCH)) % step
+
+
+def free_slots(user_ids, duration, window_start, window_end, limit=5, workday=WORKDAY, step=SLOT_STEP,
+               exclude_event=None, exclude_meeting=None):
+    """
+    Returns up to `limit` (start, free_until) pairs, earliest first: the start
+    of each gap of at least `duration` in which none of `user_ids` is busy,
+    and when that gap ends.
+    """
+    busy = busy_intervals(user_ids, window_start, window_end, exclude_event, exclude_meeting)
+    busy += off_hours(window_start, window_end, workday)
+
+    slots = []
+    cursor = _align(window_start, step)
+    for busy_start, busy_end in merge(busy) + [[window_end, window_end]]:
+        gap_end = min(busy_start, window_end)
+        if gap_end - cursor >= duration:
+            slots.append((cursor, gap_end))
+            if len(slots) == limit:
+                break
+        cursor = max(cursor, _align(busy_end, step))
+        if cursor >= window_end:
+            break
+    return slots
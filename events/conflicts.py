@@ -0,0 +1,97 @@
+# events/conflicts.py
+import bisect
+import datetime
+from collections import defaultdict
+from django.db.models import Q
+from django.utils import timezone
+from core import recurrence
+from .models import Event, Invitation
+
+# How far ahead a proposed repeating event is checked for clashes
+SERIES_HORIZON = datetime.timedelta(weeks=13)
+
+
+def proposed_windows(start_time, end_time, rule='', until=None, horizon=SERIES_HORIZON):
+    """
+    The (start, end) windows a proposed event would take: one for a one-off
+    event, or one per occurrence of a repeating one, up to `until` or
+    `horizon` after its first start, whichever comes first.
+    """
+    if timezone.is_naive(start_time):
+        start_time, end_time = timezone.make_aware(start_time), timezone.make_aware(end_time)
+    if not rule:
+        return [(start_time, end_time)]
+    length = end_time - start_time
+    window_end = start_time + horizon
+    if until is not None:
+        window_end = min(window_end, until + length)
+    return [
+        (start, start + length)
+        for _, start, _ in recurrence.expand(rule, start_time, until, length, start_time, window_end)
+    ] or [(start_time, end_time)]
+
+
+def _overlaps(windows, starts, event):
+    """Whether `event` overlaps any of `windows`, sorted and all the same length (`starts` are their starts)."""
+    # The last window starting before the event ends is the only one that can reach it
+    index = bisect.bisect_left(starts, event.effective_end) - 1
+    return index >= 0 and windows[index][1] > event.start_datetime
+
+
+def overlapping_invitations(user_ids, start_time, end_time, exclude_event=None):
+    """
+    Invitations of `user_ids` to live events that overlap the window, with
+    their events; repeating events are matched by series and still need
+    expanding.
+    """
+    invitations = Invitation.objects.filter(
+        Q(event__recurrence='', event__start_datetime__lt=end_time, event__effective_end__gt=start_time)
+        | Event.series_in(start_time, end_time, prefix='event__'),
+        invitee__in=user_ids,
+        event__deleted_at__isnull=True,
+    ).select_related('event').order_by('event__start_datetime', 'event__pk')
+    if exclude_event is not None and exclude_event.pk:
+        invitations = invitations.exclude(event=exclude_event)
+    return invitations
+
+
+def find_conflicts(participants, start_time, end_time, exclude_event=None, rule='', until=None):
+    """
+    Returns {participant: [conflicting events]} for everyone in `participants`
+    who is already invited to an event overlapping start_time..end_time.
+    Open-ended events are matched through their effective end, and repeating
+    events through their occurrences in the window. With a recurrence `rule`
+    the proposed event is itself a series, and every occurrence of it within
+    SERIES_HORIZON is checked.
+
+    All participants are answered with a single query over Invitation, so the
+    cost does not grow with the size of the invite list.
+    """
+    participants = list(participants)
+    if not participants:
+        return {}
+    windows = proposed_windows(start_time, end_time, rule, until)
+    starts = [window_start for window_start, _ in windows]
+    start_time, end_time = windows[0][0], windows[-1][1]
+    invitations = list(overlapping_invitations(
+        [person.pk for person in participants], start_time, end_time, exclude_event,
+    ))
+    # A repeating event conflicts through whichever occurrences fall in the window
+    series = {invitation.event.pk: invitation.event for invitation in invitations if invitation.event.recurrence}
+    occurrences = {pk: [] for pk in series}
+    for occurrence in Event.expand_all(series.values(), start_time, end_time):
+        occurrences[occurrence.pk].append(occurrence)
+
+    events_by_invitee = defaultdict(list)
+    for invitation in invitations:
+        event = invitation.event
+        events_by_invitee[invitation.invitee_id].extend(
+            candidate for candidate in occurrences.get(event.pk, [event]) if _overlaps(windows, starts, candidate)
+        )
+    events_by_invitee = {person: events for person, events in events_by_invitee.items() if events}
+
+    return {
+        person: events_by_invitee[person.pk]
+        for person in participants
+        if person.pk in events_by_invitee
+    }
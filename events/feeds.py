@@ -0,0 +1,208 @@
+# events/feeds.py
+import hashlib
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db.models import Count, F, Max, Q, prefetch_related_objects
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import Event, Invitation
+
+_signer = signing.Signer(salt='events.calendar_feed')
+
+# Repeating events are listed occurrence by occurrence in the JSON feed; a
+# request without a range gets this much either side of now
+SERIES_PAST = timedelta(days=30)
+SERIES_AHEAD = timedelta(days=180)
+
+
+def feed_token(user):
+    """Returns the opaque token that identifies `user` in their calendar feed URLs."""
+    return _signer.sign(f'{user.pk}:{user.feed_version}')
+
+
+def user_for_token(token):
+    """The active user a feed token was issued to, or None if it is forged or was revoked."""
+    try:
+        value = _signer.unsign(token)
+    except signing.BadSignature:
+        return None
+    # Links issued before feed versions carry the pk alone
+    user_pk, _, version = value.partition(':')
+    return get_user_model().objects.filter(pk=user_pk, feed_version=version or 0, is_active=True).first()
+
+
+def revoke_feed_token(user):
+    """Invalidates the user's current feed links; feed_token then issues a new one."""
+    get_user_model().objects.filter(pk=user.pk).update(feed_version=F('feed_version') + 1)
+    user.refresh_from_db(fields=['feed_version'])
+
+
+def _parse_bound(value):
+    """Accepts an ISO date or datetime (as sent by calendar widgets); anything else is ignored."""
+    if not value:
+        return None
+    moment = parse_datetime(value.replace(' ', '+'))
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def date_range(params):
+    """Returns (start, end) from ?start=&end=; either may be None."""
+    try:
+        return _parse_bound(params.get('start')), _parse_bound(params.get('end'))
+    except ValueError:
+        return None, None
+
+
+def series_window(start=None, end=None):
+    """
+    The range the JSON feed expands repeating events over. Missing bounds
+    are taken from today's local date, so the window moves once a day.
+    """
+    today = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+    return start or today - SERIES_PAST, end or today + SERIES_AHEAD
+
+
+def feed_validators(user, start=None, end=None, fmt=''):
+    """
+    Returns (etag, last_modified) for a user's feed from one aggregate over
+    their invitations. Event edits are stamped onto the invitations, so this
+    never reads the event rows.
+    """
+    if fmt == 'json':
+        # The occurrences listed depend on the window, which moves with the date
+        start, end = series_window(start, end)
+    stamp = Invitation.objects.filter(invitee=user).aggregate(latest=Max('updated_at'), count=Count('pk'))
+    latest = stamp['latest']
+    key = '|'.join(str(part) for part in (
+        user.pk, fmt, latest.isoformat() if latest else '', stamp['count'], start or '', end or '',
+    ))
+    etag = hashlib.sha1(key.encode()).hexdigest()
+    return etag, latest
+
+
+def feed_invitations(user, start=None, end=None):
+    invitations = Invitation.objects.filter(
+        invitee=user, status=Invitation.StatusChoices.ACCEPTED, event__deleted_at__isnull=True,
+    ).select_related('event').order_by('event__start_datetime', 'event__pk')
+    if start is not None or end is not None:
+        one_off = Q(event__recurrence='')
+        if start is not None:
+            one_off &= Q(event__effective_end__gt=start)
+        if end is not None:
+            one_off &= Q(event__start_datetime__lt=end)
+        invitations = invitations.filter(one_off | Event.series_in(start, end, prefix='event__'))
+    return invitations
+
+
+def events_json(invitations, start=None, end=None):
+    events = Event.expand_all([invitation.event for invitation in invitations], *series_window(start, end))
+    return [
+        {
+            "title": event.title,
+            "start": event.start_datetime.isoformat(),
+            "end": event.end_datetime.isoformat() if event.end_datetime else None,
+        }
+        for event in events
+    ]
+
+
+def _ics_text(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _ics_time(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _fold(line):
+    """Folds a content line to 75 octets as RFC 5545 requires, without splitting a UTF-8 sequence."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, limit = [], 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded, limit = encoded[cut:], 74
+    return '\r\n '.join(parts)
+
+
+def _ics_recurrence(event):
+    rule = event.recurrence
+    if event.recurrence_until and 'UNTIL=' not in rule and 'COUNT=' not in rule:
+        rule += f';UNTIL={_ics_time(event.recurrence_until)}'
+    lines = [f'RRULE:{rule}']
+    lines += [
+        f'EXDATE:{_ics_time(exception.original_start)}'
+        for exception in event.exceptions.all() if exception.cancelled
+    ]
+    return lines
+
+
+def _ics_moved_occurrences(event, invitation, host, build_url):
+    """One VEVENT per moved or retitled occurrence, overriding it by RECURRENCE-ID."""
+    lines, length = [], event.occurrence_length()
+    for exception in event.exceptions.all():
+        if exception.cancelled:
+            continue
+        start = exception.start or exception.original_start
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:event-{event.pk}@{host}',
+            f'RECURRENCE-ID:{_ics_time(exception.original_start)}',
+            f'DTSTAMP:{_ics_time(invitation.updated_at)}',
+            f'DTSTART:{_ics_time(start)}',
+            f'DTEND:{_ics_time(start + length)}',
+            f'SUMMARY:{_ics_text(exception.title or event.title)}',
+            f'URL:{build_url(event)}',
+            'END:VEVENT',
+        ]
+    return lines
+
+
+def events_ics(invitations, calendar_name, host, build_url):
+    invitations = list(invitations)
+    # Exceptions are only read for the repeating events, in one query
+    prefetch_related_objects([invitation.event for invitation in invitations if invitation.event.recurrence], 'exceptions')
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Decision Tracker//Events//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_ics_text(calendar_name)}',
+    ]
+    for invitation in invitations:
+        event = invitation.event
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:event-{event.pk}@{host}',
+            f'DTSTAMP:{_ics_time(invitation.updated_at)}',
+            f'DTSTART:{_ics_time(event.start_datetime)}',
+        ]
+        if event.end_datetime:
+            lines.append(f'DTEND:{_ics_time(event.end_datetime)}')
+        lines.append(f'SUMMARY:{_ics_text(event.title)}')
+        if event.location:
+            lines.append(f'LOCATION:{_ics_text(event.location)}')
+        if event.description:
+            lines.append(f'DESCRIPTION:{_ics_text(event.description)}')
+        if event.recurrence:
+            lines += _ics_recurrence(event)
+        lines += [f'URL:{build_url(event)}', 'END:VEVENT']
+        if event.recurrence:
+            lines += _ics_moved_occurrences(event, invitation, host, build_url)
+    lines.append('END:VCALENDAR')
+    return ''.join(_fold(line) + '\r\n' for line in lines)
@@ -1,8 +1,11 @@
 import datetime
 from django import forms
+from accounts.models import User
+from accounts.widgets import UserMultiplePicker
+from core.forms import MeetingCreateForm, RecurrenceForm
 from .models import Event
 
-class EventForm(forms.ModelForm):
+class EventForm(RecurrenceForm, forms.ModelForm):
     # Separate fields for date and time for better browser compatibility and styling
     start_date = forms.DateField(
         widget=forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full rounded-lg border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm'})
@@ -19,9 +22,15 @@ class EventForm(forms.ModelForm):
         widget=forms.TimeInput(attrs={'type': 'time', 'class': 'mt-1 block w-full rounded-lg border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm'})
     )
 
+    # Only used by the free-time finder; events keep their own end time
+    slot_duration = forms.TypedChoiceField(
+        choices=MeetingCreateForm.DURATION_CHOICES, coerce=int, initial=60, required=False, label='Length',
+        widget=forms.Select(attrs={'class': 'rounded-lg border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm'}),
+    )
+
     class Meta:
         model = Event
-        fields = ['title', 'description', 'location', 'participants']
+        fields = ['title', 'description', 'location', 'participants', 'recurrence', 'recurrence_until']
         
         labels = {
             'title': 'Event Title',
@@ -41,7 +50,7 @@ class EventForm(forms.ModelForm):
             'location': forms.TextInput(attrs={
                 'class': 'mt-1 block w-full rounded-lg border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm'
             }),
-            'participants': forms.CheckboxSelectMultiple(),
+            'participants': UserMultiplePicker(),
         }
 
     def __init__(self, *args, **kwargs):
@@ -84,3 +93,14 @@ class EventForm(forms.ModelForm):
             self.save_m2m()
         return instance
 
+class AvailabilityForm(forms.Form):
+    """Query parameters of the free-slot finder."""
+    MAX_DAYS = 30
+
+    participants = forms.ModelMultipleChoiceField(queryset=User.objects.all())
+    duration = forms.TypedChoiceField(choices=MeetingCreateForm.DURATION_CHOICES, coerce=int)
+    start = forms.DateField(required=False)
+    days = forms.IntegerField(min_value=1, max_value=MAX_DAYS, required=False)
+    limit = forms.IntegerField(min_value=1, max_value=20, required=False)
+    exclude_event = forms.IntegerField(required=False)
+    exclude_meeting = forms.IntegerField(required=False)
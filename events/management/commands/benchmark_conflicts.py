@@ -0,0 +1,73 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from events.conflicts import find_conflicts
+from events.models import Event, Invitation
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measures query count and latency of the conflict checker as the invite list grows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,50,200,500', help="Comma-separated participant counts.")
+        parser.add_argument('--events-per-user', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        try:
+            # Everything runs inside a transaction that is rolled back at the end,
+            # so the benchmark never leaves fixture rows behind.
+            with transaction.atomic():
+                self._run(sizes, options['events_per_user'], options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, sizes, events_per_user, repeat):
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        users = User.objects.bulk_create(
+            User(username=f'bench-conflicts-{i}') for i in range(max(sizes))
+        )
+        events = Event.objects.bulk_create(
+            Event(
+                title=f'Bench event {i}',
+                start_datetime=start + datetime.timedelta(hours=i),
+                end_datetime=start + datetime.timedelta(hours=i, minutes=45),
+                effective_end=start + datetime.timedelta(hours=i, minutes=45),
+            )
+            for i in range(events_per_user * 4)
+        )
+        Invitation.objects.bulk_create(
+            Invitation(event=events[(u + e) % len(events)], invitee=user)
+            for u, user in enumerate(users)
+            for e in range(events_per_user)
+        )
+
+        window_start = start + datetime.timedelta(hours=2)
+        window_end = window_start + datetime.timedelta(hours=2)
+
+        self.stdout.write(f"{'participants':>12} {'queries':>8} {'median ms':>10} {'conflicted':>11}")
+        for size in sizes:
+            participants = users[:size]
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as captured:
+                    began = time.perf_counter()
+                    conflicts = find_conflicts(participants, window_start, window_end)
+                    timings.append((time.perf_counter() - began) * 1000)
+            self.stdout.write(
+                f"{size:>12} {len(captured.captured_queries):>8} "
+                f"{statistics.median(timings):>10.2f} {len(conflicts):>11}"
+            )
@@ -0,0 +1,38 @@
+import datetime
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+# Mirrors Event.OPEN_ENDED_DURATION at the time of writing
+OPEN_ENDED_DURATION = datetime.timedelta(hours=1)
+
+
+def backfill_effective_end(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    last_pk = 0
+    while True:
+        batch = list(
+            Event.objects.filter(pk__gt=last_pk, effective_end__isnull=True)
+            .order_by('pk')
+            .only('pk', 'start_datetime', 'end_datetime')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for event in batch:
+            event.effective_end = event.end_datetime or event.start_datetime + OPEN_ENDED_DURATION
+        # Each batch commits on its own so large tables are never locked for the whole backfill
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Event.objects.bulk_update(batch, ['effective_end'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('events', '0005_event_effective_end'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_effective_end, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_backfill_event_effective_end'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='effective_end',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_time_range_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['effective_end', 'start_datetime'], name='event_effective_range_idx'),
+        ),
+    ]
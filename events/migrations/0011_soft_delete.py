@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_effective_range_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_start_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_series_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['effective_end', 'start_datetime'], name='event_effective_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['start_datetime', 'id'], name='event_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(models.Q(('recurrence', ''), _negated=True), ('deleted_at__isnull', True)), fields=['start_datetime'], name='event_series_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='event_deleted_idx'),
+        ),
+    ]
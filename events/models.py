@@ -1,13 +1,31 @@
+import datetime
 from django.db import models
 from django.conf import settings
 from django.urls import reverse
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
+from core.models import OccurrenceException, Recurring, SoftDeletable, SoftDeleteManager
+from core.utils import is_privileged_user
+
+class EventQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Events `user` may see: all for privileged users, otherwise those they created or are invited to."""
+        if is_privileged_user(user):
+            return self
+        invited = Invitation.objects.filter(event_id=OuterRef('pk'), invitee_id=user.pk)
+        return self.filter(Q(created_by_id=user.pk) | Exists(invited))
+
+class Event(Recurring, SoftDeletable):
+    # Events without an end time block this much of the calendar
+    OPEN_ENDED_DURATION = datetime.timedelta(hours=1)
 
-class Event(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
     start_datetime = models.DateTimeField(default=timezone.now)
     end_datetime = models.DateTimeField(null=True, blank=True)
+    # end_datetime, or start + OPEN_ENDED_DURATION for open-ended events; kept
+    # in sync by save() so overlap lookups never need an IS NULL branch
+    effective_end = models.DateTimeField(editable=False)
     location = models.CharField(max_length=200, blank=True, null=True) # <-- এই ফিল্ডটি যোগ করা হয়েছে
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -21,14 +39,71 @@ class Event(models.Model):
         related_name='events_participated'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SoftDeleteManager.from_queryset(EventQuerySet)()
+    all_objects = EventQuerySet.as_manager()
+
+    START_FIELD = 'start_datetime'
+
+    class Meta:
+        # The time indexes cover live events only, which is every query through
+        # `objects`; queries reaching events through invitations filter on
+        # event__deleted_at themselves
+        indexes = [
+            # Overlap lookups used by the conflict checker. Leading with the end
+            # keeps scans for upcoming windows to the tail of the index.
+            models.Index(
+                fields=['effective_end', 'start_datetime'], condition=Q(deleted_at__isnull=True),
+                name='event_effective_range_idx',
+            ),
+            # event_list pages on (start_datetime, id)
+            models.Index(fields=['start_datetime', 'id'], condition=Q(deleted_at__isnull=True), name='event_start_idx'),
+            # Repeating events are few; window lookups find them here
+            models.Index(
+                fields=['start_datetime'], condition=~Q(recurrence='') & Q(deleted_at__isnull=True),
+                name='event_series_idx',
+            ),
+            # purge_deleted's scan
+            models.Index(fields=['deleted_at'], condition=Q(deleted_at__isnull=False), name='event_deleted_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def effective_end_for(cls, start_datetime, end_datetime):
+        return end_datetime or start_datetime + cls.OPEN_ENDED_DURATION
+
+    def save(self, *args, **kwargs):
+        self.effective_end = self.effective_end_for(self.start_datetime, self.end_datetime)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'start_datetime', 'end_datetime'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'effective_end'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         # We will create this URL later
         return reverse('event_detail', kwargs={'pk': self.pk})
 
+    def occurrence_length(self):
+        return self.effective_end - self.start_datetime
+
+    def move_to(self, start):
+        length = self.occurrence_length()
+        if self.end_datetime:
+            self.end_datetime = start + length
+        self.start_datetime, self.effective_end = start, start + length
+
+
+class EventException(OccurrenceException):
+    series = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='exceptions')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'original_start'], name='unique_event_exception'),
+        ]
+
 class Invitation(models.Model):
     class StatusChoices(models.TextChoices):
         PENDING = 'PENDING', 'Pending'
@@ -42,9 +117,18 @@ class Invitation(models.Model):
         choices=StatusChoices.choices, 
         default=StatusChoices.PENDING
     )
+    # Also touched whenever the event itself changes (see events.signals), so
+    # a user's calendar feed can be validated from their invitations alone
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('event', 'invitee')
+        indexes = [
+            # unique_together leads with event; conflict checks look up by invitee
+            models.Index(fields=['invitee', 'event'], name='invitation_invitee_event_idx'),
+            models.Index(fields=['invitee', 'status'], name='invitation_invitee_status_idx'),
+            models.Index(fields=['invitee', 'updated_at'], name='invitation_invitee_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.invitee.username}'s invitation to {self.event.title}"
@@ -0,0 +1,18 @@
+# events/queries.py
+
+from core.pagination import KeysetPaginator
+from .models import Event, Invitation
+
+# The querysets behind the hot event views, shared with explain_hot_queries
+
+
+def event_list(user):
+    """Paginator over the events `user` may see, soonest first."""
+    events = Event.objects.visible_to(user).select_related('created_by')
+    return KeysetPaginator(events, ('start_datetime', 'pk'), per_page=12)
+
+
+def my_invitations(user):
+    """Paginator over the user's invitations to live events, by event start."""
+    invitations = Invitation.objects.filter(invitee=user, event__deleted_at__isnull=True).select_related('event')
+    return KeysetPaginator(invitations, ('event__start_datetime', 'pk'), per_page=12)
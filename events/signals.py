@@ -0,0 +1,32 @@
+# events/signals.py
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from core import caching
+from .models import Event, EventException, Invitation
+
+
+@receiver(post_save, sender=Event)
+def touch_invitations(sender, instance, created, **kwargs):
+    """Propagates an event edit to its invitations' updated_at, which the calendar feeds validate against."""
+    if not created:
+        Invitation.objects.filter(event=instance).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=EventException)
+def touch_series_invitations(sender, instance, **kwargs):
+    """A cancelled or moved occurrence changes the series' calendar entry too."""
+    Invitation.objects.filter(event_id=instance.series_id).update(updated_at=timezone.now())
+    caching.bump('invitation')
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventException)
+def invalidate_events(sender, **kwargs):
+    caching.bump('event')
+
+
+@receiver([post_save, post_delete], sender=Invitation)
+@receiver(m2m_changed, sender=Event.participants.through)
+def invalidate_invitations(sender, **kwargs):
+    caching.bump('invitation')
@@ -1,3 +1,321 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import Meeting
+from core.testing import QueryBudgetMixin
+from . import availability, feeds
+from .conflicts import find_conflicts
+from .models import Event, Invitation
+
+
+class FindConflictsTests(TestCase):
+    def setUp(self):
+        self.start = timezone.now().replace(microsecond=0) + datetime.timedelta(days=1)
+        self.users = [User.objects.create(username=f'user{i}') for i in range(20)]
+        self.busy = Event.objects.create(
+            title='Standup',
+            start_datetime=self.start,
+            end_datetime=self.start + datetime.timedelta(hours=1),
+        )
+        Invitation.objects.bulk_create(Invitation(event=self.busy, invitee=user) for user in self.users[::2])
+
+    def test_returns_conflicting_events_per_participant(self):
+        conflicts = find_conflicts(
+            self.users[:4],
+            self.start + datetime.timedelta(minutes=30),
+            self.start + datetime.timedelta(minutes=90),
+        )
+        self.assertEqual(list(conflicts), [self.users[0], self.users[2]])
+        self.assertEqual(conflicts[self.users[0]], [self.busy])
+
+    def test_open_ended_events_conflict_through_effective_end(self):
+        open_ended = Event.objects.create(title='Drop-in', start_datetime=self.start + datetime.timedelta(hours=3))
+        Invitation.objects.create(event=open_ended, invitee=self.users[1])
+        self.assertEqual(open_ended.effective_end, open_ended.start_datetime + Event.OPEN_ENDED_DURATION)
+
+        conflicts = find_conflicts(
+            self.users[1:2],
+            self.start + datetime.timedelta(hours=3, minutes=30),
+            self.start + datetime.timedelta(hours=5),
+        )
+        self.assertEqual(conflicts[self.users[1]], [open_ended])
+
+    def test_excludes_event_being_updated(self):
+        conflicts = find_conflicts(
+            self.users, self.start, self.start + datetime.timedelta(hours=1), exclude_event=self.busy
+        )
+        self.assertEqual(conflicts, {})
+
+    def test_query_count_does_not_grow_with_participants(self):
+        end = self.start + datetime.timedelta(hours=1)
+        with self.assertNumQueries(1):
+            find_conflicts(self.users[:2], self.start, end)
+        with self.assertNumQueries(1):
+            find_conflicts(self.users, self.start, end)
+
+    def test_repeating_events_conflict_through_their_occurrences(self):
+        weekly = Event.objects.create(
+            title='Planning', start_datetime=self.start - datetime.timedelta(weeks=3), recurrence='FREQ=WEEKLY',
+        )
+        Invitation.objects.create(event=weekly, invitee=self.users[1])
+        conflicts = find_conflicts(self.users[1:2], self.start, self.start + datetime.timedelta(minutes=30))
+        [occurrence] = conflicts[self.users[1]]
+        self.assertEqual((occurrence.pk, occurrence.start_datetime), (weekly.pk, self.start))
+
+        weekly.change_occurrence(self.start, 'cancel')
+        self.assertEqual(find_conflicts(self.users[1:2], self.start, self.start + datetime.timedelta(minutes=30)), {})
+
+
+    def test_proposed_series_is_checked_past_its_first_occurrence(self):
+        # Free for the first occurrence, busy for the second
+        first = self.start - datetime.timedelta(weeks=1)
+        end = first + datetime.timedelta(minutes=30)
+        self.assertEqual(find_conflicts(self.users[:1], first, end), {})
+        conflicts = find_conflicts(self.users[:1], first, end, rule='FREQ=WEEKLY')
+        self.assertEqual(conflicts[self.users[0]], [self.busy])
+        self.assertEqual(find_conflicts(self.users[:1], first, end, rule='FREQ=WEEKLY', until=first), {})
+
+    def test_event_create_warns_about_clashes_with_later_occurrences(self):
+        boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.client.force_login(boss)
+        first = timezone.localtime(self.start - datetime.timedelta(weeks=1))
+        data = {
+            'title': 'Weekly sync', 'start_date': first.date().isoformat(), 'start_time': first.strftime('%H:%M'),
+            'participants': [self.users[0].pk], 'recurrence': 'FREQ=WEEKLY',
+        }
+        response = self.client.post(reverse('event_create'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['conflict_warning'])
+        self.assertFalse(Event.objects.filter(title='Weekly sync').exists())
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='feed', password='pw')
+        start = timezone.now() + datetime.timedelta(days=1)
+        self.event = Event.objects.create(title='Review, final; v2', start_datetime=start)
+        self.invitation = Invitation.objects.create(
+            event=self.event, invitee=self.user, status=Invitation.StatusChoices.ACCEPTED
+        )
+        self.url = reverse('calendar_feed_ics', args=[feeds.feed_token(self.user)])
+        self.client = Client(HTTP_HOST='localhost')
+
+    def test_ics_feed_lists_accepted_events(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn(b'SUMMARY:Review\\, final\\; v2\r\n', response.content)
+
+    def test_bad_token_is_not_found(self):
+        response = self.client.get(reverse('calendar_feed_ics', args=[f'{self.user.pk}:forged']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_regenerating_the_token_revokes_the_old_link(self):
+        legacy_url = reverse('calendar_feed_ics', args=[feeds._signer.sign(str(self.user.pk))])
+        self.assertEqual(self.client.get(legacy_url).status_code, 200)
+
+        self.client.force_login(self.user)
+        self.assertRedirects(self.client.post(reverse('regenerate_feed_token')), reverse('my_events'))
+        self.user.refresh_from_db()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(legacy_url).status_code, 404)
+        new_url = reverse('calendar_feed_ics', args=[feeds.feed_token(self.user)])
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+
+    def test_conditional_get_skips_event_rows(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(2):  # user lookup and the invitation stamp
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.event.title = 'Moved'
+        self.event.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_ics_feed_carries_recurrence_and_exceptions(self):
+        start = self.event.start_datetime
+        self.event.recurrence = 'FREQ=WEEKLY'
+        self.event.save()
+        self.event.change_occurrence(start + datetime.timedelta(weeks=1), 'cancel')
+        self.event.change_occurrence(start + datetime.timedelta(weeks=2), 'move', start=start + datetime.timedelta(weeks=2, hours=2))
+
+        content = self.client.get(self.url).content.decode()
+        self.assertIn('RRULE:FREQ=WEEKLY\r\n', content)
+        self.assertIn(f'EXDATE:{feeds._ics_time(start + datetime.timedelta(weeks=1))}\r\n', content)
+        self.assertIn(f'RECURRENCE-ID:{feeds._ics_time(start + datetime.timedelta(weeks=2))}\r\n', content)
+        self.assertEqual(content.count('BEGIN:VEVENT'), 2)
+
+    def test_json_feed_lists_occurrences_of_repeating_events(self):
+        self.event.recurrence = 'FREQ=DAILY'
+        self.event.save()
+        url = reverse('calendar_feed_json', args=[feeds.feed_token(self.user)])
+        start = self.event.start_datetime - datetime.timedelta(hours=1)
+        data = self.client.get(url, {'start': start.isoformat(), 'end': (start + datetime.timedelta(days=3)).isoformat()}).json()
+        self.assertEqual(len(data), 3)
+
+    def test_json_feed_without_a_range_is_revalidated_as_days_pass(self):
+        self.event.recurrence = 'FREQ=DAILY'
+        self.event.save()
+        url = reverse('calendar_feed_json', args=[feeds.feed_token(self.user)])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        later = timezone.now() + datetime.timedelta(days=2)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_json_feed_filters_by_date_range(self):
+        url = reverse('calendar_feed_json', args=[feeds.feed_token(self.user)])
+        later = (timezone.now() + datetime.timedelta(days=5)).date().isoformat()
+        self.assertEqual(len(self.client.get(url).json()), 1)
+        self.assertEqual(self.client.get(url, {'start': later}).json(), [])
+
+
+    def test_deleted_events_leave_the_feed(self):
+        etag = self.client.get(self.url)['ETag']
+        manager = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.client.force_login(manager)
+        self.assertRedirects(self.client.post(reverse('event_delete', args=[self.event.pk])), reverse('event_list'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(b'BEGIN:VEVENT', response.content)
+        self.assertTrue(Invitation.objects.filter(pk=self.invitation.pk).exists())
+        self.assertEqual(find_conflicts([self.user], self.event.start_datetime, self.event.effective_end), {})
+
+        call_command('purge_deleted', days=0, stdout=StringIO())
+        self.assertFalse(Event.all_objects.exists())
+        self.assertFalse(Invitation.objects.exists())
+
+class EventVisibilityTests(TestCase):
+    def setUp(self):
+        self.member = User.objects.create(username='member')
+        self.invited = Event.objects.create(title='Invited')
+        Invitation.objects.create(event=self.invited, invitee=self.member)
+        self.created = Event.objects.create(title='Created', created_by=self.member)
+        self.private = Event.objects.create(title='Private')
+
+    def test_visible_to_covers_invited_and_created_events(self):
+        visible = Event.objects.visible_to(self.member).order_by('pk')
+        self.assertEqual(list(visible), [self.invited, self.created])
+
+    def test_event_detail_hides_other_events(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.get(reverse('event_detail', args=[self.invited.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('event_detail', args=[self.private.pk])).status_code, 404)
+
+
+class EventCreateTests(TestCase):
+    def test_invitations_are_written_with_the_event(self):
+        boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        guest = User.objects.create(username='guest')
+        self.client.force_login(boss)
+        data = {'title': 'Offsite', 'start_date': '2030-01-01', 'start_time': '09:00', 'participants': [guest.pk]}
+
+        # No worker runs: the invitations must not wait for one
+        with self.settings(JOBS_EAGER=False):
+            self.client.post(reverse('event_create'), data)
+        event = Event.objects.get(title='Offsite')
+        self.assertEqual(set(event.participants.all()), {boss, guest})
+
+
+class EventQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.management = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.member = User.objects.create(username='member')
+        self.creators = User.objects.bulk_create(User(username=f'creator{i}') for i in range(5))
+        self.event = Event.objects.create(title='All hands', start_datetime=timezone.now(), created_by=self.management)
+
+    def grow_invitations(self, n):
+        """Brings the member's invitations, each to its own event, up to n."""
+        have = Invitation.objects.filter(invitee=self.member).count()
+        now = timezone.now()
+        events = Event.objects.bulk_create(
+            Event(
+                title=f'Event {i}', start_datetime=now + datetime.timedelta(hours=i),
+                effective_end=now + datetime.timedelta(hours=i + 1), created_by=self.creators[i % len(self.creators)],
+            )
+            for i in range(have, n)
+        )
+        Invitation.objects.bulk_create(Invitation(event=event, invitee=self.member) for event in events)
+
+    def grow_participants(self, n):
+        have = self.event.participants.count()
+        invitees = User.objects.bulk_create(User(username=f'guest{i}') for i in range(have, n))
+        Invitation.objects.bulk_create(Invitation(event=self.event, invitee=invitee) for invitee in invitees)
+
+    def test_event_list(self):
+        self.client.force_login(self.member)
+        self.assertQueryBudget(reverse('event_list'), self.grow_invitations, budget=3)
+
+    def test_event_detail(self):
+        self.client.force_login(self.management)
+        self.assertQueryBudget(reverse('event_detail', args=[self.event.pk]), self.grow_participants, budget=4)
+
+    def test_my_events(self):
+        self.client.force_login(self.member)
+        self.assertQueryBudget(reverse('my_events'), self.grow_invitations, budget=4)
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        # A Monday
+        self.day = datetime.datetime(2026, 10, 19, tzinfo=datetime.timezone.utc)
+        event = Event.objects.create(
+            title='Review', start_datetime=self.at(9), end_datetime=self.at(10, 30),
+        )
+        Invitation.objects.create(event=event, invitee=self.alice)
+        meeting = Meeting.objects.create(title='Sync', meeting_time=self.at(10, 30), duration=60)
+        meeting.participants.add(self.bob)
+
+    def at(self, hour, minute=0, days=0):
+        return self.day + datetime.timedelta(days=days, hours=hour, minutes=minute)
+
+    def test_first_slot_follows_everyones_commitments(self):
+        slots = availability.free_slots(
+            [self.alice.pk, self.bob.pk], datetime.timedelta(hours=1), self.at(8), self.at(0, days=7), limit=2,
+        )
+        self.assertEqual(slots, [(self.at(11, 30), self.at(17)), (self.at(9, days=1), self.at(17, days=1))])
+
+    def test_weekends_and_short_gaps_are_skipped(self):
+        Meeting.objects.create(title='Late', meeting_time=self.at(11, 45, days=4), duration=300).participants.add(self.bob)
+        slots = availability.free_slots(
+            [self.bob.pk], datetime.timedelta(hours=2), self.at(11, days=4), self.at(0, days=8), limit=1,
+        )
+        self.assertEqual(slots, [(self.at(9, days=7), self.at(17, days=7))])
+
+    def test_busy_intervals_are_one_query(self):
+        with self.assertNumQueries(1):
+            busy = availability.busy_intervals([self.alice.pk, self.bob.pk], self.at(0), self.at(0, days=1))
+        self.assertEqual(sorted(busy), [(self.at(9), self.at(10, 30)), (self.at(10, 30), self.at(11, 30))])
+
+    def test_repeating_commitments_block_every_occurrence(self):
+        standup = Meeting.objects.create(
+            title='Standup', meeting_time=self.at(13, days=-7), duration=30, recurrence='FREQ=DAILY',
+        )
+        standup.participants.add(self.alice)
+        standup.change_occurrence(self.at(13, days=1), 'cancel')
+        busy = availability.busy_intervals([self.alice.pk], self.at(0), self.at(0, days=2))
+        self.assertEqual(sorted(busy), [(self.at(9), self.at(10, 30)), (self.at(13), self.at(13, 30))])
+
+    def test_endpoint_is_for_privileged_users(self):
+        boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        url = reverse('availability_slots')
+        params = {'participants': [self.alice.pk, self.bob.pk], 'duration': 60}
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+
+        self.client.force_login(boss)
+        data = self.client.get(url, {**params, 'limit': 3}).json()
+        self.assertEqual(data['duration'], 60)
+        self.assertEqual(len(data['slots']), 3)
+        self.assertEqual(self.client.get(url, {'duration': 45}).status_code, 400)
@@ -4,9 +4,15 @@ from . import views
 urlpatterns = [
     path('', views.event_list, name='event_list'),
     path('my-events/', views.my_events, name='my_events'),
+    path('my-events.json', views.my_events_json, name='my_events_json'),
+    path('feed/regenerate/', views.regenerate_feed_token, name='regenerate_feed_token'),
+    path('feed/<str:token>/events.ics', views.calendar_feed, {'fmt': 'ics'}, name='calendar_feed_ics'),
+    path('feed/<str:token>/events.json', views.calendar_feed, {'fmt': 'json'}, name='calendar_feed_json'),
+    path('availability.json', views.availability_slots, name='availability_slots'),
     path('new/', views.event_create, name='event_create'),
     path('<int:pk>/', views.event_detail, name='event_detail'),
     path('<int:pk>/edit/', views.event_update, name='event_update'), 
     path('<int:pk>/delete/', views.event_delete, name='event_delete'),
+    path('<int:pk>/occurrence/', views.event_occurrence, name='event_occurrence'),
     path('invitation/<int:invitation_pk>/respond/<str:response>/', views.respond_to_invitation, name='respond_to_invitation'),
 ]
\ No newline at end of file
@@ -1,20 +1,53 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Q
 from .models import Event, Invitation
-from .forms import EventForm
+from .forms import AvailabilityForm, EventForm
+from .conflicts import find_conflicts
+from live import broker
+from core import deletion
 from core.utils import is_privileged_user
+from core.pagination import paginate_keyset
+from core.views import change_occurrence, occurrence_context
 from django.core.exceptions import PermissionDenied
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils import timezone
+import datetime
+from . import availability, feeds, queries
 
 @login_required
 def event_list(request):
-    events = Event.objects.all().order_by('start_datetime')
-    context = {'events': events}
+    context = {'events': paginate_keyset(request, queries.event_list(request.user))}
     return render(request, 'events/event_list.html', context)
 
+def _save_new_event(form, creator):
+    """Saves the event with the invitations for its participants and its creator, in one transaction."""
+    with transaction.atomic():
+        event = form.save(commit=False)
+        event.created_by = creator
+        event.save()
+        form.save_m2m()
+        event.participants.add(creator)
+    return event
+
+def _form_conflicts(form, exclude_event=None):
+    """Conflicts for the event in a valid EventForm, over every occurrence when it repeats."""
+    start_time = form.cleaned_data.get('start_datetime')
+    return find_conflicts(
+        form.cleaned_data.get('participants') or [],
+        start_time,
+        Event.effective_end_for(start_time, form.cleaned_data.get('end_datetime')),
+        exclude_event=exclude_event,
+        rule=form.cleaned_data.get('recurrence') or '',
+        until=form.cleaned_data.get('recurrence_until'),
+    )
+
 @login_required
 def event_create(request):
     if not is_privileged_user(request.user):
@@ -26,45 +59,24 @@ def event_create(request):
             
             # If the user confirms creation from the modal
             if 'force_create' in request.POST:
-                event = form.save(commit=False)
-                event.created_by = request.user
-                event.save()
-                form.save_m2m() # Save participants
-                event.participants.add(request.user) # Add creator as a participant
+                event = _save_new_event(form, request.user)
                 messages.success(request, f"Event '{event.title}' was created despite conflicts.")
                 return redirect('event_list')
 
             # Initial submission: Check for conflicts
-            participants = form.cleaned_data.get('participants')
-            start_time = form.cleaned_data.get('start_datetime')
-            end_time = form.cleaned_data.get('end_datetime') or start_time
-            
-            conflicting_managers = []
-            if participants:
-                for person in participants:
-                    conflicts = Event.objects.filter(
-                        participants=person,
-                        start_datetime__lt=end_time,
-                        end_datetime__gt=start_time
-                    ).exists()
-                    if conflicts:
-                        conflicting_managers.append(person.username)
+            conflicts = _form_conflicts(form)
             
-            if conflicting_managers:
+            if conflicts:
                 # Conflicts found, re-render the form with a warning modal
                 context = {
                     'form': form,
                     'conflict_warning': True,
-                    'conflicting_managers': conflicting_managers,
+                    'conflicts': conflicts,
                 }
                 return render(request, 'events/event_form.html', context)
             else:
                 # No conflicts, create the event directly
-                event = form.save(commit=False)
-                event.created_by = request.user
-                event.save()
-                form.save_m2m()
-                event.participants.add(request.user) # Add creator as a participant
+                event = _save_new_event(form, request.user)
                 messages.success(request, f"Event '{event.title}' was created successfully.")
                 return redirect('event_list')
         else:
@@ -76,8 +88,9 @@ def event_create(request):
 
 @login_required
 def event_detail(request, pk):
-    event = get_object_or_404(Event, pk=pk)
-    context = {'event': event}
+    events = Event.objects.visible_to(request.user).select_related('created_by').prefetch_related('participants')
+    event = get_object_or_404(events, pk=pk)
+    context = {'event': event, 'is_privileged': is_privileged_user(request.user), **occurrence_context(event)}
     return render(request, 'events/event_detail.html', context)
 
 @login_required
@@ -91,27 +104,14 @@ def event_update(request, pk):
         if form.is_valid():
             # Similar conflict check as in event_create
             if 'force_create' not in request.POST:
-                participants = form.cleaned_data.get('participants')
-                start_time = form.cleaned_data.get('start_datetime')
-                end_time = form.cleaned_data.get('end_datetime') or start_time
-                
-                conflicting_managers = []
-                if participants:
-                    for person in participants:
-                        conflicts = Event.objects.filter(
-                            participants=person,
-                            start_datetime__lt=end_time,
-                            end_datetime__gt=start_time
-                        ).exclude(pk=event.pk).exists()
-                        if conflicts:
-                            conflicting_managers.append(person.username)
-
-                if conflicting_managers:
+                conflicts = _form_conflicts(form, exclude_event=event)
+
+                if conflicts:
                     context = {
                         'form': form,
                         'event': event,
                         'conflict_warning': True,
-                        'conflicting_managers': conflicting_managers,
+                        'conflicts': conflicts,
                     }
                     return render(request, 'events/event_form.html', context)
             
@@ -129,27 +129,41 @@ def event_delete(request, pk):
     if not is_privileged_user(request.user):
         raise PermissionDenied
     event = get_object_or_404(Event, pk=pk)
-    event.delete()
+    deletion.delete_event(event)
     messages.success(request, f"Event '{event.title}' has been deleted.")
     return redirect('event_list')
 
+@login_required
+@require_POST
+def event_occurrence(request, pk):
+    if not is_privileged_user(request.user):
+        raise PermissionDenied
+    event = get_object_or_404(Event.objects.exclude(recurrence=''), pk=pk)
+    change_occurrence(request, event)
+    return redirect('event_detail', pk=event.pk)
+
 @login_required
 def my_events(request):
-    invitations = Invitation.objects.filter(invitee=request.user).select_related('event')
-    pending_invitations = invitations.filter(status=Invitation.StatusChoices.PENDING).count()
-    accepted_invitations = invitations.filter(status=Invitation.StatusChoices.ACCEPTED).count()
+    invitations = queries.my_invitations(request.user)
+    counts = invitations.queryset.aggregate(
+        pending_count=Count('pk', filter=Q(status=Invitation.StatusChoices.PENDING)),
+        accepted_count=Count('pk', filter=Q(status=Invitation.StatusChoices.ACCEPTED)),
+        total_invitations=Count('pk'),
+    )
     context = {
-        'invitations': invitations.order_by('event__start_datetime'),
-        'pending_count': pending_invitations,
-        'accepted_count': accepted_invitations,
-        'total_invitations': invitations.count(),
+        'invitations': paginate_keyset(request, invitations),
+        **counts,
+        'feed_url': request.build_absolute_uri(reverse('calendar_feed_ics', args=[feeds.feed_token(request.user)])),
     }
     return render(request, 'events/my_events.html', context)
 
 @login_required
 @require_POST
 def respond_to_invitation(request, invitation_pk, response):
-    invitation = get_object_or_404(Invitation, pk=invitation_pk, invitee=request.user)
+    invitation = get_object_or_404(
+        Invitation.objects.select_related('event'), pk=invitation_pk, invitee=request.user, event__deleted_at__isnull=True,
+    )
+    previous_status = invitation.status
     
     if response == 'accept':
         invitation.status = Invitation.StatusChoices.ACCEPTED
@@ -159,18 +173,86 @@ def respond_to_invitation(request, invitation_pk, response):
         messages.warning(request, f"You have declined the invitation for '{invitation.event.title}'.")
     
     invitation.save()
+    if invitation.status != previous_status:
+        broker.publish('invitation.status', {
+            'invitation': invitation.pk,
+            'event': invitation.event_id,
+            'event_title': invitation.event.title,
+            'invitee': request.user.username,
+            'status': invitation.status,
+            'previous_status': previous_status,
+        }, user_ids=[request.user.pk, invitation.event.created_by_id], broadcast=True)
     return redirect('my_events')
 
+def _feed_response(request, user, fmt):
+    """Serves a user's accepted events as JSON or iCalendar, answering 304 from the invitation stamp alone."""
+    start, end = feeds.date_range(request.GET)
+    etag, last_modified = feeds.feed_validators(user, start, end, fmt)
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=f'"{etag}"', last_modified=last_modified)
+
+    if response is None:
+        invitations = feeds.feed_invitations(user, start, end)
+        if fmt == 'ics':
+            content = feeds.events_ics(
+                invitations,
+                calendar_name=f"{user.get_full_name() or user.username}'s events",
+                host=request.get_host(),
+                build_url=lambda event: request.build_absolute_uri(reverse('event_detail', args=[event.pk])),
+            )
+            response = HttpResponse(content, content_type='text/calendar; charset=utf-8')
+        else:
+            response = JsonResponse(feeds.events_json(invitations, start, end), safe=False)
+
+    response['ETag'] = f'"{etag}"'
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 @login_required
 def my_events_json(request):
-    invitations = Invitation.objects.filter(invitee=request.user, status=Invitation.StatusChoices.ACCEPTED).select_related('event')
-    events_data = []
-    for invitation in invitations:
-        event = invitation.event
-        events_data.append({
-            "title": event.title,
-            "start": event.start_datetime.isoformat(),
-            "end": event.end_datetime.isoformat() if event.end_datetime else None,
-        })
-    return JsonResponse(events_data, safe=False)
+    return _feed_response(request, request.user, 'json')
+
+@login_required
+@require_POST
+def regenerate_feed_token(request):
+    feeds.revoke_feed_token(request.user)
+    messages.success(request, "Your calendar link was reset. Subscriptions using the old link will stop updating.")
+    return redirect('my_events')
+
+def calendar_feed(request, token, fmt):
+    user = feeds.user_for_token(token)
+    if user is None:
+        raise Http404
+    return _feed_response(request, user, fmt)
+
+@login_required
+def availability_slots(request):
+    """The earliest common free slots of the given participants, for the scheduling forms."""
+    if not is_privileged_user(request.user):
+        raise PermissionDenied
+    form = AvailabilityForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    data = form.cleaned_data
+    window_start = timezone.now()
+    if data['start']:
+        day_start = timezone.make_aware(datetime.datetime.combine(data['start'], datetime.time()))
+        window_start = max(window_start, day_start)
+    window_end = window_start + datetime.timedelta(days=data['days'] or 14)
+    duration = datetime.timedelta(minutes=data['duration'])
 
+    slots = availability.free_slots(
+        [user.pk for user in data['participants']], duration, window_start, window_end,
+        limit=data['limit'] or 5, exclude_event=data['exclude_event'], exclude_meeting=data['exclude_meeting'],
+    )
+    return JsonResponse({'duration': data['duration'], 'slots': [
+        {
+            'start': timezone.localtime(start).isoformat(),
+            'end': timezone.localtime(start + duration).isoformat(),
+            'free_until': timezone.localtime(free_until).isoformat(),
+        }
+        for start, free_until in slots
+    ]})
@@ -0,0 +1,10 @@
+# jobs/admin.py
+
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'duration_ms', 'created_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('started_at', 'finished_at', 'duration_ms', 'locked_by', 'locked_at', 'last_error')
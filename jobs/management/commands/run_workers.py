@@ -0,0 +1,54 @@
+import multiprocessing
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs import worker
+
+
+class Command(BaseCommand):
+    help = "Runs background job workers until interrupted (or, with --burst, until the queue is empty)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help="Number of worker processes to run.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help="Seconds after which a RUNNING job is assumed lost and requeued.")
+        parser.add_argument('--burst', action='store_true', help="Run every due job once, then exit.")
+
+    def handle(self, *args, **options):
+        if options['processes'] < 1:
+            raise CommandError("--processes must be at least 1.")
+
+        if options['burst']:
+            count = worker.run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} job(s)."))
+            return
+
+        # Workers are forked, so every process gets the loaded project
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        work_options = {
+            'poll_interval': options['poll_interval'],
+            'stale_after': timedelta(seconds=options['stale_after']),
+        }
+        if options['processes'] == 1:
+            worker.work(stop, **work_options)
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        processes = [
+            context.Process(target=worker.work, args=(stop,), kwargs=work_options, daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} workers; stop with Ctrl+C.")
+        for process in processes:
+            process.join()
@@ -0,0 +1,42 @@
+# jobs/queue.py
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Job
+
+_registry = {}
+
+
+def job(func=None, *, name=None):
+    """Registers a function as a job. Its keyword arguments become the job payload, so keep them JSON-friendly."""
+    def register(func):
+        func.job_name = name or f'{func.__module__}.{func.__name__}'
+        _registry[func.job_name] = func
+        return func
+    return register(func) if func is not None else register
+
+
+def get_job_function(name):
+    return _registry[name]
+
+
+def enqueue(func, *, run_after=None, max_attempts=3, **payload):
+    """
+    Queues `func(**payload)` for a worker and returns the Job. When enqueued
+    inside a transaction the job only becomes visible once it commits.
+
+    With settings.JOBS_EAGER the job is run in-process right after the
+    current transaction commits instead, which keeps development servers
+    working without a separate worker.
+    """
+    job = Job.objects.create(
+        name=getattr(func, 'job_name', func),
+        payload=payload,
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts,
+    )
+    if getattr(settings, 'JOBS_EAGER', False):
+        from .worker import run_now
+        transaction.on_commit(lambda: run_now(job.pk))
+    return job
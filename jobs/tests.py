@@ -0,0 +1,75 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import enqueue, job
+from . import worker
+
+calls = []
+
+
+@job(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@job(name='tests.explode')
+def explode():
+    raise RuntimeError("boom")
+
+
+@override_settings(JOBS_EAGER=False)
+class WorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_run_pending_runs_due_jobs_and_records_timing(self):
+        enqueued = enqueue(record, value=1)
+        enqueue(record, value=2, run_after=timezone.now() + datetime.timedelta(hours=1))
+
+        self.assertEqual(worker.run_pending(), 1)
+        self.assertEqual(calls, [1])
+        enqueued.refresh_from_db()
+        self.assertEqual(enqueued.status, Job.StatusChoices.SUCCEEDED)
+        self.assertEqual(enqueued.attempts, 1)
+        self.assertIsNotNone(enqueued.duration_ms)
+
+    def test_a_job_is_claimed_once(self):
+        enqueue(record, value=1)
+        self.assertIsNotNone(worker.claim('a'))
+        self.assertIsNone(worker.claim('b'))
+
+    def test_failures_back_off_then_fail(self):
+        failing = enqueue(explode, max_attempts=2)
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            worker.run_pending()
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, Job.StatusChoices.PENDING)
+        self.assertIn('RuntimeError: boom', failing.last_error)
+        self.assertGreater(failing.run_after, timezone.now() + datetime.timedelta(seconds=worker.backoff(1) - 5))
+
+        Job.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            worker.run_pending()
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, Job.StatusChoices.FAILED)
+        self.assertEqual(failing.attempts, 2)
+
+    def test_stale_running_jobs_are_requeued(self):
+        enqueue(record, value=1)
+        claimed = worker.claim('lost')
+        Job.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(worker.requeue_stale(datetime.timedelta(minutes=10)), 1)
+        self.assertEqual(worker.run_pending(), 1)
+
+
+@override_settings(JOBS_EAGER=True)
+class EagerJobTests(TestCase):
+    def test_eager_jobs_run_after_commit(self):
+        calls.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(record, value='now')
+        self.assertEqual(calls, ['now'])
+        self.assertEqual(Job.objects.get().status, Job.StatusChoices.SUCCEEDED)
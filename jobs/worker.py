@@ -0,0 +1,138 @@
+# jobs/worker.py
+
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+from .queue import get_job_function
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def backoff(attempts):
+    """Seconds to wait before retrying a job that has failed `attempts` times."""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _claim_pk(pk, worker, now):
+    # Only one worker can flip a given row out of PENDING
+    claimed = Job.objects.filter(pk=pk, status=Job.StatusChoices.PENDING).update(
+        status=Job.StatusChoices.RUNNING,
+        locked_by=worker,
+        locked_at=now,
+        started_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return Job.objects.get(pk=pk) if claimed else None
+
+
+def claim(worker, now=None):
+    """Claims the next due job for `worker`, or returns None when there is nothing to do."""
+    now = now or timezone.now()
+    pending = Job.objects.filter(status=Job.StatusChoices.PENDING, run_after__lte=now).order_by('run_after', 'pk')
+
+    if connection.features.has_select_for_update_skip_locked:
+        # Rows locked by other workers are skipped rather than waited on
+        with transaction.atomic():
+            job = pending.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            return _claim_pk(job.pk, worker, now)
+
+    # No row locks (SQLite): the conditional update above is the lock, and a
+    # worker that loses the race for a row just tries the next one
+    for pk in pending.values_list('pk', flat=True)[:10]:
+        job = _claim_pk(pk, worker, now)
+        if job is not None:
+            return job
+    return None
+
+
+def run(job):
+    """Runs a claimed job, recording its timing and scheduling a retry on failure."""
+    started = time.perf_counter()
+    try:
+        with transaction.atomic():
+            get_job_function(job.name)(**job.payload)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s of %s)", job, job.attempts, job.max_attempts)
+        error = traceback.format_exc()
+        finished_at = timezone.now()
+        if job.attempts < job.max_attempts:
+            status, run_after = Job.StatusChoices.PENDING, finished_at + timedelta(seconds=backoff(job.attempts))
+        else:
+            status, run_after = Job.StatusChoices.FAILED, job.run_after
+    else:
+        error, finished_at = '', timezone.now()
+        status, run_after = Job.StatusChoices.SUCCEEDED, job.run_after
+
+    Job.objects.filter(pk=job.pk).update(
+        status=status,
+        run_after=run_after,
+        last_error=error,
+        finished_at=finished_at,
+        duration_ms=(time.perf_counter() - started) * 1000,
+        locked_by='',
+        locked_at=None,
+    )
+    return status
+
+
+def run_now(pk):
+    """Claims and runs one specific job in this process (used for JOBS_EAGER)."""
+    job = _claim_pk(pk, 'eager', timezone.now())
+    return run(job) if job is not None else None
+
+
+def requeue_stale(older_than):
+    """Returns jobs whose worker died mid-run to the queue (or fails them if out of attempts)."""
+    cutoff = timezone.now() - older_than
+    stale = Job.objects.filter(status=Job.StatusChoices.RUNNING, locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.StatusChoices.FAILED, locked_by='', locked_at=None, last_error='Worker lost while running',
+    )
+    requeued = stale.update(status=Job.StatusChoices.PENDING, locked_by='', locked_at=None)
+    return requeued + failed
+
+
+def run_pending(worker=None, limit=None):
+    """Runs due jobs until the queue is empty (or `limit` jobs have run). Returns how many ran."""
+    worker = worker or worker_id()
+    count = 0
+    while limit is None or count < limit:
+        job = claim(worker)
+        if job is None:
+            break
+        run(job)
+        count += 1
+    return count
+
+
+def work(stop, poll_interval=1.0, stale_after=timedelta(minutes=10)):
+    """Worker loop: runs jobs as they become due until `stop` (a threading/multiprocessing Event) is set."""
+    worker = worker_id()
+    logger.info("Worker %s started", worker)
+    last_sweep = 0.0
+    while not stop.is_set():
+        if time.monotonic() - last_sweep > stale_after.total_seconds() / 2:
+            requeue_stale(stale_after)
+            last_sweep = time.monotonic()
+        job = claim(worker)
+        if job is None:
+            stop.wait(poll_interval)
+        else:
+            run(job)
+    logger.info("Worker %s stopped", worker)
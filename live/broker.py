@@ -0,0 +1,53 @@
+# live/broker.py
+
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Q
+from django.utils import timezone
+from core.utils import PRIVILEGED_USERS
+from .models import ChangeNotice
+
+# How long a disconnected browser can catch up through Last-Event-ID
+RETENTION = timedelta(hours=1)
+# Each process sweeps out expired notices at most this often, on publish
+PRUNE_INTERVAL = 300
+
+_last_prune = None
+
+
+def publish(kind, payload, user_ids=(), broadcast=False):
+    """
+    Records a change for the given users (and, with `broadcast`, for every
+    privileged user). Subscribers pick it up on their next poll; inside a
+    transaction that is only once it commits.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if broadcast and user_ids:
+        # Privileged users already get the broadcast copy
+        user_ids = get_user_model().objects.filter(pk__in=user_ids).exclude(PRIVILEGED_USERS).values_list('pk', flat=True)
+    notices = [ChangeNotice(user_id=user_id, kind=kind, payload=payload) for user_id in user_ids]
+    if broadcast:
+        notices.append(ChangeNotice(kind=kind, payload=payload))
+    ChangeNotice.objects.bulk_create(notices)
+    # Opportunistic pruning keeps the table small without a scheduled job
+    global _last_prune
+    now = time.monotonic()
+    if notices and (_last_prune is None or now - _last_prune >= PRUNE_INTERVAL):
+        _last_prune = now
+        ChangeNotice.objects.filter(created_at__lt=timezone.now() - RETENTION).delete()
+
+
+def latest_id():
+    return ChangeNotice.objects.aggregate(latest=Max('pk'))['latest'] or 0
+
+
+def poll(user_id, privileged, after_id, limit=100):
+    """Notices for the user newer than `after_id`, oldest first."""
+    audience = Q(user_id=user_id)
+    if privileged:
+        audience |= Q(user__isnull=True)
+    return list(
+        ChangeNotice.objects.filter(audience, pk__gt=after_id, created_at__gte=timezone.now() - RETENTION)
+        .order_by('pk')[:limit]
+    )
@@ -0,0 +1,23 @@
+# live/models.py
+
+from django.conf import settings
+from django.db import models
+
+
+class ChangeNotice(models.Model):
+    """A change pushed to live subscribers. Notices without a user go to every privileged user."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='+'
+    )
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Subscribers poll for "my notices after id N"
+            models.Index(fields=['user', 'id'], name='changenotice_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk}"
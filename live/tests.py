@@ -0,0 +1,72 @@
+import asyncio
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import Meeting, Task
+from . import broker
+from .models import ChangeNotice
+
+
+class BrokerTests(TestCase):
+    def setUp(self):
+        self.boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+
+    def test_broadcasts_reach_privileged_users_once(self):
+        start = broker.latest_id()
+        broker.publish('task.status', {'task': 1}, user_ids=[self.alice.pk, self.boss.pk], broadcast=True)
+        self.assertEqual(len(broker.poll(self.boss.pk, True, start)), 1)
+        self.assertEqual(len(broker.poll(self.alice.pk, False, start)), 1)
+        self.assertEqual(broker.poll(self.bob.pk, False, start), [])
+
+    def expired_notice(self):
+        notice = ChangeNotice.objects.create(kind='task.status', user=self.alice)
+        ChangeNotice.objects.filter(pk=notice.pk).update(created_at=timezone.now() - broker.RETENTION * 2)
+        return ChangeNotice.objects.filter(pk=notice.pk)
+
+    @mock.patch.object(broker, '_last_prune', None)
+    def test_expired_notices_are_pruned_on_a_timer(self):
+        expired = self.expired_notice()
+        broker.publish('task.status', {'task': 1}, user_ids=[self.alice.pk])
+        self.assertFalse(expired.exists())
+
+        expired = self.expired_notice()
+        broker.publish('task.status', {'task': 2}, user_ids=[self.alice.pk])
+        self.assertTrue(expired.exists())
+        later = broker._last_prune + broker.PRUNE_INTERVAL
+        with mock.patch('live.broker.time.monotonic', return_value=later):
+            broker.publish('task.status', {'task': 3}, user_ids=[self.alice.pk])
+        self.assertFalse(expired.exists())
+
+    def test_task_update_publishes_status_change(self):
+        task = Task.objects.create(title='Ship', meeting=Meeting.objects.create(title='Plan'), owner=self.alice)
+        self.client.force_login(self.alice)
+        self.client.post(reverse('task_update', args=[task.pk]), {
+            'title': 'Ship', 'status': Task.StatusChoices.COMPLETED, 'priority': task.priority,
+        })
+        notice = ChangeNotice.objects.get(user=self.alice)
+        self.assertEqual(notice.kind, 'task.status')
+        self.assertEqual(notice.payload['previous_status'], Task.StatusChoices.PENDING)
+        self.assertEqual(notice.payload['status'], Task.StatusChoices.COMPLETED)
+
+
+class StreamTests(TransactionTestCase):
+    # The stream reads from another thread, so the data has to be committed
+
+    def test_stream_resumes_after_last_event_id(self):
+        alice = User.objects.create(username='alice')
+        first = broker.latest_id()
+        broker.publish('invitation.status', {'invitation': 7}, user_ids=[alice.pk])
+        self.client.force_login(alice)
+        response = self.client.get(reverse('live_stream'), HTTP_LAST_EVENT_ID=str(first))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        async def read():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        body = asyncio.run(read()).decode()
+        self.assertIn('event: invitation.status\ndata: {"invitation":7}', body)
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from core.utils import is_privileged_user
+from . import broker
+
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15
+# Streams are closed periodically; the browser reconnects with Last-Event-ID
+MAX_STREAM_SECONDS = 300
+RETRY_MS = 3000
+
+
+def _format(notice):
+    data = json.dumps(notice.payload, separators=(',', ':'))
+    return f"id: {notice.pk}\nevent: {notice.kind}\ndata: {data}\n\n"
+
+
+@login_required
+async def stream(request):
+    """
+    Server-sent events for the signed-in user. Under ASGI the connection
+    stays open and polls the notice table; under WSGI each request sends
+    what is pending and closes, and EventSource's retry turns that into
+    long polling.
+    """
+    user = await request.auser()
+    privileged = is_privileged_user(user)
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET['last_id'])
+    except (KeyError, ValueError):
+        last_id = await sync_to_async(broker.latest_id)()
+    keep_open = isinstance(request, ASGIRequest)
+
+    async def events():
+        nonlocal last_id
+        yield f"retry: {RETRY_MS}\n\n"
+        started = last_beat = time.monotonic()
+        while True:
+            notices = await sync_to_async(broker.poll)(user.pk, privileged, last_id)
+            for notice in notices:
+                yield _format(notice)
+                last_id = notice.pk
+            if not keep_open or time.monotonic() - started > MAX_STREAM_SECONDS:
+                return
+            if time.monotonic() - last_beat > HEARTBEAT_INTERVAL:
+                yield ": ping\n\n"
+                last_beat = time.monotonic()
+            await asyncio.sleep(POLL_INTERVAL)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,30 @@
+# metrics/backends.py
+
+import time
+from django.template.backends.django import DjangoTemplates, Template
+from .probe import current
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        probe = current.get()
+        # A template rendered from inside another one is not counted twice
+        if probe is None or probe.rendering:
+            return super().render(context, request)
+        probe.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            probe.render_time += time.perf_counter() - start
+            probe.rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing top-level renders of the requests the metrics middleware samples."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
@@ -0,0 +1,82 @@
+# metrics/middleware.py
+
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from .probe import Probe, current
+from .registry import registry
+
+EXCLUDED_VIEWS = {'metrics'}
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count and time, template render time and
+    response size per URL name for a METRICS_SAMPLE_RATE fraction of
+    requests. Unsampled requests cost one random() call.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        rate = settings.METRICS_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        probe = Probe()
+        token = current.set(probe)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(probe))
+                start = time.perf_counter()
+                response = self.get_response(request)
+                duration = time.perf_counter() - start
+        finally:
+            current.reset(token)
+        self._record(request, response, duration, probe)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        # Queries in async views run on sync_to_async threads, outside a wrapper
+        # installed here, so only latency, rendering and size are recorded
+        probe = Probe()
+        token = current.set(probe)
+        try:
+            start = time.perf_counter()
+            response = await self.get_response(request)
+            duration = time.perf_counter() - start
+        finally:
+            current.reset(token)
+        self._record(request, response, duration, probe)
+        return response
+
+    def _record(self, request, response, duration, probe):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unresolved>'
+        if view in EXCLUDED_VIEWS:
+            return
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(
+            view, request.method, response.status_code, duration,
+            probe.queries, probe.query_time, probe.render_time, size,
+            weight=1 / min(settings.METRICS_SAMPLE_RATE, 1),
+        )
+        registry.flush(settings.METRICS_DIR, interval=settings.METRICS_FLUSH_INTERVAL)
@@ -0,0 +1,29 @@
+# metrics/probe.py
+
+import time
+from contextvars import ContextVar
+
+# The probe of the request being measured in this context, if it was sampled
+current = ContextVar('metrics_probe', default=None)
+
+
+class Probe:
+    """
+    Collects SQL and template timings for one request. It is installed as a
+    connection execute_wrapper; TimedDjangoTemplates adds the render time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.rendering = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
@@ -0,0 +1,233 @@
+# metrics/registry.py
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: files of exited processes are left in place
+    fcntl = None
+
+# Latency buckets in seconds, as in the Prometheus client defaults
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+TOTALS = ('count', 'duration', 'queries', 'query_time', 'render_time', 'response_bytes')
+
+# Totals of processes that have exited, so the summed counters never go backwards
+RETIRED = 'retired.json'
+
+
+def _new_series():
+    return {
+        'buckets': [0.0] * (len(BUCKETS) + 1),  # the last slot is +Inf
+        'status': {},
+        **dict.fromkeys(TOTALS, 0.0),
+    }
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, text):
+    # Write-then-rename so readers never see a partial file
+    handle, temporary = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(handle, 'w') as file:
+        file.write(text)
+    os.replace(temporary, path)
+
+
+def _merge(merged, series_by_key):
+    for key, series in series_by_key.items():
+        target = merged[key]
+        target['buckets'] = [a + b for a, b in zip(target['buckets'], series['buckets'])]
+        for status, count in series['status'].items():
+            target['status'][status] = target['status'].get(status, 0.0) + count
+        for field in TOTALS:
+            target[field] += series[field]
+
+
+class Registry:
+    """
+    Per-process request statistics, keyed by "view|method". Each process
+    writes its cumulative state to its own file in `directory`, and the
+    metrics endpoint sums every file, so counts survive across gunicorn
+    workers without shared memory.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = defaultdict(_new_series)
+        self.last_flush = 0.0
+        self._pid = self._filename = None
+
+    def filename(self):
+        """This process's state file, named by pid and start time so a reused pid gets a fresh file."""
+        pid = os.getpid()
+        if pid != self._pid:
+            # Also the case in a forked worker, which must not write to its parent's file
+            self._pid, self._filename = pid, f'{pid}-{time.time_ns()}.json'
+        return self._filename
+
+    def observe(self, view, method, status, duration, queries, query_time, render_time, response_bytes, weight=1.0):
+        with self.lock:
+            series = self.series[f'{view}|{method}']
+            series['buckets'][bisect_left(BUCKETS, duration)] += weight
+            series['status'][str(status)] = series['status'].get(str(status), 0.0) + weight
+            for field, value in (
+                ('count', 1), ('duration', duration), ('queries', queries), ('query_time', query_time),
+                ('render_time', render_time), ('response_bytes', response_bytes),
+            ):
+                series[field] += value * weight
+
+    def flush(self, directory, interval=0.0):
+        """Writes this process's state to its file, at most once per `interval` seconds."""
+        now = time.monotonic()
+        if now - self.last_flush < interval:
+            return
+        with self.lock:
+            data = json.dumps(self.series)
+            self.last_flush = now
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        _write(directory / self.filename(), data)
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+            self.last_flush = 0.0
+
+
+registry = Registry()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # running as another user
+        pass
+    return True
+
+
+@contextmanager
+def _locked(directory):
+    """Serializes collectors, so a retired file is never counted twice or missed."""
+    if fcntl is None:
+        yield
+        return
+    with open(directory / '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _retire_exited(directory):
+    """
+    Folds the files of processes that have exited into RETIRED and deletes
+    them, keeping the directory to one file per live process. A pid's older
+    files belong to processes that exited before the pid was reused.
+    """
+    if fcntl is None:
+        return
+    files, newest = [], {}
+    for path in directory.glob('*.json'):
+        pid, _, started = path.stem.partition('-')
+        # Files named by pid alone predate start times
+        started = started or '0'
+        if not (pid.isdigit() and started.isdigit()):
+            continue
+        pid, started = int(pid), int(started)
+        files.append((pid, started, path))
+        newest[pid] = max(newest.get(pid, started), started)
+    exited = [path for pid, started, path in files if started < newest[pid] or not _alive(pid)]
+    if not exited:
+        return
+    retired = defaultdict(_new_series, _read(directory / RETIRED) or {})
+    for path in exited:
+        _merge(retired, _read(path) or {})
+    _write(directory / RETIRED, json.dumps(retired))
+    for path in exited:
+        path.unlink(missing_ok=True)
+
+
+def collect(directory):
+    """Sums the state files of every process that has written to `directory`, including exited ones."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    merged = defaultdict(_new_series)
+    with _locked(directory):
+        _retire_exited(directory)
+        for path in directory.glob('*.json'):
+            _merge(merged, _read(path) or {})
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(merged, sample_rate):
+    """Formats merged series in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    ordered = sorted(merged.items())
+
+    metric('django_http_request_duration_seconds', 'histogram', 'Request latency by view.')
+    for key, series in ordered:
+        view, method = key.split('|', 1)
+        cumulative = 0.0
+        for bound, count in zip((*BUCKETS, '+Inf'), series['buckets']):
+            cumulative += count
+            lines.append(
+                f'django_http_request_duration_seconds_bucket{{{_labels(view=view, method=method, le=bound)}}} '
+                f'{_number(cumulative)}'
+            )
+        lines.append(f'django_http_request_duration_seconds_sum{{{_labels(view=view, method=method)}}} '
+                     f'{_number(series["duration"])}')
+        lines.append(f'django_http_request_duration_seconds_count{{{_labels(view=view, method=method)}}} '
+                     f'{_number(series["count"])}')
+
+    metric('django_http_responses_total', 'counter', 'Responses by view and status code.')
+    for key, series in ordered:
+        view, method = key.split('|', 1)
+        for status, count in sorted(series['status'].items()):
+            lines.append(f'django_http_responses_total{{{_labels(view=view, method=method, status=status)}}} '
+                         f'{_number(count)}')
+
+    for name, field, help_text in (
+        ('django_http_db_queries_total', 'queries', 'SQL queries run while handling requests.'),
+        ('django_http_db_query_seconds_total', 'query_time', 'Time spent in SQL queries.'),
+        ('django_http_template_render_seconds_total', 'render_time', 'Time spent rendering templates.'),
+        ('django_http_response_bytes_total', 'response_bytes', 'Bytes sent in non-streaming response bodies.'),
+    ):
+        metric(name, 'counter', help_text)
+        for key, series in ordered:
+            view, method = key.split('|', 1)
+            lines.append(f'{name}{{{_labels(view=view, method=method)}}} {_number(series[field])}')
+
+    metric('django_metrics_sample_rate', 'gauge', 'Fraction of requests instrumented; counts are scaled up by its inverse.')
+    lines.append(f'django_metrics_sample_rate {_number(sample_rate)}')
+    return '\n'.join(lines) + '\n'
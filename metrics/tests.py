@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import skipIf
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from .registry import RETIRED, _new_series, collect, fcntl, registry
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        overrides = override_settings(
+            METRICS_DIR=directory.name, METRICS_SAMPLE_RATE=1.0, METRICS_FLUSH_INTERVAL=0, METRICS_TOKEN='secret',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        registry.reset()
+        self.directory = directory.name
+        self.user = User.objects.create(username='alice')
+        self.client.force_login(self.user)
+
+    def test_records_queries_and_render_time_per_view(self):
+        self.client.get(reverse('my_tasks'))
+        series = collect(self.directory)['my_tasks|GET']
+        self.assertEqual(series['count'], 1)
+        self.assertGreater(series['queries'], 0)
+        self.assertGreater(series['render_time'], 0)
+        self.assertGreater(series['response_bytes'], 0)
+
+    @skipIf(fcntl is None, 'exited processes are only retired where fcntl is available')
+    def test_files_of_exited_processes_are_retired_without_losing_counts(self):
+        exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, text=True)
+        exited_pid = int(exited.stdout)
+        directory = Path(self.directory)
+        for name, count in ((f'{exited_pid}-1.json', 2), (f'{exited_pid}.json', 4), (f'{os.getpid()}-0.json', 3)):
+            (directory / name).write_text(json.dumps({'my_tasks|GET': {**_new_series(), 'count': count}}))
+        self.client.get(reverse('my_tasks'))
+
+        self.assertEqual(collect(self.directory)['my_tasks|GET']['count'], 10)
+        self.assertEqual(sorted(path.name for path in directory.glob('*.json')), sorted([RETIRED, registry.filename()]))
+        self.assertEqual(collect(self.directory)['my_tasks|GET']['count'], 10)
+
+    def test_endpoint_renders_prometheus_text(self):
+        self.client.get(reverse('my_tasks'))
+        self.client.logout()
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        body = response.content.decode()
+        self.assertIn('django_http_request_duration_seconds_bucket{view="my_tasks",method="GET",le="+Inf"} 1', body)
+        self.assertIn('django_http_responses_total{view="my_tasks",method="GET",status="200"} 1', body)
+        self.assertNotIn('view="metrics"', body)
+
+    def test_endpoint_requires_token_or_privileged_user(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
@@ -0,0 +1,21 @@
+import hmac
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from core.utils import is_privileged_user
+from .registry import collect, registry, render
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def metrics(request):
+    """Prometheus scrape endpoint. Needs `Authorization: Bearer <METRICS_TOKEN>` or a privileged session."""
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    authorized = bool(token) and hmac.compare_digest(authorization, f'Bearer {token}')
+    if not (authorized or is_privileged_user(request.user)):
+        raise PermissionDenied
+
+    registry.flush(settings.METRICS_DIR)
+    body = render(collect(settings.METRICS_DIR), settings.METRICS_SAMPLE_RATE)
+    return HttpResponse(body, content_type=CONTENT_TYPE)
@@ -0,0 +1,156 @@
+# search/index.py
+
+import re
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.urls import reverse
+from core.models import Meeting, Task
+from core.utils import is_privileged_user
+from events.models import Event, Invitation
+from .models import SearchDocument
+
+FTS_TABLE = 'search_searchdocument_fts'
+# Must match the expression the GIN index is built on
+PG_VECTOR = "to_tsvector('english', search_searchdocument.title || ' ' || search_searchdocument.body)"
+
+Kind = SearchDocument.Kind
+
+
+def _meeting_document(meeting):
+    return SearchDocument(
+        kind=Kind.MEETING, object_id=meeting.pk, meeting_id=meeting.pk,
+        title=meeting.title, body=meeting.get_meeting_type_display(), timestamp=meeting.meeting_time,
+    )
+
+
+def _task_document(task):
+    return SearchDocument(
+        kind=Kind.TASK, object_id=task.pk, task_id=task.pk, meeting_id=task.meeting_id, owner_id=task.owner_id,
+        title=task.title, body=task.description or '', timestamp=task.created_at,
+    )
+
+
+def _event_document(event):
+    return SearchDocument(
+        kind=Kind.EVENT, object_id=event.pk, event_id=event.pk, owner_id=event.created_by_id,
+        title=event.title, body=' '.join(filter(None, [event.description, event.location])),
+        timestamp=event.start_datetime,
+    )
+
+
+DOCUMENT_BUILDERS = {Meeting: _meeting_document, Task: _task_document, Event: _event_document}
+
+DOCUMENT_FIELDS = ['title', 'body', 'timestamp', 'meeting_id', 'task_id', 'event_id', 'owner_id']
+
+
+def index(instance):
+    """Creates or refreshes the search document for a meeting, task or event."""
+    document = DOCUMENT_BUILDERS[type(instance)](instance)
+    SearchDocument.objects.update_or_create(
+        kind=document.kind, object_id=document.object_id,
+        defaults={field: getattr(document, field) for field in DOCUMENT_FIELDS},
+    )
+
+
+def index_many(instances, batch_size=1000):
+    """Indexes objects created in bulk (bulk_create skips the signals that call index())."""
+    documents = [DOCUMENT_BUILDERS[type(instance)](instance) for instance in instances]
+    SearchDocument.objects.bulk_create(
+        documents, batch_size=batch_size,
+        update_conflicts=True, unique_fields=['kind', 'object_id'], update_fields=DOCUMENT_FIELDS,
+    )
+
+
+def reassign_tasks(task_ids, owner_id):
+    """Keeps task documents in step after their owner was changed with QuerySet.update()."""
+    SearchDocument.objects.filter(kind=Kind.TASK, object_id__in=task_ids).update(owner_id=owner_id)
+
+
+def remove(kind, object_ids):
+    """Drops the documents of objects that were soft-deleted (an ordinary delete cascades to them)."""
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def remove_meeting(meeting_id):
+    """Drops a soft-deleted meeting's document together with its tasks'."""
+    SearchDocument.objects.filter(meeting_id=meeting_id).delete()
+
+
+@transaction.atomic
+def rebuild(batch_size=1000):
+    """Rebuilds every document from the source tables. Returns the number indexed."""
+    SearchDocument.objects.all().delete()
+    total = 0
+    for queryset in (Meeting.objects.all(), Task.objects.all(), Event.objects.all()):
+        batch = []
+        for instance in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(DOCUMENT_BUILDERS[type(instance)](instance))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        total += len(batch)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return total
+
+
+def visible_documents(user):
+    """Documents `user` may see, following the same rules as Meeting/Event.visible_to."""
+    documents = SearchDocument.objects.all()
+    if is_privileged_user(user):
+        return documents
+    participates = Meeting.participants.through.objects.filter(meeting_id=OuterRef('meeting_id'), user_id=user.pk)
+    invited = Invitation.objects.filter(event_id=OuterRef('event_id'), invitee_id=user.pk)
+    return documents.filter(Q(owner_id=user.pk) | Exists(participates) | Exists(invited))
+
+
+def _terms(query, limit=8):
+    return re.findall(r'\w+', query.lower())[:limit]
+
+
+def search(user, query, limit=20, kind=None):
+    """
+    Returns up to `limit` of the user's visible documents matching every word
+    of `query` (the last one as a prefix, for typeahead), best match first.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    documents = visible_documents(user)
+    if kind:
+        documents = documents.filter(kind=kind)
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        documents = documents.extra(
+            # Title hits weigh ten times body hits; bm25 is lower-is-better
+            select={'rank': f'bm25({FTS_TABLE}, 10.0, 1.0)'},
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = search_searchdocument.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+        ).order_by('rank')
+    elif connection.vendor == 'postgresql':
+        tsquery = ' & '.join(terms) + ':*'
+        documents = documents.extra(
+            select={'rank': f"ts_rank({PG_VECTOR}, to_tsquery('english', %s))"},
+            select_params=[tsquery],
+            where=[f"{PG_VECTOR} @@ to_tsquery('english', %s)"],
+            params=[tsquery],
+        ).order_by('-rank')
+    else:
+        # No full-text index on this backend: slow, unranked LIKE scans
+        for term in terms:
+            documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        documents = documents.order_by('-timestamp')
+    return list(documents[:limit])
+
+
+def url_for(document, user):
+    if document.kind == Kind.EVENT:
+        return reverse('event_detail', args=[document.event_id])
+    if document.kind == Kind.TASK and (document.owner_id == user.pk or is_privileged_user(user)):
+        return reverse('task_update', args=[document.task_id])
+    return reverse('meeting_detail', args=[document.meeting_id])
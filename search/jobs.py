@@ -0,0 +1,11 @@
+# search/jobs.py
+
+from core.models import Task
+from jobs.queue import job
+from . import index
+
+
+@job
+def index_tasks(task_ids):
+    """Indexes tasks added in bulk. Any deleted before the job runs are skipped."""
+    index.index_many(Task.objects.filter(pk__in=task_ids))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from search import index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search documents for every meeting, task and event."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = index.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt ({total} documents)."))
@@ -0,0 +1,50 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def _backfill(apps, schema_editor, model_label, build):
+    Model = apps.get_model(*model_label.split('.'))
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    last_pk = 0
+    while True:
+        batch = list(Model.objects.filter(pk__gt=last_pk).order_by('pk')[:BATCH_SIZE])
+        if not batch:
+            break
+        with transaction.atomic(using=schema_editor.connection.alias):
+            SearchDocument.objects.bulk_create(
+                [SearchDocument(**build(instance)) for instance in batch], ignore_conflicts=True
+            )
+        last_pk = batch[-1].pk
+
+
+def backfill_documents(apps, schema_editor):
+    # Mirrors the document builders in search.index at the time of writing
+    meeting_types = dict(apps.get_model('core', 'Meeting')._meta.get_field('meeting_type').choices)
+    _backfill(apps, schema_editor, 'core.Meeting', lambda meeting: {
+        'kind': 'MEETING', 'object_id': meeting.pk, 'meeting_id': meeting.pk, 'title': meeting.title,
+        'body': meeting_types.get(meeting.meeting_type, ''), 'timestamp': meeting.meeting_time,
+    })
+    _backfill(apps, schema_editor, 'core.Task', lambda task: {
+        'kind': 'TASK', 'object_id': task.pk, 'task_id': task.pk, 'meeting_id': task.meeting_id,
+        'owner_id': task.owner_id, 'title': task.title, 'body': task.description or '', 'timestamp': task.created_at,
+    })
+    _backfill(apps, schema_editor, 'events.Event', lambda event: {
+        'kind': 'EVENT', 'object_id': event.pk, 'event_id': event.pk, 'owner_id': event.created_by_id,
+        'title': event.title, 'body': ' '.join(filter(None, [event.description, event.location])),
+        'timestamp': event.start_datetime,
+    })
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('search', '0002_full_text_index'),
+        ('core', '0008_hot_path_indexes'),
+        ('events', '0009_event_invitation_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
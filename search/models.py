@@ -0,0 +1,39 @@
+# search/models.py
+
+from django.conf import settings
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One row per searchable meeting, task or event. The full-text index is
+    kept outside Django: an FTS5 table on SQLite and a GIN expression index
+    on PostgreSQL (see migration 0002). The foreign keys remove a document
+    together with its object and are used for visibility checks.
+    """
+    class Kind(models.TextChoices):
+        MEETING = "MEETING", "Meeting"
+        TASK = "TASK", "Task"
+        EVENT = "EVENT", "Event"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default='')
+    timestamp = models.DateTimeField(null=True, blank=True)
+
+    meeting = models.ForeignKey('core.Meeting', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    task = models.ForeignKey('core.Task', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    # Task owner or event creator
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,18 @@
+# search/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from core.models import Meeting, Task
+from events.models import Event
+from . import index
+
+# Deletes need no handler: documents cascade with their meeting, task or event,
+# and soft deletes drop them through core.deletion
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Event)
+def index_saved_object(sender, instance, raw=False, **kwargs):
+    if not raw and not instance.is_deleted:
+        index.index(instance)
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from core.models import Meeting, Task
+from events.models import Event, Invitation
+from . import index
+from .models import SearchDocument
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.member = User.objects.create(username='member')
+        self.meeting = Meeting.objects.create(title='Budget review')
+        self.meeting.participants.add(self.member)
+        self.title_hit = Task.objects.create(title='Draft budget', meeting=self.meeting)
+        self.body_hit = Task.objects.create(title='Slides', description='numbers for the budget', meeting=self.meeting)
+        self.hidden = Task.objects.create(title='Budget secrets', meeting=Meeting.objects.create(title='Board'))
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.title_hit.title = 'Draft forecast'
+        self.title_hit.save()
+        self.assertEqual([d.title for d in index.search(self.member, 'forecast')], ['Draft forecast'])
+
+        self.meeting.delete()
+        self.assertFalse(SearchDocument.objects.filter(meeting_id=self.meeting.pk).exists())
+        self.assertEqual(index.search(self.member, 'forecast'), [])
+
+    def test_results_are_ranked_and_respect_visibility(self):
+        results = index.search(self.member, 'budg', kind=SearchDocument.Kind.TASK)
+        self.assertEqual([d.task_id for d in results], [self.title_hit.pk, self.body_hit.pk])
+
+        boss = User.objects.create(username='boss', role=User.Role.MANAGEMENT)
+        self.assertEqual(len(index.search(boss, 'budget')), 4)
+
+    def test_event_documents_are_visible_to_invitees(self):
+        event = Event.objects.create(title='Budget offsite', location='Lisbon')
+        self.assertEqual(index.search(self.member, 'lisbon'), [])
+        Invitation.objects.create(event=event, invitee=self.member)
+        self.assertEqual([d.event_id for d in index.search(self.member, 'lisbon')], [event.pk])
+
+    def test_rebuild_restores_documents(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(index.rebuild(), 5)
+        self.assertEqual(len(index.search(self.member, 'budget')), 3)
+
+    def test_search_page_and_suggest(self):
+        self.client.force_login(self.member)
+        response = self.client.get(reverse('search'), {'q': 'budget'})
+        self.assertContains(response, 'Draft budget')
+        self.assertNotContains(response, 'Budget secrets')
+
+        data = self.client.get(reverse('search_suggest'), {'q': 'dra'}).json()
+        self.assertEqual(data['results'][0]['title'], 'Draft budget')
+        self.assertEqual(self.client.get(reverse('search_suggest'), {'q': 'd'}).json(), {'results': []})
@@ -0,0 +1,37 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import render
+from . import index
+from .models import SearchDocument
+
+SUGGEST_MIN_LENGTH = 2
+
+@login_required
+def search(request):
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind')
+    if kind not in SearchDocument.Kind.values:
+        kind = None
+
+    results = index.search(request.user, query, limit=50, kind=kind) if query else []
+    for document in results:
+        document.url = index.url_for(document, request.user)
+
+    context = {
+        'query': query,
+        'kind': kind,
+        'kinds': SearchDocument.Kind.choices,
+        'results': results,
+    }
+    return render(request, 'search/results.html', context)
+
+@login_required
+def suggest(request):
+    query = request.GET.get('q', '').strip()
+    if len(query) < SUGGEST_MIN_LENGTH:
+        return JsonResponse({'results': []})
+    results = [
+        {'kind': document.get_kind_display(), 'title': document.title, 'url': index.url_for(document, request.user)}
+        for document in index.search(request.user, query, limit=8)
+    ]
+    return JsonResponse({'results': results})
@@ -0,0 +1,63 @@
+// theme/static/theme/availability.js
+// Drives the "find a free time" panel of the scheduling forms. The picked
+// participants and the chosen length are sent to the availability endpoint,
+// and each suggested slot becomes a button that fills in the form's date and
+// time inputs. Field ids come from the panel's data attributes.
+function setupAvailabilityFinder(panel) {
+    const form = panel.closest('form');
+    const options = panel.dataset;
+    const list = panel.querySelector('[data-slots]');
+    const field = id => id && document.getElementById(id);
+
+    const dayFormat = new Intl.DateTimeFormat(undefined, {weekday: 'short', month: 'short', day: 'numeric'});
+    const timeFormat = new Intl.DateTimeFormat(undefined, {hour: 'numeric', minute: '2-digit'});
+    // Slots arrive in the server's time zone; the inputs take its wall-clock values
+    const wallClock = iso => ({date: iso.slice(0, 10), time: iso.slice(11, 16), shown: new Date(iso.slice(0, 19))});
+
+    function fill(slot) {
+        const start = wallClock(slot.start);
+        const end = wallClock(slot.end);
+        field(options.dateField).value = start.date;
+        field(options.timeField).value = start.time;
+        if (options.endDateField) field(options.endDateField).value = end.date;
+        if (options.endTimeField) field(options.endTimeField).value = end.time;
+    }
+
+    function show(message) {
+        list.innerHTML = '';
+        const note = document.createElement('p');
+        note.className = 'text-sm text-gray-500';
+        note.textContent = message;
+        list.appendChild(note);
+    }
+
+    panel.querySelector('[data-find]').addEventListener('click', async () => {
+        const params = new URLSearchParams();
+        form.querySelectorAll('input[name="participants"]').forEach(input => params.append('participants', input.value));
+        if (options.organizer) params.append('participants', options.organizer);
+        if (!params.has('participants')) return show('Choose participants first.');
+        params.set('duration', field(options.durationField).value);
+        if (field(options.dateField).value) params.set('start', field(options.dateField).value);
+        if (options.excludeValue) params.set(options.excludeName, options.excludeValue);
+
+        show('Looking for free time...');
+        const response = await fetch(`${options.url}?${params}`, {headers: {'Accept': 'application/json'}});
+        if (!response.ok) return show('Could not look up free time.');
+        const {slots} = await response.json();
+        if (!slots.length) return show('No common free time in the next two weeks.');
+
+        list.innerHTML = '';
+        slots.forEach(slot => {
+            const start = wallClock(slot.start).shown;
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.className = 'px-3 py-1.5 text-sm rounded-lg border border-indigo-200 bg-indigo-50 text-indigo-700 hover:bg-indigo-100';
+            button.textContent = `${dayFormat.format(start)}, ${timeFormat.format(start)}`;
+            button.title = `Free until ${timeFormat.format(wallClock(slot.free_until).shown)}`;
+            button.addEventListener('click', () => fill(slot));
+            list.appendChild(button);
+        });
+    });
+}
+
+document.querySelectorAll('[data-availability]').forEach(setupAvailabilityFinder);
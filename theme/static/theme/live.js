@@ -0,0 +1,12 @@
+// theme/static/theme/live.js
+// Subscribes to the server-sent live stream. `handlers` maps event kinds
+// (e.g. 'task.status') to callbacks that receive the parsed payload.
+// EventSource reconnects by itself and resumes from the last event id.
+function subscribeLive(url, handlers) {
+    if (!window.EventSource) return null;
+    const source = new EventSource(url);
+    Object.entries(handlers).forEach(([kind, handler]) => {
+        source.addEventListener(kind, event => handler(JSON.parse(event.data)));
+    });
+    return source;
+}
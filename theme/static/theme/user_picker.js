@@ -0,0 +1,100 @@
+// theme/static/theme/user_picker.js
+// Search-as-you-type user picker. Matches come from the user search endpoint;
+// each picked user becomes a chip holding a hidden input with their id, so
+// only the selected ids are posted. Single pickers keep one chip at a time.
+function setupUserPicker(picker) {
+    if (picker.dataset.ready) return;
+    picker.dataset.ready = 'true';
+    const input = picker.querySelector('input[type="search"]');
+    const selected = picker.querySelector('[data-selected]');
+    const results = picker.querySelector('[data-results]');
+    const multiple = picker.dataset.multiple === 'true';
+    let timer = null;
+    let controller = null;
+
+    const chosenIds = () => [...selected.querySelectorAll('input[type="hidden"]')].map(hidden => hidden.value);
+
+    function choose(user) {
+        if (!multiple) selected.innerHTML = '';
+        if (chosenIds().includes(String(user.id))) return;
+        const chip = document.createElement('span');
+        chip.dataset.chip = '';
+        chip.className = 'inline-flex items-center gap-1 rounded-full bg-indigo-50 border border-indigo-200 px-3 py-1 text-sm text-indigo-700';
+        const hidden = document.createElement('input');
+        hidden.type = 'hidden';
+        hidden.name = picker.dataset.name;
+        hidden.value = user.id;
+        const remove = document.createElement('button');
+        remove.type = 'button';
+        remove.dataset.remove = '';
+        remove.className = 'text-indigo-400 hover:text-indigo-700';
+        remove.setAttribute('aria-label', 'Remove');
+        remove.innerHTML = '&times;';
+        chip.append(hidden, user.label, remove);
+        selected.appendChild(chip);
+    }
+
+    function close() {
+        results.hidden = true;
+        results.innerHTML = '';
+    }
+
+    function show(users) {
+        results.innerHTML = '';
+        const taken = chosenIds();
+        users.filter(user => !taken.includes(String(user.id))).forEach(user => {
+            const item = document.createElement('li');
+            item.className = 'px-3 py-2 text-sm cursor-pointer hover:bg-indigo-50';
+            item.textContent = user.label;
+            if (user.detail) {
+                const detail = document.createElement('span');
+                detail.className = 'ml-2 text-xs text-gray-500';
+                detail.textContent = user.detail;
+                item.appendChild(detail);
+            }
+            item.addEventListener('mousedown', event => {
+                event.preventDefault();
+                choose(user);
+                input.value = '';
+                close();
+            });
+            results.appendChild(item);
+        });
+        results.hidden = !results.children.length;
+    }
+
+    async function search(term) {
+        if (controller) controller.abort();
+        controller = new AbortController();
+        try {
+            const params = new URLSearchParams({q: term});
+            const response = await fetch(`${picker.dataset.url}?${params}`, {
+                headers: {'Accept': 'application/json'}, signal: controller.signal,
+            });
+            if (response.ok) show((await response.json()).results);
+        } catch (error) {
+            if (error.name !== 'AbortError') close();
+        }
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const term = input.value.trim();
+        if (!term) return close();
+        timer = setTimeout(() => search(term), 200);
+    });
+    input.addEventListener('keydown', event => {
+        // Enter picks the first match instead of submitting the form
+        if (event.key !== 'Enter') return;
+        event.preventDefault();
+        const first = results.querySelector('li');
+        if (first) first.dispatchEvent(new MouseEvent('mousedown'));
+    });
+    input.addEventListener('blur', close);
+    selected.addEventListener('click', event => {
+        const remove = event.target.closest('[data-remove]');
+        if (remove) remove.closest('[data-chip]').remove();
+    });
+}
+
+document.querySelectorAll('[data-user-picker]').forEach(setupUserPicker);